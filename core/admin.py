@@ -1,5 +1,39 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
 admin.site.site_header = "PagouMorou Admin"
 admin.site.site_title = "PagouMorou Admin"
 admin.site.index_title = "Bem-vindo ao PagouMorou"
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Usa a estimativa do planner (pg_class.reltuples) no lugar de COUNT(*) em listagens sem filtro.
+
+    Tabelas particionadas não têm estimativa própria (-1 ou 0): soma a das partições folha.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint
+                      FROM pg_partition_tree(%s::regclass) t
+                      JOIN pg_class c ON c.oid = t.relid
+                     WHERE t.isleaf
+                    """,
+                    [queryset.model._meta.db_table],
+                )
+                estimate = cursor.fetchone()[0]
+            if estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+
+        return super().count
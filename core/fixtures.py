@@ -0,0 +1,203 @@
+"""
+Bulk loading of the SQL dumps shipped with the repo (pagoumorou.sql, dump.sql).
+
+Replaying the dumps statement by statement is slow and pins them to the
+schema they were taken from. Here both formats are parsed into rows per
+table instead:
+
+- pg_dump ``COPY public.<table> (...) FROM stdin;`` blocks (pagoumorou.sql);
+- single-row ``INSERT INTO <table> (...) VALUES (...);`` statements (dump.sql).
+
+Each table is matched to its current model by ``db_table``. Columns the
+model no longer has are dropped, columns missing from the dump get the
+model default, and a table whose dump lacks a required column is skipped
+and reported (dump.sql predates profiles, so proposal/rental/property_manager
+only load from pagoumorou.sql). Rows go in with multi-row INSERTs inside one
+transaction, so FK order does not matter (Django's FKs are deferred), and
+sequences are reset afterwards.
+
+Django's own bookkeeping tables (migrations, content types, permissions,
+sessions, admin log) are left to migrate.
+"""
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import NOT_PROVIDED, Model
+
+SKIPPED_TABLES = {
+    "django_migrations",
+    "django_content_type",
+    "django_session",
+    "django_admin_log",
+    "auth_permission",
+    "auth_group_permissions",
+    "auth_user_user_permissions",
+}
+
+COPY_RE = re.compile(r"^COPY (?:\w+\.)?(\w+) \((.*)\) FROM stdin;$")
+
+INSERT_RE = re.compile(r"^INSERT INTO (?:\w+\.)?\"?(\w+)\"? \((.*?)\) VALUES \((.*)\);$")
+
+VALUE_RE = re.compile(r"\s*('(?:[^']|'')*'|[^,]+?)\s*(?:,|$)")
+
+COPY_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v", "\\": "\\"}
+
+# Limite de parâmetros por comando do SQLite
+MAX_PARAMS = 999
+
+
+@dataclass
+class TableDump:
+    table: str
+    columns: list[str]
+    rows: list[list[str | None]] = field(default_factory=list)
+
+
+@dataclass
+class LoadResult:
+    loaded: dict[str, int] = field(default_factory=dict)
+    skipped: dict[str, str] = field(default_factory=dict)
+
+
+def parse_dump(path: Path) -> dict[str, TableDump]:
+    """Linhas por tabela dos blocos COPY e dos INSERTs do arquivo, com os valores ainda em texto."""
+    tables: dict[str, TableDump] = {}
+    with open(path, encoding="utf-8") as file:
+        lines = iter(file)
+        for line in lines:
+            line = line.rstrip("\n")
+            if match := COPY_RE.match(line):
+                dump = _table(tables, match.group(1), match.group(2))
+                dump.rows.extend(_copy_rows(lines))
+            elif match := INSERT_RE.match(line):
+                dump = _table(tables, match.group(1), match.group(2))
+                dump.rows.append(_insert_values(match.group(3)))
+    return tables
+
+
+def load_dump(path: Path, using: str = DEFAULT_DB_ALIAS) -> LoadResult:
+    """Carrega o dump no banco `using` (já migrado e sem esses dados)."""
+    connection = connections[using]
+    models = {model._meta.db_table: model for model in apps.get_models()}
+    result = LoadResult()
+    loaded_models = []
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for table, dump in parse_dump(path).items():
+            if table in SKIPPED_TABLES or not dump.rows:
+                continue
+            model = models.get(table)
+            if model is None:
+                result.skipped[table] = "no model"
+                continue
+            missing = _missing_required(model, dump.columns)
+            if missing:
+                result.skipped[table] = f"missing {', '.join(missing)}"
+                continue
+
+            fields, rows = _prepare(model, dump, connection)
+            columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+            row_sql = f"({', '.join(['%s'] * len(fields))})"
+            per_batch = max(1, MAX_PARAMS // len(fields))
+            for start in range(0, len(rows), per_batch):
+                batch = rows[start:start + per_batch]
+                cursor.execute(
+                    f"INSERT INTO {connection.ops.quote_name(table)} ({columns}) "
+                    f"VALUES {', '.join([row_sql] * len(batch))}",
+                    [value for row in batch for value in row],
+                )
+            result.loaded[table] = len(rows)
+            loaded_models.append(model)
+
+        # Ids vieram do dump: sequências voltam a apontar para depois do maior
+        for sql in connection.ops.sequence_reset_sql(no_style(), loaded_models):
+            cursor.execute(sql)
+
+    return result
+
+
+def _table(tables: dict[str, TableDump], table: str, columns: str) -> TableDump:
+    names = [name.strip().strip('"') for name in columns.split(",")]
+    dump = tables.setdefault(table, TableDump(table, names))
+    if dump.columns != names:
+        raise ValueError(f"{table}: columns differ between statements")
+    return dump
+
+
+def _copy_rows(lines: Iterator[str]) -> Iterator[list[str | None]]:
+    for line in lines:
+        line = line.rstrip("\n")
+        if line == "\\.":
+            return
+        yield [None if value == "\\N" else _unescape_copy(value) for value in line.split("\t")]
+
+
+def _unescape_copy(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return re.sub(r"\\([0-7]{1,3}|.)", _copy_escape, value)
+
+
+def _copy_escape(match: re.Match) -> str:
+    escaped = match.group(1)
+    if escaped.isdigit():
+        return chr(int(escaped, 8))
+    return COPY_ESCAPES.get(escaped, escaped)
+
+
+def _insert_values(values: str) -> list[str | None]:
+    parsed = []
+    for token in VALUE_RE.findall(values):
+        if token.startswith("'"):
+            parsed.append(token[1:-1].replace("''", "'"))
+        elif token.upper() == "NULL":
+            parsed.append(None)
+        elif token.upper() in ("TRUE", "FALSE"):
+            parsed.append(token.upper() == "TRUE")
+        else:
+            parsed.append(token)
+    return parsed
+
+
+def _missing_required(model: type[Model], columns: list[str]) -> list[str]:
+    return [
+        f.column for f in model._meta.concrete_fields
+        if f.column not in columns
+        and not f.primary_key
+        and not f.null
+        and f.default is NOT_PROVIDED
+        and not getattr(f, "auto_now", False)
+        and not getattr(f, "auto_now_add", False)
+    ]
+
+
+def _prepare(model: type[Model], dump: TableDump, connection) -> tuple[list, list[list[Any]]]:
+    by_column = {f.column: f for f in model._meta.concrete_fields}
+    positions = {column: index for index, column in enumerate(dump.columns) if column in by_column}
+    fields = list(model._meta.concrete_fields)
+
+    rows = []
+    for values in dump.rows:
+        # A instância completa os defaults das colunas que o dump não tem
+        instance = model()
+        for column, index in positions.items():
+            f = by_column[column]
+            value = values[index]
+            setattr(instance, f.attname, None if value is None else f.to_python(value))
+        rows.append([
+            _db_value(f, instance, column_in_dump=f.column in positions, connection=connection)
+            for f in fields
+        ])
+    return fields, rows
+
+
+def _db_value(f, instance: Model, column_in_dump: bool, connection) -> Any:
+    # auto_now/auto_now_add só valem para colunas ausentes: as datas do dump são preservadas
+    if not column_in_dump and (getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)):
+        return f.get_db_prep_save(f.pre_save(instance, add=True), connection)
+    return f.get_db_prep_save(getattr(instance, f.attname), connection)
@@ -0,0 +1,174 @@
+"""
+Idempotency-Key support for POST endpoints.
+
+The first request with a given key claims a row in ``idempotency_key``,
+runs the view and stores the rendered response. Retries with the same key
+get the stored response back without running the view again, marked with
+``Idempotent-Replayed: true``. A retry that arrives while the first request
+is still running polls the row until the response is stored, instead of
+racing it.
+
+Keys are scoped to the caller: the authenticated user id, or for anonymous
+calls the ``X-Install-Id`` header the app sends (a random id per install).
+Without it the key alone is the scope. The client address is deliberately
+not used, because a phone that switches from Wi-Fi to mobile data while
+retrying must still hit its own key. A replay also needs the same body, so
+a key collision between anonymous clients only ever returns a response to
+the very same request.
+
+The body size is checked (API_MAX_BODY_BYTES, Content-Length first) before
+the body is read and hashed; larger requests get 413.
+
+Server errors (5xx) and exceptions release the key so that the client can
+retry for real. Reusing a key with a different body is rejected with 422.
+Rows expire after IDEMPOTENCY_KEY_TTL_HOURS and are removed by
+purge_idempotency_keys.
+
+    class ProposalAPI(APIView):
+        @idempotent("proposal")
+        @validate_body(PROPOSAL)
+        def post(self, request, data):
+            ...
+"""
+import functools
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from core.models import IdempotencyKey
+from core.schema import BodyTooLarge, read_body
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+
+INSTALL_HEADER = "HTTP_X_INSTALL_ID"
+
+MAX_KEY_LENGTH = 255
+
+MAX_INSTALL_ID_LENGTH = 64
+
+
+def idempotent(scope: str):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.META.get(HEADER)
+            if not key:
+                return method(self, request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return JsonResponse({"success": False, "error": "Invalid Idempotency-Key"}, status=400)
+
+            caller = _caller(request)
+            if caller is None:
+                return JsonResponse({"success": False, "error": "Invalid X-Install-Id"}, status=400)
+            try:
+                body = read_body(request)
+            except BodyTooLarge:
+                return JsonResponse({"success": False, "error": "Request body too large"}, status=413)
+
+            request_hash = hashlib.sha256(body).hexdigest()
+            deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+            delay = 0.02
+
+            while True:
+                record = _claim(scope, caller, key, request_hash)
+                if record is None:
+                    return _execute(scope, caller, key, method, self, request, *args, **kwargs)
+
+                if record.request_hash != request_hash:
+                    return JsonResponse(
+                        {"success": False, "error": "Idempotency-Key already used with a different request"},
+                        status=422,
+                    )
+                if record.status_code is not None:
+                    return _replay(record)
+
+                # Requisição original em andamento: espera a resposta dela
+                if time.monotonic() >= deadline:
+                    return JsonResponse(
+                        {"success": False, "error": "A request with this Idempotency-Key is still in progress"},
+                        status=409,
+                    )
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+
+        return wrapper
+
+    return decorator
+
+
+def _caller(request) -> str | None:
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.id}"
+
+    install_id = request.META.get(INSTALL_HEADER)
+    if not install_id:
+        return "anon"
+    if len(install_id) > MAX_INSTALL_ID_LENGTH:
+        return None
+    return f"install:{install_id}"
+
+
+def _claim(scope: str, caller: str, key: str, request_hash: str) -> IdempotencyKey | None:
+    """Devolve None quando esta requisição ficou com a chave; senão, o registro existente."""
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(
+                scope=scope, caller=caller, key=key, request_hash=request_hash, created_at=now,
+            )
+        return None
+    except IntegrityError:
+        pass
+
+    record = IdempotencyKey.objects.filter(scope=scope, caller=caller, key=key).first()
+    if record is None:
+        # Liberada entre o INSERT e a leitura: tenta de novo na próxima volta
+        return IdempotencyKey(scope=scope, caller=caller, key=key, request_hash=request_hash)
+
+    expired = record.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    abandoned = (
+        record.status_code is None
+        and record.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+    )
+    if expired or abandoned:
+        # Processo que caiu no meio, ou chave vencida ainda não purgada: libera (a próxima volta reclama)
+        IdempotencyKey.objects.filter(id=record.id, created_at=record.created_at).delete()
+        return IdempotencyKey(scope=scope, caller=caller, key=key, request_hash=request_hash)
+
+    return record
+
+
+def _execute(scope: str, caller: str, key: str, method, view, request, *args, **kwargs):
+    try:
+        response = method(view, request, *args, **kwargs)
+        # Respostas do DRF só têm conteúdo depois de renderizadas
+        if hasattr(view, "finalize_response"):
+            response = view.finalize_response(request, response, *args, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+    except BaseException:
+        IdempotencyKey.objects.filter(scope=scope, caller=caller, key=key, status_code__isnull=True).delete()
+        raise
+
+    if response.status_code >= 500 or getattr(response, "streaming", False):
+        IdempotencyKey.objects.filter(scope=scope, caller=caller, key=key, status_code__isnull=True).delete()
+    else:
+        IdempotencyKey.objects.filter(scope=scope, caller=caller, key=key, status_code__isnull=True).update(
+            status_code=response.status_code,
+            content_type=response.get("Content-Type", ""),
+            response_body=response.content,
+        )
+    return response
+
+
+def _replay(record: IdempotencyKey) -> HttpResponse:
+    response = HttpResponse(bytes(record.response_body or b""), status=record.status_code,
+                            content_type=record.content_type or None)
+    response["Idempotent-Replayed"] = "true"
+    return response
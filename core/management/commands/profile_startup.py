@@ -0,0 +1,79 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Executado em um processo novo: sobe o Django, carrega as URLs e a aplicação WSGI como um worker faria
+BOOT_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+elapsed = time.perf_counter() - started
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kb": rss_kb, "modules": len(sys.modules)}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de inicialização de um worker, RSS e o tempo de import por módulo para cada perfil de settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=['core.settings', 'core.settings_api'],
+            help='Módulos de settings a comparar',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15)
+
+    def handle(self, *args, **options):
+        for profile in options['profiles']:
+            runs = [self.boot(profile) for _ in range(options['repeat'])]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{profile}"))
+            self.stdout.write(
+                f"  inicialização: {statistics.median(r['seconds'] for r in runs) * 1000:.0f} ms (mediana de {len(runs)})"
+                f"  RSS: {statistics.median(r['rss_kb'] for r in runs) / 1024:.1f} MB"
+                f"  módulos: {runs[0]['modules']}"
+            )
+
+            self.stdout.write(f"  maiores tempos cumulativos por pacote (ms):")
+            for package, micros in self.import_times(profile)[:options['top']]:
+                self.stdout.write(f"    {micros / 1000:8.1f}  {package}")
+
+    def boot(self, profile: str, *extra_flags: str) -> dict:
+        result = subprocess.run(
+            [sys.executable, *extra_flags, '-c', BOOT_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': profile},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        data['stderr'] = result.stderr
+        return data
+
+    def import_times(self, profile: str) -> list[tuple[str, int]]:
+        # Linhas do -X importtime: "import time: self [us] | cumulative | imported package"
+        stderr = self.boot(profile, '-X', 'importtime')['stderr']
+        totals: dict[str, int] = defaultdict(int)
+
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            # Só o nível mais externo de cada import (sem indentação) para não contar em dobro
+            if name.startswith('  '):
+                continue
+            totals[name.strip().split('.')[0]] += int(cumulative)
+
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Apaga as Idempotency-Keys mais antigas que IDEMPOTENCY_KEY_TTL_HOURS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl-hours', type=int, default=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['ttl_hours'])
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"✅ {deleted} Idempotency-Keys expiradas apagadas"))
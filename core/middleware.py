@@ -0,0 +1,100 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+gzip is always available; zstd and brotli are offered when the
+``zstandard`` / ``brotli`` packages are installed. Responses smaller than
+COMPRESSION_MIN_BYTES, streaming responses (the SSE proposal events) and
+non-text content types are sent as they are.
+"""
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+# Ordem de preferência do servidor para empates de q-value.
+# ZstdCompressor não é thread-safe: uma instância por resposta.
+ENCODERS = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = lambda data: zstandard.ZstdCompressor(level=3).compress(data)
+if brotli is not None:
+    ENCODERS["br"] = lambda data: brotli.compress(data, quality=5)
+ENCODERS["gzip"] = _gzip
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Codificação suportada com maior q-value em `accept_encoding`, ou None para enviar sem compressão."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    default = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in ENCODERS:
+        q = weights.get(coding, default)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        compressed = ENCODERS[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+
+        # O corpo mudou: um ETag forte deixaria de valer byte a byte
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
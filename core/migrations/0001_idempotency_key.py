@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=255)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('content_type', models.CharField(blank=True, default='', max_length=100)),
+                ('response_body', models.BinaryField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'idempotency_key',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='idempotency_key_scope_key_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='idempotencykey',
+            name='idempotency_key_scope_key_unique',
+        ),
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='caller',
+            field=models.CharField(default='', max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('scope', 'caller', 'key'), name='idempotency_key_scope_caller_key_unique'),
+        ),
+    ]
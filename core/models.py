@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    # Ver core/idempotency.py; status_code nulo = primeira requisição ainda em andamento
+    scope = models.CharField(max_length=50)
+    # "user:<id>", "install:<X-Install-Id>" ou "anon": a mesma chave de clientes diferentes não se mistura
+    caller = models.CharField(max_length=100, default="")
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    response_body = models.BinaryField(null=True, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.scope}:{self.caller}:{self.key}"
+
+    class Meta:
+        db_table = "idempotency_key"
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "caller", "key"], name="idempotency_key_scope_caller_key_unique"),
+        ]
@@ -0,0 +1,202 @@
+"""
+Read replica routing.
+
+Views that opt in with ``ReplicaReadMixin`` send their reads to a replica
+(any alias in DATABASES other than ``default``). Everything else, every
+write, and every read that follows a write in the same request stays on
+the primary. ``ReplicaPinMiddleware`` also keeps a client on the primary
+for REPLICA_PIN_SECONDS after an unsafe request that wrote, so a proposal
+is readable right after it is created:
+
+- authenticated callers are pinned on the server, by user id, with a
+  short-lived cache entry (every device of the user, no client support);
+- every such response also carries ``X-Primary-Pin: <unix expiry>``.
+  Anonymous clients echo it back as a request header until it expires.
+  The API is called cross-origin without credentials, so a cookie would
+  never come back.
+
+Values cached for every worker are computed inside ``primary_reads()``: an
+entry built from a lagging replica would outlive the invalidation that
+should have replaced it. The database cache table itself always lives on
+the primary.
+
+Replicas lagging more than REPLICA_MAX_LAG_SECONDS, or failing the lag
+check, are skipped until the next check.
+
+Locally, two SQLite files are enough to exercise it:
+
+    DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'primary.sqlite3'},
+        'replica1': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'replica.sqlite3',
+                     'TEST': {'MIRROR': 'default'}},
+    }
+"""
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+_pinned = contextvars.ContextVar("pinned_to_primary", default=False)
+
+PIN_HEADER = "X-Primary-Pin"
+
+
+class ReplicaHealth:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at: dict[str, float] = {}
+        self._healthy: dict[str, bool] = {}
+
+    def is_healthy(self, alias: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at.get(alias, float("-inf")) < settings.REPLICA_LAG_CHECK_SECONDS:
+                return self._healthy[alias]
+            # Marca antes de consultar para que só uma thread faça a verificação
+            self._checked_at[alias] = now
+            self._healthy.setdefault(alias, False)
+
+        healthy = self._check(alias)
+        with self._lock:
+            self._healthy[alias] = healthy
+        return healthy
+
+    def _check(self, alias: str) -> bool:
+        connection = connections[alias]
+        try:
+            if connection.vendor != "postgresql":
+                connection.ensure_connection()
+                return True
+
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT CASE
+                        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                    END
+                """)
+                lag = float(cursor.fetchone()[0])
+        except Exception:
+            logger.warning("Replica %s is unreachable, reading from the primary", alias, exc_info=True)
+            return False
+
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning("Replica %s is %.1fs behind, reading from the primary", alias, lag)
+            return False
+        return True
+
+
+health = ReplicaHealth()
+
+
+def replica_aliases() -> list[str]:
+    return [alias for alias in settings.DATABASES if alias != "default"]
+
+
+# app_label do modelo interno do DatabaseCache
+CACHE_APP_LABEL = "django_cache"
+
+
+@contextlib.contextmanager
+def primary_reads():
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return "default"
+        if not _use_replica.get() or _pinned.get():
+            return "default"
+
+        healthy = [alias for alias in replica_aliases() if health.is_healthy(alias)]
+        return random.choice(healthy) if healthy else "default"
+
+    def db_for_write(self, model, **hints):
+        # Gravar no cache não é escrita de dados: não prende a requisição ao primário
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return "default"
+        # Leituras seguintes na mesma requisição precisam enxergar esta escrita
+        _pinned.set(True)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin:
+    """Habilita leitura em réplica nos métodos listados (todos, quando None)."""
+
+    replica_methods: tuple[str, ...] | None = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.replica_methods is not None and request.method not in self.replica_methods:
+            return super().dispatch(request, *args, **kwargs)
+
+        token = _use_replica.set(True)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+
+class ReplicaPinMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user_key = self.user_pin_key(request)
+        pinned = self.header_pinned(request) or (user_key is not None and cache.get(user_key) is not None)
+
+        token = _pinned.set(pinned)
+        try:
+            response = self.get_response(request)
+            wrote = _pinned.get() and not pinned
+        finally:
+            _pinned.reset(token)
+
+        if wrote and request.method not in ("GET", "HEAD", "OPTIONS"):
+            if user_key is not None:
+                cache.set(user_key, 1, settings.REPLICA_PIN_SECONDS)
+            response[PIN_HEADER] = str(int(time.time()) + settings.REPLICA_PIN_SECONDS)
+        return response
+
+    @staticmethod
+    def header_pinned(request) -> bool:
+        try:
+            expires_at = int(request.headers.get(PIN_HEADER, ""))
+        except ValueError:
+            return False
+        # O teto impede que um valor forjado prenda o cliente ao primário indefinidamente
+        now = time.time()
+        return now < expires_at <= now + settings.REPLICA_PIN_SECONDS
+
+    @staticmethod
+    def user_pin_key(request) -> str | None:
+        # Roda antes da view: autentica pelo mesmo caminho do DRF (JWT sem estado, claims em cache)
+        for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            try:
+                result = authentication().authenticate(request)
+            except APIException:
+                return None
+            if result is not None:
+                return f"primary_pin:{result[0].pk}"
+        return None
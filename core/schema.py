@@ -0,0 +1,278 @@
+"""
+Declarative validation for JSON request bodies.
+
+A ``Schema`` is built once at import time from ``Field`` objects and then
+validates a decoded body in a single pass, collecting every field error
+instead of stopping at the first one. Errors are short codes keyed by the
+field path (``"user.email": "invalid"``) so clients can map them to form
+fields. Bodies are decoded with orjson and rejected before decoding when
+they exceed API_MAX_BODY_BYTES.
+
+Views opt in with the ``validate_body`` decorator, which passes the
+cleaned data as the ``data`` keyword argument:
+
+    SEARCH = Schema({"destinationId": Integer(min_value=1)})
+
+    class SearchAPI(APIView):
+        @validate_body(SEARCH)
+        def post(self, request, data):
+            ...
+"""
+import functools
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable
+
+import orjson
+from django.conf import settings
+from django.http import JsonResponse
+
+MISSING = object()
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Só dígitos ASCII: str.isdigit() aceita "²" e outros dígitos Unicode que int() rejeita
+INTEGER_RE = re.compile(r"-?[0-9]+")
+
+# date.fromisoformat também aceita semanas ISO ("2025-W01-1") e datas compactas
+DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+# Faixa de BigIntegerField/BigAutoField: fora dela o banco rejeitaria o valor
+DB_INTEGER_MIN = -2 ** 63
+DB_INTEGER_MAX = 2 ** 63 - 1
+
+
+class FieldError(ValueError):
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+class ValidationError(ValueError):
+    def __init__(self, errors: dict[str, str]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class BodyTooLarge(ValueError):
+    pass
+
+
+class Field:
+    def __init__(self, *, required: bool = True, nullable: bool = False, default: Any = None):
+        self.required = required
+        self.nullable = nullable
+        self.default = default
+
+    def clean(self, value: Any) -> Any:
+        return value
+
+
+class Integer(Field):
+    def __init__(self, *, min_value: int | None = None, max_value: int | None = None,
+                 choices: Iterable[int] | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = frozenset(choices) if choices is not None else None
+
+    def clean(self, value: Any) -> int:
+        # Aceita também inteiros em string ("30"), como os clientes atuais enviam
+        if isinstance(value, bool):
+            raise FieldError("invalid")
+        if isinstance(value, str) and INTEGER_RE.fullmatch(value.strip()):
+            # Strings longas demais nem são convertidas (int() limita o número de dígitos)
+            if len(value.strip()) > 20:
+                raise FieldError("out_of_range")
+            value = int(value)
+        if not isinstance(value, int):
+            raise FieldError("invalid")
+
+        if not DB_INTEGER_MIN <= value <= DB_INTEGER_MAX:
+            raise FieldError("out_of_range")
+        if self.min_value is not None and value < self.min_value:
+            raise FieldError("out_of_range")
+        if self.max_value is not None and value > self.max_value:
+            raise FieldError("out_of_range")
+        if self.choices is not None and value not in self.choices:
+            raise FieldError("invalid_choice")
+        return value
+
+
+class Number(Field):
+    def __init__(self, *, max_digits: int, decimal_places: int, min_value: Decimal | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.max_digits = max_digits
+        self.decimal_places = decimal_places
+        self.min_value = min_value
+
+    def clean(self, value: Any) -> Decimal:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise FieldError("invalid")
+        try:
+            number = Decimal(str(value)).quantize(Decimal(1).scaleb(-self.decimal_places))
+        except InvalidOperation:
+            raise FieldError("invalid")
+        if not number.is_finite():
+            raise FieldError("invalid")
+
+        if len(number.as_tuple().digits) > self.max_digits:
+            raise FieldError("out_of_range")
+        if self.min_value is not None and number < self.min_value:
+            raise FieldError("out_of_range")
+        return number
+
+
+class String(Field):
+    def __init__(self, *, max_length: int | None = None, allow_blank: bool = False, strip: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.max_length = max_length
+        self.allow_blank = allow_blank
+        self.strip = strip
+
+    def clean(self, value: Any) -> str:
+        if not isinstance(value, str):
+            raise FieldError("invalid")
+        if self.strip:
+            value = value.strip()
+        if not value and not self.allow_blank:
+            raise FieldError("blank")
+        if self.max_length is not None and len(value) > self.max_length:
+            raise FieldError("too_long")
+        return value
+
+
+class Email(String):
+    def __init__(self, **kwargs):
+        super().__init__(max_length=254, **kwargs)
+
+    def clean(self, value: Any) -> str:
+        value = super().clean(value)
+        if not EMAIL_RE.match(value):
+            raise FieldError("invalid")
+        return value
+
+
+class Choice(Field):
+    def __init__(self, choices: Iterable[str], **kwargs):
+        super().__init__(**kwargs)
+        self.choices = frozenset(choices)
+
+    def clean(self, value: Any) -> str:
+        if not isinstance(value, str) or value not in self.choices:
+            raise FieldError("invalid_choice")
+        return value
+
+
+class Date(Field):
+    def clean(self, value: Any) -> date:
+        # Só o formato YYYY-MM-DD
+        if not isinstance(value, str) or not DATE_RE.fullmatch(value):
+            raise FieldError("invalid")
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise FieldError("invalid")
+
+
+class Object(Field):
+    def __init__(self, schema: "Schema", **kwargs):
+        super().__init__(**kwargs)
+        self.schema = schema
+
+    def clean(self, value: Any) -> dict[str, Any]:
+        return self.schema.validate(value)
+
+
+class Schema:
+    def __init__(self, fields: dict[str, Field]):
+        self.fields = fields
+        # Pré-compilado: tupla achatada percorrida uma única vez por requisição
+        self._compiled = tuple(
+            (name, field.clean, field.required, field.nullable, field.default)
+            for name, field in fields.items()
+        )
+
+    def extend(self, **fields: Field) -> "Schema":
+        return Schema({**self.fields, **fields})
+
+    def validate(self, data: Any) -> dict[str, Any]:
+        if not isinstance(data, dict):
+            raise FieldError("invalid")
+
+        cleaned: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+
+        for name, clean, required, nullable, default in self._compiled:
+            value = data.get(name, MISSING)
+
+            if value is MISSING or value is None:
+                if value is None and nullable:
+                    cleaned[name] = None
+                elif required:
+                    errors[name] = "required"
+                else:
+                    cleaned[name] = default
+                continue
+
+            try:
+                cleaned[name] = clean(value)
+            except FieldError as ex:
+                errors[name] = ex.code
+            except ValidationError as ex:
+                errors.update({f"{name}.{path}": code for path, code in ex.errors.items()})
+
+        if errors:
+            raise ValidationError(errors)
+        return cleaned
+
+
+def read_body(request) -> bytes:
+    max_bytes = settings.API_MAX_BODY_BYTES
+
+    # Content-Length é conferido antes de ler o corpo
+    try:
+        declared = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        declared = 0
+    if declared > max_bytes:
+        raise BodyTooLarge()
+
+    body = request.body
+    if len(body) > max_bytes:
+        raise BodyTooLarge()
+    return body
+
+
+def parse_body(request, schema: Schema) -> dict[str, Any]:
+    body = read_body(request)
+
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise ValidationError({"body": "invalid_json"})
+
+    try:
+        return schema.validate(data)
+    except FieldError as ex:
+        raise ValidationError({"body": ex.code})
+
+
+def validate_body(schema: Schema, message: str = "Invalid request"):
+    """Valida o corpo JSON antes da view; erros viram 400/413 sem tocar no banco."""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                data = parse_body(request, schema)
+            except BodyTooLarge:
+                return JsonResponse({"success": False, "error": "Request body too large"}, status=413)
+            except ValidationError as ex:
+                return JsonResponse({"success": False, "error": message, "fields": ex.errors}, status=400)
+            return method(self, request, *args, data=data, **kwargs)
+
+        return wrapper
+
+    return decorator
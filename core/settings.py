@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -38,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'corsheaders',
+    'rest_framework_simplejwt.token_blacklist',
     'core',
     'pagoumorou',
     'user'
@@ -46,6 +51,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.routers.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -89,6 +96,43 @@ DATABASES = {
     }
 }
 
+# Read replicas (comma-separated hosts sharing the primary's credentials).
+# See core/routers.py for routing rules and a local two-SQLite-file setup.
+
+for index, host in enumerate(filter(None, os.environ.get('PAGOUMOROU_DB_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+REPLICA_MAX_LAG_SECONDS = 5
+
+REPLICA_LAG_CHECK_SECONDS = 10
+
+REPLICA_PIN_SECONDS = 10
+
+# Cache shared by every worker: cached responses, search versions and replica pins must be
+# the same in all processes. The database cache table is created by core/migrations/0003_cache_table;
+# PAGOUMOROU_REDIS_URL switches to Redis (requires the redis package).
+
+if os.environ.get('PAGOUMOROU_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['PAGOUMOROU_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'pagoumorou_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100_000},
+        }
+    }
 
 
 # Password validation
@@ -110,6 +154,17 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing. The "loadtest" profile swaps PBKDF2 for a cheap hasher so
+# signup load tests are not CPU-bound on hashing. Never use it in production.
+
+PASSWORD_HASHER_PROFILE = os.environ.get('PAGOUMOROU_PASSWORD_HASHER_PROFILE', 'default')
+
+if PASSWORD_HASHER_PROFILE == 'loadtest':
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -133,3 +188,132 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Proposal status events (SSE)
+
+PROPOSAL_EVENTS_KEEPALIVE_SECONDS = 15
+
+PROPOSAL_EVENTS_MAX_SECONDS = 300
+
+# Rate limiting (token bucket per client IP or per API key)
+
+THROTTLE_BUCKET_STORE = 'pagoumorou.throttling.LocMemBucketStore'
+
+THROTTLE_API_KEY_HEADER = 'HTTP_X_API_KEY'
+
+# Only these keys get the larger per-key bucket; any other X-Api-Key is throttled by IP (comma-separated)
+THROTTLE_API_KEYS = frozenset(filter(None, os.environ.get('PAGOUMOROU_THROTTLE_API_KEYS', '').split(',')))
+
+THROTTLE_RATES = {
+    'search': {
+        'ip': {'capacity': 30, 'refill_per_second': 1.0},
+        'key': {'capacity': 120, 'refill_per_second': 5.0},
+    },
+    'proposal': {
+        'ip': {'capacity': 5, 'refill_per_second': 0.1},
+        'key': {'capacity': 20, 'refill_per_second': 0.5},
+    },
+}
+
+# In-memory room catalog for hot destinations (ids of Destination)
+
+CATALOG_HOT_DESTINATIONS = []
+
+CATALOG_MAX_AGE_SECONDS = 300
+
+# Room photos: originals read by process_photos and the generated variants
+
+PHOTO_SOURCE_ROOT = BASE_DIR / 'media' / 'photos' / 'source'
+
+PHOTO_OUTPUT_ROOT = BASE_DIR / 'media' / 'photos' / 'variants'
+
+PHOTO_BASE_URL = os.environ.get('PAGOUMOROU_PHOTO_BASE_URL', 'http://localhost:8000/media/photos/variants')
+
+# Pending proposals older than this are expired by process_proposals
+
+PROPOSAL_PENDING_TTL_DAYS = 7
+
+# Admin changelists of tables above this many rows show an estimated count
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10_000
+
+# Responses smaller than this are sent uncompressed (see core/middleware.py)
+
+COMPRESSION_MIN_BYTES = 1024
+
+# JSON request bodies above this size are rejected with 413 (see core/schema.py)
+
+API_MAX_BODY_BYTES = 64 * 1024
+
+# API authentication: stateless JWT (see user/authentication.py)
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': ['user.authentication.CachedJWTAuthentication'],
+    # Public endpoints (search, room, map, proposal form, signup) opt out with AllowAny
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+    # Trusted reverse proxies in front of the app; 0 ignores X-Forwarded-For when identifying clients
+    'NUM_PROXIES': int(os.environ.get('PAGOUMOROU_NUM_PROXIES', '0')),
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'UPDATE_LAST_LOGIN': False,
+    'TOKEN_USER_CLASS': 'user.authentication.ProfileTokenUser',
+}
+
+JWT_CLAIMS_CACHE_SIZE = 10_000
+
+# Search analytics: events buffered in-process and written in batches (see pagoumorou/analytics.py)
+
+SEARCH_EVENTS_BUFFER_SIZE = 10_000
+
+SEARCH_EVENTS_BATCH_SIZE = 500
+
+SEARCH_EVENTS_FLUSH_SECONDS = 5
+
+SEARCH_EVENTS_RETENTION_DAYS = 7
+
+# Closed years of proposals/rentals moved to compressed files by archive_closed_years (see pagoumorou/archive.py)
+
+ARCHIVE_ROOT = BASE_DIR / 'archive'
+
+ARCHIVE_KEEP_YEARS = 2
+
+# Map clusters are cached per geohash tile (see pagoumorou/clusters.py)
+
+MAP_TILE_CACHE_SECONDS = 60
+
+# Offline CEP geocoder index, built by build_cep_index (see user/geocoding.py)
+
+CEP_INDEX_PATH = BASE_DIR / 'data' / 'cep_index.bin'
+
+# Idempotency-Key handling for retried POSTs (see core/idempotency.py)
+
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+
+IDEMPOTENCY_WAIT_SECONDS = 10
+
+IDEMPOTENCY_LOCK_SECONDS = 60
+
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key', 'x-install-id', 'x-primary-pin')
+
+# Read-your-writes pin for anonymous clients (see core/routers.py)
+CORS_EXPOSE_HEADERS = ['x-primary-pin']
+
+# Tests clone a template database (schema + bulk-loaded SQL dump) instead of migrating (see core/test_runner.py)
+
+TEST_RUNNER = 'core.test_runner.TemplateDatabaseRunner'
+
+TEST_FIXTURE_SQL = BASE_DIR / 'pagoumorou.sql'
+
+TEST_TEMPLATE_DIR = BASE_DIR / '.test_templates'
+
+# Search results (per destination/gender/stay) and room details in the default cache, warmed by warm_caches
+# (see pagoumorou/response_cache.py). The cache must be shared by all web processes for warm_caches to help.
+
+SEARCH_CACHE_SECONDS = 300
+
+ROOM_CACHE_SECONDS = 600
@@ -0,0 +1,40 @@
+"""
+Slim settings profile for API-only pods.
+
+Drops the admin, sessions, messages, static files and template machinery
+that the JSON endpoints never use. Select it with
+DJANGO_SETTINGS_MODULE=core.settings_api.
+"""
+from core.settings import *  # noqa: F401,F403
+from core.settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    )
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+]
+
+ROOT_URLCONF = 'core.urls_api'
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['rest_framework.parsers.JSONParser'],
+}
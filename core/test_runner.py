@@ -0,0 +1,169 @@
+"""
+Test runner that clones a prebuilt template database instead of migrating.
+
+The template is the full schema plus TEST_FIXTURE_SQL bulk-loaded by
+load_sql_fixture (see core/fixtures.py). It is built once and reused while
+the migrations, the dump and the loader stay the same: their hash is part
+of the template name, so any change builds a fresh template and drops the
+stale one. Each run then only copies it:
+
+- PostgreSQL: ``CREATE DATABASE test_x TEMPLATE test_x_template_<hash>``;
+- SQLite: a file copy of TEST_TEMPLATE_DIR/template-<hash>.sqlite3.
+
+Query-count and benchmark tests get realistic data in a fresh database in a
+fraction of a second. ``--rebuild-template`` forces a rebuild. Other
+backends, or a missing dump, fall back to Django's regular setup.
+"""
+import hashlib
+import io
+import os
+import shutil
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+
+import core.fixtures
+
+
+class TemplateDatabaseRunner(DiscoverRunner):
+    def __init__(self, *args, rebuild_template=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rebuild_template = rebuild_template
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--rebuild-template', action='store_true',
+            help='Rebuild the template database even if migrations and fixture are unchanged.',
+        )
+
+    def setup_databases(self, **kwargs):
+        connection = connections[DEFAULT_DB_ALIAS]
+        fixture = Path(settings.TEST_FIXTURE_SQL)
+        if (
+            DEFAULT_DB_ALIAS not in kwargs.get("aliases", ())
+            or connection.vendor not in ("postgresql", "sqlite")
+            or not fixture.exists()
+        ):
+            return super().setup_databases(**kwargs)
+
+        old_name = connection.settings_dict["NAME"]
+        # Réplicas apontam para o banco de teste antes de migrate/carga (o router lê delas)
+        for alias in connections:
+            if connections[alias].settings_dict["TEST"].get("MIRROR") == DEFAULT_DB_ALIAS:
+                connections[alias].close()
+                connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+
+        fingerprint = _fingerprint(fixture)
+        if connection.vendor == "postgresql":
+            test_name = self.clone_postgres(connection, fingerprint)
+        else:
+            test_name = self.clone_sqlite(connection, fingerprint)
+        _use_database(connection, test_name)
+
+        if self.verbosity >= 1:
+            self.log(f"Cloned test database {test_name!r} from template {fingerprint[:12]}.")
+
+        serialized_aliases = kwargs.get("serialized_aliases")
+        if serialized_aliases is None or DEFAULT_DB_ALIAS in serialized_aliases:
+            connection._test_serialized_contents = connection.creation.serialize_db_to_string()
+        # Execução paralela: cada worker ganha uma cópia (o Django clona com TEMPLATE/cópia de arquivo)
+        if self.parallel > 1:
+            for index in range(self.parallel):
+                connection.creation.clone_test_db(suffix=str(index + 1), verbosity=self.verbosity, keepdb=self.keepdb)
+
+        return [(connection, old_name, True)]
+
+    def clone_postgres(self, connection, fingerprint: str) -> str:
+        test_name = connection.creation._get_test_db_name()
+        prefix = f"{test_name}_template_"
+        template = prefix + fingerprint[:12]
+        quote = connection.ops.quote_name
+
+        with connection._nodb_cursor() as cursor:
+            cursor.execute("SELECT datname FROM pg_database WHERE datname LIKE %s", [prefix + "%"])
+            existing = {row[0] for row in cursor.fetchall()}
+
+        if self.rebuild_template or template not in existing:
+            partial = f"{template}_partial"
+            with connection._nodb_cursor() as cursor:
+                # Templates de outras versões das migrations/do dump não servem mais
+                for name in existing:
+                    cursor.execute(f"DROP DATABASE {quote(name)}")
+                cursor.execute(f"CREATE DATABASE {quote(partial)}")
+            try:
+                self.build_template(connection, partial)
+            except BaseException:
+                connection.close()
+                with connection._nodb_cursor() as cursor:
+                    cursor.execute(f"DROP DATABASE IF EXISTS {quote(partial)}")
+                raise
+            with connection._nodb_cursor() as cursor:
+                cursor.execute(f"ALTER DATABASE {quote(partial)} RENAME TO {quote(template)}")
+
+        with connection._nodb_cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {quote(test_name)}")
+            cursor.execute(f"CREATE DATABASE {quote(test_name)} TEMPLATE {quote(template)}")
+        return test_name
+
+    def clone_sqlite(self, connection, fingerprint: str) -> str:
+        directory = Path(settings.TEST_TEMPLATE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        template = directory / f"template-{fingerprint[:12]}.sqlite3"
+
+        if self.rebuild_template or not template.exists():
+            for stale in directory.glob("template-*.sqlite3"):
+                stale.unlink()
+            partial = template.with_name(template.name + ".partial")
+            partial.unlink(missing_ok=True)
+            try:
+                self.build_template(connection, str(partial))
+            except BaseException:
+                connection.close()
+                partial.unlink(missing_ok=True)
+                raise
+            os.replace(partial, template)
+
+        # Banco em memória não tem arquivo para receber a cópia: usa um arquivo por processo
+        test_name = connection.creation._get_test_db_name()
+        if connection.creation.is_in_memory_db(test_name):
+            test_name = str(directory / f"test-{os.getpid()}.sqlite3")
+        shutil.copyfile(template, test_name)
+        return test_name
+
+    def build_template(self, connection, name: str) -> None:
+        if self.verbosity >= 1:
+            self.log("Building template database (migrate + fixture load)...")
+        _use_database(connection, name)
+        output = None if self.verbosity >= 2 else io.StringIO()
+        call_command(
+            "migrate", database=connection.alias, interactive=False, run_syncdb=True,
+            verbosity=max(self.verbosity - 1, 0), stdout=output,
+        )
+        call_command("load_sql_fixture", str(settings.TEST_FIXTURE_SQL), stdout=output)
+        # CREATE DATABASE ... TEMPLATE exige o template sem conexões abertas
+        connection.close()
+
+
+def _use_database(connection, name: str) -> None:
+    connection.close()
+    settings.DATABASES[connection.alias]["NAME"] = name
+    connection.settings_dict["NAME"] = name
+
+
+def _fingerprint(fixture: Path) -> str:
+    """Hash de tudo que muda o conteúdo do template: migrations, dump, loader e versão do Django."""
+    digest = hashlib.sha256(django.get_version().encode())
+    files = [fixture, Path(core.fixtures.__file__)]
+    for app_config in apps.get_app_configs():
+        files.extend(sorted((Path(app_config.path) / "migrations").glob("*.py")))
+    for path in files:
+        digest.update(str(path.name).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
@@ -0,0 +1,192 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.fixtures import load_dump, parse_dump
+from core.models import IdempotencyKey
+from core.routers import PIN_HEADER, ReplicaPinMiddleware, ReplicaRouter, _pinned
+from core.schema import Date, FieldError
+from pagoumorou import throttling
+from pagoumorou.models import Destination, Proposal
+from pagoumorou.tests.factories import create_room
+
+
+def write_dump(content: str) -> Path:
+    file = tempfile.NamedTemporaryFile("w", suffix=".sql", encoding="utf-8", delete=False)
+    with file:
+        file.write(content)
+    return Path(file.name)
+
+
+class ParseDumpTests(SimpleTestCase):
+    def test_copy_block(self):
+        path = write_dump(
+            "COPY public.destination (id, name, country_id, destination_type, image_url) FROM stdin;\n"
+            "1\tJardins\tBR\tCI\t\\N\n"
+            "2\tTab\\there\\nand line\tBR\tNB\thttps://example.com/2.jpg\n"
+            "\\.\n"
+            "COPY public.feature (id, name) FROM stdin;\n"
+            "\\.\n"
+        )
+        self.addCleanup(path.unlink)
+
+        tables = parse_dump(path)
+
+        self.assertEqual(tables["destination"].columns, ["id", "name", "country_id", "destination_type", "image_url"])
+        self.assertEqual(tables["destination"].rows, [
+            ["1", "Jardins", "BR", "CI", None],
+            ["2", "Tab\there\nand line", "BR", "NB", "https://example.com/2.jpg"],
+        ])
+        self.assertEqual(tables["feature"].rows, [])
+
+    def test_insert_statements(self):
+        path = write_dump(
+            "INSERT INTO destination (id, name, country_id, destination_type, image_url) "
+            "VALUES (1, 'Jardins, Florianópolis', 'BR', 'CI', NULL);\n"
+            "INSERT INTO \"destination\" (id, name, country_id, destination_type, image_url) "
+            "VALUES (2, 'D''Ávila', 'BR', 'NB', 'https://example.com/2.jpg');\n"
+            "INSERT INTO room (id, shared) VALUES (3, TRUE);\n"
+        )
+        self.addCleanup(path.unlink)
+
+        tables = parse_dump(path)
+
+        self.assertEqual(tables["destination"].rows, [
+            ["1", "Jardins, Florianópolis", "BR", "CI", None],
+            ["2", "D'Ávila", "BR", "NB", "https://example.com/2.jpg"],
+        ])
+        self.assertEqual(tables["room"].rows, [["3", True]])
+
+    def test_columns_must_match_between_statements(self):
+        path = write_dump(
+            "INSERT INTO feature (id, name) VALUES (1, 'Wi-Fi');\n"
+            "INSERT INTO feature (id) VALUES (2);\n"
+        )
+        self.addCleanup(path.unlink)
+
+        with self.assertRaises(ValueError):
+            parse_dump(path)
+
+
+class LoadDumpTests(TestCase):
+    def test_skips_tables_missing_required_columns(self):
+        path = write_dump(
+            "COPY public.destination (id, name, country_id, destination_type) FROM stdin;\n"
+            "900001\tLoader\tBR\tCI\n"
+            "\\.\n"
+            "INSERT INTO feature (id) VALUES (900001);\n"
+            "INSERT INTO legacy_table (id) VALUES (1);\n"
+            "INSERT INTO django_session (session_key) VALUES ('x');\n"
+        )
+        self.addCleanup(path.unlink)
+
+        result = load_dump(path)
+
+        self.assertEqual(result.loaded, {"destination": 1})
+        self.assertEqual(result.skipped, {"feature": "missing name", "legacy_table": "no model"})
+        destination = Destination.objects.get(id=900001)
+        self.assertEqual((destination.name, destination.latitude), ("Loader", None))
+
+
+class DateFieldTests(SimpleTestCase):
+    def test_accepts_only_calendar_dates(self):
+        self.assertEqual(Date().clean("2025-01-06").isoformat(), "2025-01-06")
+        for value in ("2025-W01-1", "2025W011", "20250106", "2025-1-6", "2025-02-30", "２０２５-01-06", 20250106):
+            with self.subTest(value=value), self.assertRaises(FieldError):
+                Date().clean(value)
+
+
+class ReplicaPinMiddlewareTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.seen_pinned = []
+
+    def view(self, write: bool):
+        def get_response(request):
+            self.seen_pinned.append(_pinned.get())
+            if write:
+                ReplicaRouter().db_for_write(User)
+            return HttpResponse()
+        return ReplicaPinMiddleware(get_response)
+
+    def test_authenticated_writer_is_pinned_by_user_id(self):
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(User(id=42))}"}
+
+        response = self.view(write=True)(self.factory.post("/", **auth))
+        self.view(write=False)(self.factory.get("/", **auth))
+        self.view(write=False)(self.factory.get("/"))
+
+        self.assertIn(PIN_HEADER, response)
+        self.assertEqual(self.seen_pinned, [False, True, False])
+
+    def test_anonymous_client_echoes_the_pin_header(self):
+        response = self.view(write=True)(self.factory.post("/"))
+        self.view(write=False)(self.factory.get("/", HTTP_X_PRIMARY_PIN=response[PIN_HEADER]))
+        self.view(write=False)(self.factory.get("/", HTTP_X_PRIMARY_PIN=str(int(time.time()) + 3600)))
+
+        self.assertEqual(self.seen_pinned, [False, True, False])
+
+    def test_reads_do_not_pin(self):
+        response = self.view(write=False)(self.factory.post("/"))
+
+        self.assertNotIn(PIN_HEADER, response)
+
+
+class IdempotencyTests(TestCase):
+    url = "/api/pagoumorou/proposal"
+
+    def setUp(self):
+        # Buckets próprios: os limites de proposta do processo não vazam entre os testes
+        patcher = mock.patch.object(throttling, "_store", throttling.LocMemBucketStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.room = create_room()
+        self.body = {
+            "roomId": self.room.id,
+            "stayInPeriod": 30,
+            "email": "inquilino@example.com",
+            "fullName": "Inquilino",
+            "birthDate": "2000-01-01",
+            "moveDate": "2030-01-01",
+            "suggestedPrice": "500.00",
+        }
+
+    def post(self, body=None, **extra):
+        return self.client.post(self.url, body or self.body, content_type="application/json",
+                                HTTP_IDEMPOTENCY_KEY="retry-1", **extra)
+
+    def test_anonymous_retry_from_another_network_is_replayed(self):
+        first = self.post(REMOTE_ADDR="10.0.0.1", HTTP_X_INSTALL_ID="install-a")
+        retry = self.post(REMOTE_ADDR="172.16.0.9", HTTP_X_INSTALL_ID="install-a")
+
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Proposal.objects.filter(room=self.room).count(), 1)
+
+    def test_installs_do_not_share_keys(self):
+        self.post(HTTP_X_INSTALL_ID="install-a")
+        other = self.post(HTTP_X_INSTALL_ID="install-b")
+
+        self.assertFalse(other.has_header("Idempotent-Replayed"))
+        self.assertEqual(Proposal.objects.filter(room=self.room).count(), 2)
+
+    def test_same_key_with_another_body_is_rejected(self):
+        self.post()
+        response = self.post({**self.body, "suggestedPrice": "600.00"})
+
+        self.assertEqual(response.status_code, 422)
+
+    @override_settings(API_MAX_BODY_BYTES=256)
+    def test_oversized_body_is_rejected_before_claiming_the_key(self):
+        response = self.post({**self.body, "fullName": "x" * 512})
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(IdempotencyKey.objects.exists())
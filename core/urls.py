@@ -17,8 +17,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from user.views import TokenObtainView, TokenRefreshRotateView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/pagoumorou/', include('pagoumorou.urls')),
     path('api/user/', include('user.urls')),
+    path('api/token/', TokenObtainView.as_view(), name='token-obtain'),
+    path('api/token/refresh/', TokenRefreshRotateView.as_view(), name='token-refresh'),
 ]
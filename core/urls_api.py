@@ -0,0 +1,13 @@
+"""
+URL configuration for the API-only settings profile (core.settings_api): no admin.
+"""
+from django.urls import include, path
+
+from user.views import TokenObtainView, TokenRefreshRotateView
+
+urlpatterns = [
+    path('api/pagoumorou/', include('pagoumorou.urls')),
+    path('api/user/', include('user.urls')),
+    path('api/token/', TokenObtainView.as_view(), name='token-obtain'),
+    path('api/token/refresh/', TokenRefreshRotateView.as_view(), name='token-refresh'),
+]
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from core.admin import EstimatedCountPaginator
 from .models import (
     Destination,
     Property,
@@ -7,18 +8,97 @@ from .models import (
     Feature,
     RoomFeature,
     RoomPhoto,
+    RoomPhotoVariant,
     Proposal,
     Rental,
     RoomPrice
 )
 
-admin.site.register(Destination)
-admin.site.register(Property)
-admin.site.register(PropertyManager)
-admin.site.register(Room)
-admin.site.register(Feature)
-admin.site.register(RoomFeature)
-admin.site.register(RoomPhoto)
-admin.site.register(Proposal)
-admin.site.register(Rental)
-admin.site.register(RoomPrice)
+
+@admin.register(Destination)
+class DestinationAdmin(admin.ModelAdmin):
+    list_display = ("name", "destination_type", "country_id")
+    list_filter = ("destination_type",)
+    search_fields = ("name",)
+
+
+@admin.register(Property)
+class PropertyAdmin(admin.ModelAdmin):
+    list_display = ("name", "type", "destination")
+    list_select_related = ("destination",)
+    readonly_fields = ("geohash",)
+    list_filter = ("type",)
+    search_fields = ("name",)
+    autocomplete_fields = ("destination",)
+    raw_id_fields = ("address",)
+
+
+@admin.register(PropertyManager)
+class PropertyManagerAdmin(admin.ModelAdmin):
+    list_display = ("__str__",)
+    list_select_related = ("profile", "property")
+    autocomplete_fields = ("profile", "property")
+
+
+@admin.register(Room)
+class RoomAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "capacity", "shared", "accept_men", "accept_women", "available_now")
+    list_select_related = ("property",)
+    search_fields = ("room_number", "property__name")
+    autocomplete_fields = ("property",)
+
+
+@admin.register(Feature)
+class FeatureAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(RoomFeature)
+class RoomFeatureAdmin(admin.ModelAdmin):
+    list_display = ("__str__",)
+    list_select_related = ("room__property", "feature")
+    autocomplete_fields = ("room", "feature")
+
+
+@admin.register(RoomPhoto)
+class RoomPhotoAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "position", "width", "height")
+    list_select_related = ("room__property",)
+    raw_id_fields = ("room",)
+
+
+@admin.register(RoomPhotoVariant)
+class RoomPhotoVariantAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "width", "height", "size_bytes")
+    list_select_related = ("photo__room__property",)
+    list_filter = ("variant",)
+    raw_id_fields = ("photo",)
+
+
+@admin.register(Proposal)
+class ProposalAdmin(admin.ModelAdmin):
+    list_display = ("id", "profile", "room", "status", "period", "move_in_date", "created_at")
+    list_select_related = ("profile", "room__property")
+    list_filter = ("status",)
+    raw_id_fields = ("profile", "room", "reviewed_by")
+    ordering = ("-created_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Rental)
+class RentalAdmin(admin.ModelAdmin):
+    list_display = ("id", "profile", "room", "start_date", "end_date", "created_at")
+    list_select_related = ("profile", "room__property")
+    raw_id_fields = ("proposal", "profile", "room")
+    ordering = ("-created_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(RoomPrice)
+class RoomPriceAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "price")
+    list_select_related = ("room__property",)
+    list_filter = ("period",)
+    raw_id_fields = ("room",)
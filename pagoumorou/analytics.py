@@ -0,0 +1,82 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from pagoumorou.metrics import counters
+from pagoumorou.models import SearchEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    """Fila em memória de SearchEvent, gravada em lote por uma thread própria.
+
+    Grava quando acumula `batch_size` eventos ou a cada `flush_seconds`. Com a
+    fila cheia o evento é descartado (e contado), nunca bloqueia a requisição.
+    """
+
+    def __init__(self, name: str, max_size: int, batch_size: int, flush_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._pending: list[SearchEvent] = []
+        self._wakeup = threading.Condition(threading.Lock())
+        self._writer: threading.Thread | None = None
+
+    def record(self, **fields: Any) -> None:
+        with self._wakeup:
+            if len(self._pending) >= self.max_size:
+                counters.incr(f"dropped.{self.name}")
+                return
+            self._pending.append(SearchEvent(created_at=timezone.now(), **fields))
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.notify()
+            if self._writer is None:
+                self._start()
+        counters.incr(f"recorded.{self.name}")
+
+    def flush(self) -> int:
+        with self._wakeup:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+
+        try:
+            SearchEvent.objects.bulk_create(batch, batch_size=self.batch_size)
+        except DatabaseError:
+            # Analytics não derruba nada: o lote é perdido e contado
+            logger.exception("Could not write %d %s, dropping the batch", len(batch), self.name)
+            counters.incr(f"failed.{self.name}", len(batch))
+            return 0
+
+        counters.incr(f"flushed.{self.name}", len(batch))
+        return len(batch)
+
+    def _start(self) -> None:
+        self._writer = threading.Thread(target=self._run, name=f"{self.name}-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            deadline = time.monotonic() + self.flush_seconds
+            with self._wakeup:
+                while len(self._pending) < self.batch_size and time.monotonic() < deadline:
+                    self._wakeup.wait(deadline - time.monotonic())
+            self.flush()
+            connection.close_if_unusable_or_obsolete()
+
+
+search_events = EventBuffer(
+    "search_events",
+    max_size=settings.SEARCH_EVENTS_BUFFER_SIZE,
+    batch_size=settings.SEARCH_EVENTS_BATCH_SIZE,
+    flush_seconds=settings.SEARCH_EVENTS_FLUSH_SECONDS,
+)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PagoumorouConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'pagoumorou'
+
+    def ready(self):
+        from pagoumorou import signals  # noqa: F401
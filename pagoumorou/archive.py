@@ -0,0 +1,90 @@
+"""
+Cold storage for closed years of proposals and rentals.
+
+archive_closed_years writes each batch of archived rows to
+ARCHIVE_ROOT/<table>/<year>/<timestamp>.ndjson.zst (or .ndjson.gz when
+zstandard is not installed), one JSON object per row with the column values
+of the table, and only then deletes the rows from the database. When the
+tables are partitioned (partition_tables) and every row of a year's
+partition can go, the partition is detached, written out and dropped
+instead of deleted row by row. Files are never rewritten: archiving the
+same year again adds another file.
+
+read_archive() streams the rows back for reporting:
+
+    from pagoumorou.archive import read_archive
+    accepted = sum(1 for row in read_archive("proposal", years=[2023]) if row["status"] == "Accepted")
+"""
+import gzip
+import io
+import os
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import orjson
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def archive_dir(table: str, year: int) -> Path:
+    return Path(settings.ARCHIVE_ROOT) / table / str(year)
+
+
+def write_archive(table: str, year: int, rows: Iterable[dict[str, Any]]) -> tuple[Path, Path]:
+    """
+    Grava as linhas em um arquivo temporário ao lado do destino final e devolve
+    (temporário, final). Quem chama renomeia depois que o DELETE for confirmado.
+    """
+    directory = archive_dir(table, year)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    suffix = ".ndjson.zst" if zstandard is not None else ".ndjson.gz"
+    final = directory / f"{datetime.now():%Y%m%dT%H%M%S%f}{suffix}"
+    partial = final.with_name(final.name + ".partial")
+
+    with open(partial, "wb") as raw:
+        if zstandard is not None:
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+        else:
+            stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9)
+        with stream:
+            for row in rows:
+                stream.write(orjson.dumps(row, default=_default, option=orjson.OPT_APPEND_NEWLINE))
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    return partial, final
+
+
+def read_archive(table: str, years: Iterable[int] | None = None) -> Iterator[dict[str, Any]]:
+    root = Path(settings.ARCHIVE_ROOT) / table
+    directories = [root / str(year) for year in years] if years is not None else sorted(root.glob("*"))
+
+    for directory in directories:
+        for path in sorted(directory.glob("*.ndjson.*")):
+            if path.name.endswith(".partial"):
+                continue
+            with _open(path) as stream:
+                for line in stream:
+                    yield orjson.loads(line)
+
+
+def _open(path: Path):
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed; install zstandard to read it")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return gzip.open(path, "rb")
+
+
+def _default(value: Any) -> Any:
+    # orjson já serializa date/datetime; Decimal vira string para não perder centavos
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
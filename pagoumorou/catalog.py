@@ -0,0 +1,177 @@
+import threading
+import time
+from datetime import date
+from typing import Any, Iterable, NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from pagoumorou.models import Feature, Room, RoomPrice
+from pagoumorou.occupancy import full_days
+from pagoumorou.quotes import price_matrix, ranked_results
+
+
+class Snapshot(NamedTuple):
+    room_ids: np.ndarray       # int64
+    prices: np.ndarray         # float64 (quartos x períodos), inf sem preço
+    accept_men: np.ndarray     # bool
+    accept_women: np.ndarray   # bool
+    features: np.ndarray       # uint64, bit = posição em feature_bits
+    lat: np.ndarray            # float64
+    lon: np.ndarray            # float64
+    summaries: list[dict[str, Any]]
+    full_rooms: np.ndarray     # int64, room_id de cada dia lotado (todas as camas ocupadas)
+    full_days: np.ndarray      # int64, date.toordinal() do dia lotado
+
+
+class DestinationCatalog:
+    """Snapshot colunar dos quartos de um destino, buscado inteiramente em memória."""
+
+    def __init__(self, destination_id: int):
+        self.destination_id = destination_id
+        self.snapshot: Snapshot | None = None
+        self.built_at = 0.0
+        self.dirty_rooms: set[int] = set()
+        self.stale = True
+        self._lock = threading.Lock()
+        self._feature_bits: dict[int, int] = {}
+
+    def mark_dirty(self, room_id: int) -> None:
+        with self._lock:
+            self.dirty_rooms.add(room_id)
+
+    def mark_stale(self) -> None:
+        self.stale = True
+
+    def current(self) -> Snapshot:
+        with self._lock:
+            if self.stale or time.monotonic() - self.built_at > settings.CATALOG_MAX_AGE_SECONDS:
+                self.stale = False
+                self.dirty_rooms.clear()
+                self._feature_bits = {}
+                self.built_at = time.monotonic()
+                self.snapshot = self._load(Room.objects.filter(property__destination_id=self.destination_id))
+            elif self.dirty_rooms:
+                dirty = np.fromiter(self.dirty_rooms, dtype=np.int64)
+                self.dirty_rooms.clear()
+                self.snapshot = self._merge(
+                    self.snapshot,
+                    self._load(Room.objects.filter(property__destination_id=self.destination_id, id__in=dirty)),
+                    dirty,
+                )
+            return self.snapshot
+
+    def search(
+        self,
+        gender: str | None,
+        move_date: date | None,
+        stay_duration: int,
+        room_ids: Iterable[int] | None = None,
+    ) -> list[dict[str, Any]]:
+        snapshot = self.current()
+
+        mask = np.isfinite(snapshot.prices).any(axis=1)
+        if room_ids is not None:
+            mask &= np.isin(snapshot.room_ids, np.fromiter(room_ids, dtype=np.int64))
+        if gender == "male":
+            mask &= snapshot.accept_men
+        elif gender == "female":
+            mask &= snapshot.accept_women
+
+        if move_date:
+            first_day = move_date.toordinal()
+            in_stay = (snapshot.full_days >= first_day) & (snapshot.full_days < first_day + stay_duration)
+            mask &= ~np.isin(snapshot.room_ids, snapshot.full_rooms[in_stay])
+
+        positions = np.flatnonzero(mask)
+        summaries = [snapshot.summaries[position] for position in positions]
+        return ranked_results(summaries, snapshot.prices[positions], stay_duration)
+
+    def _load(self, rooms) -> Snapshot:
+        rooms = list(rooms.for_search().order_by('id'))
+        room_ids = [room.id for room in rooms]
+
+        prices = price_matrix(
+            RoomPrice.objects.filter(room_id__in=room_ids).values_list('room_id', 'period', 'price'),
+            room_ids,
+        )
+
+        if not self._feature_bits:
+            self._feature_bits = {
+                feature_id: bit
+                for bit, feature_id in enumerate(Feature.objects.order_by('id').values_list('id', flat=True)[:64])
+            }
+        features = np.zeros(len(rooms), dtype=np.uint64)
+        for position, room in enumerate(rooms):
+            for room_feature in room.roomfeature_set.all():
+                bit = self._feature_bits.get(room_feature.feature_id)
+                if bit is not None:
+                    features[position] |= np.uint64(1 << bit)
+
+        full = list(
+            full_days(timezone.localdate())
+            .filter(room_id__in=room_ids)
+            .values_list('room_id', 'day')
+        )
+
+        # Posição do imóvel; sem ela, a do destino (for_search já traz os dois)
+        coordinates = [
+            tuple(np.nan if value is None else value for value in room.property.coordinates()) for room in rooms
+        ]
+
+        return Snapshot(
+            room_ids=np.array(room_ids, dtype=np.int64),
+            prices=prices,
+            accept_men=np.array([room.accept_men for room in rooms], dtype=bool),
+            accept_women=np.array([room.accept_women for room in rooms], dtype=bool),
+            features=features,
+            lat=np.array([lat for lat, _ in coordinates], dtype=np.float64),
+            lon=np.array([lon for _, lon in coordinates], dtype=np.float64),
+            summaries=[room.to_search_dict() for room in rooms],
+            full_rooms=np.array([room_id for room_id, _ in full], dtype=np.int64),
+            full_days=np.array([day.toordinal() for _, day in full], dtype=np.int64),
+        )
+
+    def _merge(self, snapshot: Snapshot, changed: Snapshot, dirty: np.ndarray) -> Snapshot:
+        # Remove os quartos alterados (inclusive os que saíram do destino) e anexa as versões recarregadas
+        keep = np.flatnonzero(~np.isin(snapshot.room_ids, dirty))
+        keep_full = ~np.isin(snapshot.full_rooms, dirty)
+
+        return Snapshot(
+            room_ids=np.concatenate([snapshot.room_ids[keep], changed.room_ids]),
+            prices=np.concatenate([snapshot.prices[keep], changed.prices]),
+            accept_men=np.concatenate([snapshot.accept_men[keep], changed.accept_men]),
+            accept_women=np.concatenate([snapshot.accept_women[keep], changed.accept_women]),
+            features=np.concatenate([snapshot.features[keep], changed.features]),
+            lat=np.concatenate([snapshot.lat[keep], changed.lat]),
+            lon=np.concatenate([snapshot.lon[keep], changed.lon]),
+            summaries=[snapshot.summaries[position] for position in keep] + changed.summaries,
+            full_rooms=np.concatenate([snapshot.full_rooms[keep_full], changed.full_rooms]),
+            full_days=np.concatenate([snapshot.full_days[keep_full], changed.full_days]),
+        )
+
+
+_catalogs: dict[int, DestinationCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(destination_id: int) -> DestinationCatalog | None:
+    if destination_id not in settings.CATALOG_HOT_DESTINATIONS:
+        return None
+
+    catalog = _catalogs.get(destination_id)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.setdefault(destination_id, DestinationCatalog(destination_id))
+    return catalog
+
+
+def mark_room_dirty(room_id: int) -> None:
+    for catalog in list(_catalogs.values()):
+        catalog.mark_dirty(room_id)
+
+
+def mark_all_stale() -> None:
+    for catalog in list(_catalogs.values()):
+        catalog.mark_stale()
@@ -0,0 +1,70 @@
+from functools import reduce
+from operator import or_
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Min, Q
+from django.db.models.functions import Substr
+
+from pagoumorou.constants import PeriodChoices
+from pagoumorou.models import Room
+
+
+def tile_key(period: str, tile: str) -> str:
+    return f"map:{period}:{tile}"
+
+
+def map_clusters(tiles: list[str], period: str) -> list[dict[str, Any]]:
+    """
+    Clusters de quartos (com preço em `period`) dos tiles informados.
+
+    Cada tile é um prefixo de geohash; seus clusters são as subcélulas com um
+    caractere a mais. Tiles ficam em cache; os que faltam saem de uma única
+    consulta agrupada pelo prefixo de property.geohash.
+    """
+    keys = {tile: tile_key(period, tile) for tile in tiles}
+    cached = cache.get_many(keys.values())
+
+    missing = [tile for tile in tiles if keys[tile] not in cached]
+    if missing:
+        computed = _query_tiles(missing, period)
+        cache.set_many({keys[tile]: computed[tile] for tile in missing}, settings.MAP_TILE_CACHE_SECONDS)
+        cached.update({keys[tile]: computed[tile] for tile in missing})
+
+    return [cluster for tile in tiles for cluster in cached[keys[tile]]]
+
+
+def invalidate_tiles(geohashes: Iterable[str]) -> None:
+    # Todo tile que contém o ponto é um prefixo do seu geohash, em qualquer período
+    tiles = {geohash[:length] for geohash in geohashes if geohash for length in range(1, len(geohash))}
+    cache.delete_many([tile_key(period, tile) for period in PeriodChoices.values for tile in tiles])
+
+
+def _query_tiles(tiles: list[str], period: str) -> dict[str, list[dict[str, Any]]]:
+    # Todos os tiles de uma requisição têm a mesma precisão (a do zoom)
+    cell_length = len(tiles[0]) + 1
+    rows = (
+        Room.objects
+        .filter(reduce(or_, (Q(property__geohash__startswith=tile) for tile in tiles)), roomprice__period=period)
+        .annotate(cell=Substr('property__geohash', 1, cell_length))
+        .values('cell')
+        .annotate(
+            count=Count('id', distinct=True),
+            lat=Avg('property__latitude'),
+            lon=Avg('property__longitude'),
+            min_price=Min('roomprice__price'),
+        )
+        .order_by('cell')
+    )
+
+    clusters: dict[str, list[dict[str, Any]]] = {tile: [] for tile in tiles}
+    for row in rows:
+        clusters[row['cell'][:-1]].append({
+            "geohash": row['cell'],
+            "count": row['count'],
+            "lat": round(row['lat'], 6),
+            "lon": round(row['lon'], 6),
+            "min_price": float(row['min_price']),
+        })
+    return clusters
@@ -0,0 +1,47 @@
+import threading
+from typing import Any, Callable
+
+from pagoumorou.metrics import counters
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Requisições idênticas simultâneas executam uma única vez e compartilham o resultado."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            counters.incr(f"coalesced.{self.name}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        counters.incr(f"executed.{self.name}")
+        try:
+            call.result = fn()
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
@@ -13,6 +13,17 @@ class StatusChoices(models.TextChoices):
     REJECTED = 'Rejected'
     EXPIRED = 'Expired'
 
+class PhotoVariantChoices(models.TextChoices):
+    THUMB = 'thumb'
+    MEDIUM = 'medium'
+    FULL = 'full'
+
+TERMINAL_STATUSES = frozenset({
+    StatusChoices.ACCEPTED,
+    StatusChoices.REJECTED,
+    StatusChoices.EXPIRED,
+})
+
 PERIOD_VERBOSE = {
     PeriodChoices.WEEK: "7 dias",
     PeriodChoices.BIWEEK: "15 dias",
@@ -20,3 +31,44 @@ PERIOD_VERBOSE = {
     PeriodChoices.SEMESTER: "1 semestre",
     PeriodChoices.YEAR: "1 ano",
 }
+
+PERIOD_DAYS = {
+    PeriodChoices.WEEK: 7,
+    PeriodChoices.BIWEEK: 15,
+    PeriodChoices.MONTH: 30,
+    PeriodChoices.SEMESTER: 180,
+    PeriodChoices.YEAR: 365,
+}
+
+DAYS_TO_PERIOD = {days: period for period, days in PERIOD_DAYS.items()}
+
+MAX_STAY_DAYS = 730
+
+PROPOSAL_PAGE_SIZE = 20
+
+PROPOSAL_MAX_PAGE_SIZE = 100
+
+# Quartos similares guardados por quarto (compute_similar_rooms) e exibidos na página do quarto
+SIMILAR_ROOMS_TOP_K = 10
+
+SIMILAR_ROOMS_SHOWN = 6
+
+# Mínimo de preços de um destino/período para exibir o selo de "bom negócio"
+DEAL_MIN_SAMPLES = 5
+
+# Máximo de tiles (células de geohash) por requisição ao mapa
+MAP_MAX_TILES = 64
+
+# Aquecimento de cache (warm_caches): combinações de busca e quartos mais procurados na janela recente
+WARM_TOP_SEARCHES = 50
+
+WARM_TOP_ROOMS = 200
+
+WARM_LOOKBACK_DAYS = 30
+
+# Maior lado, em pixels, de cada variante gerada pelo process_photos
+PHOTO_VARIANT_SIZES = {
+    PhotoVariantChoices.THUMB: 320,
+    PhotoVariantChoices.MEDIUM: 800,
+    PhotoVariantChoices.FULL: 1600,
+}
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+PROPOSAL_STATUS_CHANNEL = "proposal_status"
+NOTIFY_CHUNK_SIZE = 500
+
+
+class Subscription:
+    def __init__(self, proposal_id: int, loop: asyncio.AbstractEventLoop):
+        self.proposal_id = proposal_id
+        self.loop = loop
+        self.queue: asyncio.Queue[str] = asyncio.Queue()
+
+
+class ProposalStatusBroadcaster:
+    """Fan-out em memória: entrega mudanças de status aos streams SSE deste processo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, proposal_id: int) -> Subscription:
+        subscription = Subscription(proposal_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[proposal_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.proposal_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.proposal_id]
+
+    def publish(self, proposal_id: int, status: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(proposal_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, status)
+            except RuntimeError:
+                # Loop já encerrado; o stream será limpo no finally da view.
+                pass
+
+
+broadcaster = ProposalStatusBroadcaster()
+
+
+class PostgresListener(threading.Thread):
+    """Conexão dedicada com LISTEN que repassa os NOTIFY ao broadcaster local."""
+
+    def __init__(self):
+        super().__init__(name="proposal-status-listener", daemon=True)
+
+    def run(self) -> None:
+        import psycopg2
+
+        db = settings.DATABASES["default"]
+        while True:
+            try:
+                conn = psycopg2.connect(
+                    dbname=db["NAME"],
+                    user=db.get("USER") or None,
+                    password=db.get("PASSWORD") or None,
+                    host=db.get("HOST") or None,
+                    port=db.get("PORT") or None,
+                )
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {PROPOSAL_STATUS_CHANNEL}")
+
+                while True:
+                    if select.select([conn], [], [], settings.PROPOSAL_EVENTS_KEEPALIVE_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        payload = json.loads(notify.payload)
+                        for proposal_id in payload["proposal_ids"]:
+                            broadcaster.publish(proposal_id, payload["status"])
+            except Exception:
+                logger.exception("Proposal status listener lost its connection, reconnecting")
+                threading.Event().wait(5)
+
+
+_listener: PostgresListener | None = None
+_listener_lock = threading.Lock()
+
+
+def ensure_listener() -> None:
+    global _listener
+
+    if connection.vendor != "postgresql" or _listener is not None:
+        return
+
+    with _listener_lock:
+        if _listener is None:
+            _listener = PostgresListener()
+            _listener.start()
+
+
+def publish_status_change(proposal_id: int, status: str) -> None:
+    publish_status_changes([proposal_id], status)
+
+
+def publish_status_changes(proposal_ids: list[int], status: str) -> None:
+    if connection.vendor == "postgresql":
+        # O NOTIFY só é entregue no commit e chega a todos os processos, inclusive este.
+        # Payload limitado a 8000 bytes: ids em blocos.
+        with connection.cursor() as cursor:
+            for start in range(0, len(proposal_ids), NOTIFY_CHUNK_SIZE):
+                payload = json.dumps({"proposal_ids": proposal_ids[start:start + NOTIFY_CHUNK_SIZE], "status": status})
+                cursor.execute("SELECT pg_notify(%s, %s)", [PROPOSAL_STATUS_CHANNEL, payload])
+        return
+
+    def publish():
+        for proposal_id in proposal_ids:
+            broadcaster.publish(proposal_id, status)
+
+    transaction.on_commit(publish)
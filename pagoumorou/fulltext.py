@@ -0,0 +1,68 @@
+import re
+
+from django.db import connection, connections, router
+
+# PostgreSQL: coluna room.search_document (tsvector, config portuguese) com índice GIN, mantida por triggers.
+# SQLite (testes/desenvolvimento): tabela FTS5 room_fts com rowid = room.id, mantida pelos signals.
+# Ambas são criadas pela migration 0009_room_search.
+
+SQLITE_DOCUMENT = """
+    SELECT r.id,
+           coalesce(r.description, '') || ' ' || coalesce(r.rules, ''),
+           coalesce(p.name, '') || ' ' || coalesce(p.description, '') || ' ' || coalesce(p.rules, '')
+      FROM room r
+      JOIN property p ON p.id = r.property_id
+"""
+
+
+def refresh_rooms(where: str, params: list) -> None:
+    """Reindexa os quartos selecionados por `where` (sobre r/p); só é necessário no SQLite."""
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM room_fts WHERE rowid IN (SELECT r.id FROM room r WHERE {where})", params)
+        cursor.execute(f"INSERT INTO room_fts (rowid, room_body, property_body) {SQLITE_DOCUMENT} WHERE {where}", params)
+
+
+def delete_room(room_id: int) -> None:
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM room_fts WHERE rowid = %s", [room_id])
+
+
+def search_ranks(q: str, destination_id: int) -> dict[int, float]:
+    """Relevância (maior = melhor) de cada quarto do destino que atende ao texto `q`."""
+    from pagoumorou.models import Room
+
+    # SQL puro não passa pelo router; escolhe a conexão de leitura explicitamente
+    read_connection = connections[router.db_for_read(Room)]
+    if read_connection.vendor == "postgresql":
+        sql = """
+            SELECT r.id, ts_rank_cd(r.search_document, query)
+              FROM room r
+              JOIN property p ON p.id = r.property_id,
+                   websearch_to_tsquery('portuguese', %s) query
+             WHERE p.destination_id = %s
+               AND r.search_document @@ query
+        """
+        params = [q, destination_id]
+    else:
+        terms = re.findall(r"\w+", q)
+        if not terms:
+            return {}
+        sql = """
+            SELECT r.id, -bm25(room_fts, 2.0, 1.0)
+              FROM room_fts
+              JOIN room r ON r.id = room_fts.rowid
+              JOIN property p ON p.id = r.property_id
+             WHERE room_fts MATCH %s
+               AND p.destination_id = %s
+        """
+        params = [" ".join(f'"{term}"' for term in terms), destination_id]
+
+    with read_connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {room_id: float(rank) for room_id, rank in cursor.fetchall()}
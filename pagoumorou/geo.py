@@ -0,0 +1,67 @@
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+GEOHASH_PRECISION = 12
+
+
+def encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    # Bits alternados começando pela longitude, 5 bits por caractere
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = value = 0
+    even = True
+
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(altura, largura) em graus de uma célula com `precision` caracteres."""
+    total_bits = 5 * precision
+    lat_bits = total_bits // 2
+    lon_bits = total_bits - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def covering_cells(south: float, west: float, north: float, east: float, precision: int) -> list[str]:
+    """Células de `precision` caracteres que cobrem o retângulo (sem cruzar o antimeridiano)."""
+    height, width = cell_size(precision)
+    rows, columns = _grid(south, west, north, east, height, width)
+    # O centro da célula identifica o prefixo sem ambiguidade nas bordas
+    return [
+        encode(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+        for row in rows
+        for column in columns
+    ]
+
+
+def count_covering_cells(south: float, west: float, north: float, east: float, precision: int) -> int:
+    rows, columns = _grid(south, west, north, east, *cell_size(precision))
+    return len(rows) * len(columns)
+
+
+def tile_precision(zoom: int) -> int:
+    # Maior precisão cuja célula ainda é pelo menos tão larga quanto um tile de 256px no zoom
+    return min(max(2 * zoom // 5, 1), GEOHASH_PRECISION - 1)
+
+
+def _grid(south: float, west: float, north: float, east: float, height: float, width: float) -> tuple[range, range]:
+    # Norte/leste exatamente na borda do mundo ficam na última célula
+    rows = range(int((south + 90) // height), int((min(north, 90 - height / 2) + 90) // height) + 1)
+    columns = range(int((west + 180) // width), int((min(east, 180 - width / 2) + 180) // width) + 1)
+    return rows, columns
@@ -0,0 +1,183 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from pagoumorou.archive import write_archive
+from pagoumorou.constants import TERMINAL_STATUSES
+
+STATUSES = ", ".join(["%s"] * len(TERMINAL_STATUSES))
+
+# Aluguéis encerrados antes do corte, pelo ano de início (chave de partição de rental)
+RENTALS_SQL = """
+    SELECT *
+      FROM rental
+     WHERE start_date >= %s AND start_date < %s
+       AND end_date < %s
+       AND id > %s
+     ORDER BY id
+     LIMIT %s
+"""
+
+# Propostas finalizadas sem aluguel remanescente, pelo ano de entrada (chave de partição de proposal)
+PROPOSALS_SQL = f"""
+    SELECT p.*
+      FROM proposal p
+     WHERE p.move_in_date >= %s AND p.move_in_date < %s
+       AND p.status IN ({STATUSES})
+       AND NOT EXISTS (SELECT 1 FROM rental r WHERE r.proposal_id = p.id)
+       AND p.id > %s
+     ORDER BY p.id
+     LIMIT %s
+"""
+
+# Linhas da partição do ano que ainda não podem sair: com alguma, o ano é arquivado linha a linha
+RENTALS_KEPT_SQL = 'SELECT 1 FROM "{partition}" WHERE end_date IS NULL OR end_date >= %s LIMIT 1'
+
+PROPOSALS_KEPT_SQL = f"""
+    SELECT 1
+      FROM "{{partition}}" p
+     WHERE p.status NOT IN ({STATUSES})
+        OR EXISTS (SELECT 1 FROM rental r WHERE r.proposal_id = p.id)
+     LIMIT 1
+"""
+
+PARTITION_SQL = """
+    SELECT c.relname
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+     WHERE i.inhparent = to_regclass(%s) AND c.relname = %s
+"""
+
+DELETE_CHUNK = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Move para arquivos NDJSON comprimidos (ARCHIVE_ROOT) os aluguéis encerrados e as propostas '
+        'finalizadas dos anos fechados, apagando-os do banco. No PostgreSQL particionado, o ano em que '
+        'todas as linhas podem sair tem a partição desanexada e removida de uma vez'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-years', type=int, default=settings.ARCHIVE_KEEP_YEARS)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # keep-years=2 em 2026: 2025 e 2026 ficam no banco, até 2024 vai para o arquivo
+        cutoff_year = timezone.localdate().year - options['keep_years'] + 1
+        started = time.perf_counter()
+
+        first_year = self.first_year()
+        if first_year is None or first_year >= cutoff_year:
+            self.stdout.write(f"Nada a arquivar antes de {cutoff_year}.")
+            return
+
+        cutoff = f"{cutoff_year}-01-01"
+        totals = {"rental": 0, "proposal": 0}
+        for year in range(first_year, cutoff_year):
+            bounds = [f"{year}-01-01", f"{year + 1}-01-01"]
+            # Aluguéis antes: a proposta só é arquivada quando não sobra aluguel apontando para ela.
+            # Depois da partição, as linhas do ano que estejam em outra (default) seguem linha a linha
+            totals["rental"] += self.archive_partition("rental", year, RENTALS_KEPT_SQL, [cutoff], batch_size)
+            totals["rental"] += self.archive("rental", year, RENTALS_SQL, [*bounds, cutoff], batch_size)
+            totals["proposal"] += self.archive_partition(
+                "proposal", year, PROPOSALS_KEPT_SQL, [*TERMINAL_STATUSES], batch_size,
+            )
+            totals["proposal"] += self.archive(
+                "proposal", year, PROPOSALS_SQL, [*bounds, *TERMINAL_STATUSES], batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {totals['rental']} aluguéis e {totals['proposal']} propostas anteriores a {cutoff_year} "
+            f"arquivados em {time.perf_counter() - started:.1f}s"
+        ))
+
+    def archive_partition(self, table: str, year: int, kept_sql: str, params: list, batch_size: int) -> int:
+        """Arquiva e remove a partição do ano quando todas as linhas dela podem sair; senão devolve 0."""
+        if connection.vendor != "postgresql":
+            return 0
+
+        partition = f"{table}_{year}"
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(PARTITION_SQL, [table, partition])
+            if cursor.fetchone() is None:
+                return 0
+
+            # Bloqueia escritas na partição entre a verificação e o DETACH
+            cursor.execute(f'LOCK TABLE "{partition}" IN EXCLUSIVE MODE')
+            cursor.execute(f'SELECT 1 FROM "{partition}" LIMIT 1')
+            if cursor.fetchone() is None:
+                return 0
+            cursor.execute(kept_sql.format(partition=partition), params)
+            if cursor.fetchone() is not None:
+                return 0
+
+            # DETACH/DROP não disparam os triggers de FK: a verificação acima cobre as referências
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"')
+            archived = []
+            partial, final = write_archive(table, year, self.partition_rows(cursor, partition, batch_size, archived))
+            try:
+                cursor.execute(f'DROP TABLE "{partition}"')
+            except BaseException:
+                partial.unlink()
+                raise
+
+        partial.rename(final)
+        self.stdout.write(f"{table} {year}: partição {partition} ({len(archived)} linhas) em {final.parent}")
+        return len(archived)
+
+    def partition_rows(self, cursor, partition: str, batch_size: int, archived: list):
+        # Em lotes por id, para não carregar o ano inteiro na memória
+        last_id = 0
+        while True:
+            cursor.execute(f'SELECT * FROM "{partition}" WHERE id > %s ORDER BY id LIMIT %s', [last_id, batch_size])
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, values)) for values in cursor.fetchall()]
+            if not rows:
+                return
+            archived.extend(row["id"] for row in rows)
+            last_id = rows[-1]["id"]
+            yield from rows
+
+    def archive(self, table: str, year: int, sql: str, params: list, batch_size: int) -> int:
+        archived = 0
+        last_id = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [*params, last_id, batch_size])
+                columns = [column[0] for column in cursor.description]
+                rows = [dict(zip(columns, values)) for values in cursor.fetchall()]
+                if not rows:
+                    return archived
+
+                partial, final = write_archive(table, year, rows)
+                try:
+                    ids = [row["id"] for row in rows]
+                    for start in range(0, len(ids), DELETE_CHUNK):
+                        chunk = ids[start:start + DELETE_CHUNK]
+                        cursor.execute(
+                            f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(chunk))})", chunk,
+                        )
+                except BaseException:
+                    partial.unlink()
+                    raise
+
+            # Só depois do commit o arquivo passa a valer para read_archive
+            partial.rename(final)
+            archived += len(rows)
+            last_id = rows[-1]["id"]
+            self.stdout.write(f"{table} {year}: {archived} linhas em {final.parent}")
+
+    def first_year(self) -> int | None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT MIN(start_date) FROM rental")
+            first_rental = cursor.fetchone()[0]
+            cursor.execute("SELECT MIN(move_in_date) FROM proposal")
+            first_proposal = cursor.fetchone()[0]
+
+        years = [int(str(value)[:4]) for value in (first_rental, first_proposal) if value is not None]
+        return min(years) if years else None
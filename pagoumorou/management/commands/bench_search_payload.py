@@ -0,0 +1,63 @@
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core.middleware import ENCODERS, brotli, zstandard
+
+DECODERS = {
+    "identity": lambda data: data,
+    "gzip": gzip.decompress,
+}
+if zstandard is not None:
+    DECODERS["zstd"] = lambda data: zstandard.ZstdDecompressor().decompress(data)
+if brotli is not None:
+    DECODERS["br"] = brotli.decompress
+
+
+class Command(BaseCommand):
+    help = 'Compara bytes trafegados e tempo de parse no cliente da busca, por formato de resposta e codificação'
+
+    def add_arguments(self, parser):
+        parser.add_argument('destination_id', type=int)
+        parser.add_argument('--gender', default='female')
+        parser.add_argument('--move-date', default=None)
+        parser.add_argument('--stay-duration', type=int, default=180)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME='localhost')
+        body = {
+            "destinationId": options['destination_id'],
+            "gender": options['gender'],
+            "moveDate": options['move_date'],
+            "stayDuration": options['stay_duration'],
+        }
+
+        self.stdout.write(f"{'formato':<12}{'codificação':<13}{'bytes':>10}{'decodificar + parse':>22}")
+        for shape in ('nested', 'normalized'):
+            for encoding in ('identity', *ENCODERS):
+                response = client.post(
+                    '/api/pagoumorou/search', {**body, "shape": shape},
+                    content_type='application/json', HTTP_ACCEPT_ENCODING=encoding,
+                )
+                if response.status_code != 200:
+                    self.stderr.write(response.content.decode(errors='replace'))
+                    return
+
+                sent_as = response.get('Content-Encoding', 'identity')
+                payload = response.content
+                decode = DECODERS[sent_as]
+
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    data = json.loads(decode(payload))
+                elapsed = (time.perf_counter() - started) / options['repeat']
+
+                self.stdout.write(
+                    f"{shape:<12}{sent_as:<13}{len(payload):>10}{elapsed * 1000:>19.2f} ms"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(data['results'])} quartos por resposta"))
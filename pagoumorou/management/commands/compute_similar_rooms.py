@@ -0,0 +1,106 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from pagoumorou.constants import SIMILAR_ROOMS_TOP_K
+from pagoumorou.models import Room, RoomSimilarity
+from pagoumorou.response_cache import invalidate_rooms
+from pagoumorou.similarity import build_vectors, nearest, score
+
+
+class Command(BaseCommand):
+    help = 'Calcula os quartos similares de cada quarto (top-K) e grava em room_similarity'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=SIMILAR_ROOMS_TOP_K)
+        parser.add_argument('--batch-size', type=int, default=256)
+        parser.add_argument(
+            '--changed', action='store_true',
+            help='Recalcula só os quartos alterados desde a última execução e os que passam a tê-los como similares',
+        )
+
+    def handle(self, *args, **options):
+        top_k = options['top_k']
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        computed_at = timezone.now()
+
+        vectors = build_vectors()
+        if not len(vectors.room_ids):
+            self.stdout.write("Nenhum quarto.")
+            return
+        positions_by_id = {room_id: position for position, room_id in enumerate(vectors.room_ids.tolist())}
+
+        last_run = RoomSimilarity.objects.aggregate(last=Max('computed_at'))['last']
+        if options['changed'] and last_run is not None:
+            positions = self.affected_positions(vectors, positions_by_id, last_run, top_k, batch_size)
+        else:
+            positions = np.arange(len(vectors.room_ids))
+
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            neighbours, distances, _ = nearest(vectors, batch, top_k)
+            room_ids = vectors.room_ids[batch].tolist()
+
+            with transaction.atomic():
+                RoomSimilarity.objects.filter(room_id__in=room_ids).delete()
+                RoomSimilarity.objects.bulk_create([
+                    RoomSimilarity(
+                        room_id=room_id,
+                        similar_room_id=int(vectors.room_ids[neighbour]),
+                        rank=rank,
+                        score=float(score(distance)),
+                        computed_at=computed_at,
+                    )
+                    for room_id, row_neighbours, row_distances in zip(room_ids, neighbours, distances)
+                    for rank, (neighbour, distance) in enumerate(zip(row_neighbours, row_distances), start=1)
+                ], batch_size=5_000)
+                # A página do quarto em cache traz os similares
+                transaction.on_commit(lambda room_ids=room_ids: invalidate_rooms(room_ids))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Similares recalculados para {len(positions)} de {len(vectors.room_ids)} quartos em {elapsed:.2f}s"
+        ))
+
+    def affected_positions(self, vectors, positions_by_id, last_run, top_k, batch_size) -> np.ndarray:
+        expected = min(top_k, len(vectors.room_ids) - 1)
+        stored = {
+            room_id: (total, worst)
+            for room_id, total, worst in RoomSimilarity.objects.values('room_id').annotate(
+                total=Count('id'), worst=Min('score'),
+            ).values_list('room_id', 'total', 'worst')
+        }
+
+        # Alterados desde a última execução, novos e os que perderam similares (quarto excluído)
+        changed_ids = set(Room.objects.filter(updated_at__gt=last_run).values_list('id', flat=True))
+        changed_ids |= {room_id for room_id in positions_by_id if stored.get(room_id, (0, 0))[0] < expected}
+        changed = np.array(
+            sorted(positions_by_id[room_id] for room_id in changed_ids if room_id in positions_by_id), dtype=np.int64
+        )
+        if not len(changed):
+            return changed
+
+        # Quem já lista um quarto alterado precisa ser refeito (ele pode ter se afastado)
+        affected = set(
+            RoomSimilarity.objects.filter(similar_room_id__in=changed_ids).values_list('room_id', flat=True)
+        )
+
+        # Quem passaria a listar um quarto alterado: ele ficou mais perto que o pior similar atual
+        threshold = np.ones(len(vectors.room_ids))
+        for room_id, (_, worst) in stored.items():
+            position = positions_by_id.get(room_id)
+            if position is not None:
+                threshold[position] = worst
+
+        for start in range(0, len(changed), batch_size):
+            _, _, distances = nearest(vectors, changed[start:start + batch_size], 0)
+            closer = (score(distances) > threshold[None, :]).any(axis=0)
+            affected.update(vectors.room_ids[closer].tolist())
+
+        positions = {positions_by_id[room_id] for room_id in affected if room_id in positions_by_id}
+        return np.array(sorted(positions | set(changed.tolist())), dtype=np.int64)
@@ -0,0 +1,39 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.fixtures import load_dump
+from pagoumorou import fulltext, occupancy, price_stats
+from pagoumorou.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        'Carrega um dump SQL (COPY do pg_dump ou INSERTs linha a linha) em lote no banco já migrado '
+        'e recalcula os dados derivados (ocupação, estatísticas de preço, busca textual)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=settings.TEST_FIXTURE_SQL)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} não encontrado")
+
+        started = time.perf_counter()
+        result = load_dump(path)
+        for table, reason in result.skipped.items():
+            self.stdout.write(self.style.WARNING(f"{table} ignorada ({reason})"))
+
+        # Dados que os signals manteriam: o INSERT em lote não passa por eles
+        occupancy.refresh_rooms(Room.objects.values_list('id', flat=True))
+        price_stats.refresh()
+        fulltext.refresh_rooms("1 = 1", [])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {sum(result.loaded.values())} linhas em {len(result.loaded)} tabelas carregadas de {path.name} "
+            f"em {time.perf_counter() - started:.2f}s"
+        ))
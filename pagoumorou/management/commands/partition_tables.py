@@ -0,0 +1,298 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from pagoumorou.models import Proposal, Rental
+
+# Modelo -> coluna da chave de partição (RANGE anual), a mesma que archive_closed_years usa para
+# escolher o ano. Chave NOT NULL entra na PK; a de rental é anulável (aluguel sem data de início)
+# e as linhas sem data ficam na partição default
+PARTITIONED_MODELS = {
+    Proposal: "move_in_date",
+    Rental: "start_date",
+}
+
+IS_PARTITIONED_SQL = "SELECT pg_get_partkeydef(to_regclass(%s))"
+
+INDEXES_SQL = """
+    SELECT pg_get_indexdef(ix.indexrelid), ix.indisunique
+      FROM pg_index ix
+     WHERE ix.indrelid = to_regclass(%s)
+       AND NOT ix.indisprimary
+"""
+
+OUTGOING_FKS_SQL = """
+    SELECT conname, pg_get_constraintdef(oid)
+      FROM pg_constraint
+     WHERE conrelid = to_regclass(%s) AND contype = 'f'
+"""
+
+INCOMING_FKS_SQL = """
+    SELECT conrelid::regclass::text, conname
+      FROM pg_constraint
+     WHERE confrelid = to_regclass(%s) AND contype = 'f' AND conrelid <> confrelid
+"""
+
+COLUMN_SQL = """
+    SELECT is_nullable, is_identity
+      FROM information_schema.columns
+     WHERE table_schema = current_schema() AND table_name = %s AND column_name = %s
+"""
+
+PARTITIONS_SQL = """
+    SELECT c.relname
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+     WHERE i.inhparent = to_regclass(%s)
+"""
+
+# Unicidade e FKs que não cabem em tabela particionada (exigiriam a chave de partição) viram
+# constraint triggers. Argumentos em TG_ARGV porque os triggers do pai são clonados nas partições.
+FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION partitioned_unique_check() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    -- TG_ARGV: tabela pai, coluna
+    matches bigint;
+BEGIN
+    IF to_jsonb(NEW) ->> TG_ARGV[1] IS NULL THEN
+        RETURN NULL;
+    END IF;
+    -- Serializa inserções concorrentes do mesmo valor
+    PERFORM pg_advisory_xact_lock(hashtext(TG_ARGV[0] || '.' || TG_ARGV[1]), hashtext(to_jsonb(NEW) ->> TG_ARGV[1]));
+    EXECUTE format('SELECT count(*) FROM %I WHERE %I = ($1).%I', TG_ARGV[0], TG_ARGV[1], TG_ARGV[1])
+        INTO matches USING NEW;
+    IF matches > 1 THEN
+        RAISE EXCEPTION 'duplicate key value violates unique constraint "%_%_unique"', TG_ARGV[0], TG_ARGV[1]
+            USING ERRCODE = 'unique_violation';
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION partitioned_fk_check() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    -- TG_ARGV: tabela, pk, coluna, tabela referenciada, coluna referenciada
+    found integer;
+BEGIN
+    IF to_jsonb(NEW) ->> TG_ARGV[2] IS NULL THEN
+        RETURN NULL;
+    END IF;
+    -- Linha apagada ou alterada depois do evento: vale o estado atual
+    EXECUTE format('SELECT 1 FROM %I WHERE %I = ($1).%I AND %I = ($1).%I',
+                   TG_ARGV[0], TG_ARGV[1], TG_ARGV[1], TG_ARGV[2], TG_ARGV[2]) USING NEW;
+    GET DIAGNOSTICS found = ROW_COUNT;
+    IF found = 0 THEN
+        RETURN NULL;
+    END IF;
+    EXECUTE format('SELECT 1 FROM %I WHERE %I = ($1).%I FOR KEY SHARE', TG_ARGV[3], TG_ARGV[4], TG_ARGV[2])
+        USING NEW;
+    GET DIAGNOSTICS found = ROW_COUNT;
+    IF found = 0 THEN
+        RAISE EXCEPTION 'insert or update on table "%" violates foreign key "%_%_fk"', TG_ARGV[0], TG_ARGV[0], TG_ARGV[2]
+            USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION partitioned_fk_restrict() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    -- TG_ARGV: tabela referenciada, coluna referenciada, tabela que referencia, coluna que referencia
+    found integer;
+BEGIN
+    -- Linha que só mudou de partição (ou foi reinserida) continua valendo
+    EXECUTE format('SELECT 1 FROM %I WHERE %I = ($1).%I', TG_ARGV[0], TG_ARGV[1], TG_ARGV[1]) USING OLD;
+    GET DIAGNOSTICS found = ROW_COUNT;
+    IF found > 0 THEN
+        RETURN NULL;
+    END IF;
+    EXECUTE format('SELECT 1 FROM %I WHERE %I = ($1).%I LIMIT 1', TG_ARGV[2], TG_ARGV[3], TG_ARGV[1]) USING OLD;
+    GET DIAGNOSTICS found = ROW_COUNT;
+    IF found > 0 THEN
+        RAISE EXCEPTION 'update or delete on table "%" violates foreign key "%_%_fk"', TG_ARGV[0], TG_ARGV[2], TG_ARGV[3]
+            USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NULL;
+END $$;
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Converte proposal e rental em tabelas particionadas por ano (PostgreSQL, RANGE em '
+        'move_in_date/start_date) e cria as partições dos próximos anos. PK, unicidade e FKs que o '
+        'particionamento não comporta passam a ser garantidas por constraint triggers. Rodar de novo '
+        'só cria as partições que faltam. No SQLite as tabelas continuam sem particionamento.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years-ahead', type=int, default=2)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(f"{connection.vendor}: particionamento só existe no PostgreSQL, nada a fazer.")
+            return
+
+        last_year = timezone.localdate().year + options['years_ahead']
+        for model, key in PARTITIONED_MODELS.items():
+            table = model._meta.db_table
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(IS_PARTITIONED_SQL, [table])
+                partition_key = cursor.fetchone()[0]
+                if partition_key is None:
+                    self.convert(cursor, table, key, last_year)
+                elif partition_key != f"RANGE ({key})":
+                    raise CommandError(f"{table} já está particionada por {partition_key}, esperado RANGE ({key})")
+                else:
+                    created = self.create_partitions(cursor, table, key, self.first_year(cursor, table, key), last_year)
+                    self.stdout.write(f"{table}: {created} partições novas")
+
+                # Depois de cada conversão: os triggers da tabela recriada (ou das que apontam para ela)
+                self.ensure_constraints(cursor)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Partições anuais garantidas até {last_year}"))
+
+    def convert(self, cursor, table: str, key: str, last_year: int) -> None:
+        old = f"{table}_unpartitioned"
+
+        cursor.execute(INDEXES_SQL, [table])
+        indexes = cursor.fetchall()
+        cursor.execute(OUTGOING_FKS_SQL, [table])
+        outgoing = cursor.fetchall()
+        cursor.execute(INCOMING_FKS_SQL, [table])
+        incoming = cursor.fetchall()
+        cursor.execute(COLUMN_SQL, [table, key])
+        nullable = cursor.fetchone()[0] == "YES"
+        cursor.execute(COLUMN_SQL, [table, "id"])
+        serial = cursor.fetchone()[1] != "YES"
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+        sequence = cursor.fetchone()[0]
+        first_year = self.first_year(cursor, table, key)
+
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ("{key}")'
+        )
+        if serial:
+            # Tabelas antigas usam serial: a sequência passa a pertencer à nova tabela antes do DROP
+            cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{table}"."id"')
+        # A PK de tabela particionada precisa incluir a chave; a unicidade só de id fica com o trigger
+        if nullable:
+            # Coluna anulável não entra em PK: fica só o índice para as buscas por id
+            cursor.execute(f'CREATE INDEX "{table}_id_idx" ON "{table}" ("id")')
+        else:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ("id", "{key}")')
+
+        self.create_partitions(cursor, table, key, first_year, last_year)
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{old}"')
+
+        # FKs nativas que apontam para esta tabela exigiriam unicidade só em id: ensure_constraints as recria
+        for referencing, name in incoming:
+            cursor.execute(f'ALTER TABLE {referencing} DROP CONSTRAINT "{name}"')
+            self.stdout.write(f"{table}: FK {referencing}.{name} substituída por trigger")
+        cursor.execute(f'DROP TABLE "{old}"')
+
+        for definition, unique in indexes:
+            if unique:
+                # O índice continua servindo às buscas; a unicidade fica com o trigger
+                definition = definition.replace("CREATE UNIQUE INDEX", "CREATE INDEX", 1)
+            cursor.execute(definition)
+        for name, definition in outgoing:
+            cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM \"{table}\"",
+            [table],
+        )
+        self.stdout.write(f"{table}: particionada por {key} ({first_year}..{last_year} + default)")
+
+    def ensure_constraints(self, cursor) -> None:
+        """(Re)cria os triggers de unicidade e de FK das tabelas já particionadas, a partir dos modelos."""
+        cursor.execute(FUNCTIONS_SQL)
+
+        for model, key in PARTITIONED_MODELS.items():
+            table = model._meta.db_table
+            cursor.execute(IS_PARTITIONED_SQL, [table])
+            if cursor.fetchone()[0] is None:
+                continue
+
+            # pk e OneToOne/unique=True: imediatos, como as constraints únicas do Django
+            for field in model._meta.concrete_fields:
+                if field.unique and field.column != key:
+                    self.create_trigger(
+                        cursor, f"{table}_{field.column}_unique", table,
+                        f'AFTER INSERT OR UPDATE OF "{field.column}"', "NOT DEFERRABLE",
+                        "partitioned_unique_check", [table, field.column],
+                    )
+
+            # FKs para esta tabela: adiáveis, como as FKs que o Django cria
+            for relation in model._meta.related_objects:
+                if relation.many_to_many or not relation.field.concrete:
+                    continue
+                referencing = relation.related_model._meta.db_table
+                column = relation.field.column
+                target = relation.field.target_field.column
+                self.create_trigger(
+                    cursor, f"{referencing}_{column}_fk", referencing,
+                    f'AFTER INSERT OR UPDATE OF "{column}"', "DEFERRABLE INITIALLY DEFERRED",
+                    "partitioned_fk_check",
+                    [referencing, relation.related_model._meta.pk.column, column, table, target],
+                )
+                self.create_trigger(
+                    cursor, f"{table}_{referencing}_{column}_fk", table,
+                    f'AFTER DELETE OR UPDATE OF "{target}"', "DEFERRABLE INITIALLY DEFERRED",
+                    "partitioned_fk_restrict", [table, target, referencing, column],
+                )
+
+    def create_trigger(self, cursor, name: str, table: str, events: str, timing: str,
+                       function: str, arguments: list[str]) -> None:
+        literals = ", ".join(f"'{argument}'" for argument in arguments)
+        cursor.execute(f'DROP TRIGGER IF EXISTS "{name}" ON "{table}"')
+        cursor.execute(
+            f'CREATE CONSTRAINT TRIGGER "{name}" {events} ON "{table}" {timing} '
+            f'FOR EACH ROW EXECUTE FUNCTION {function}({literals})'
+        )
+
+    def create_partitions(self, cursor, table: str, key: str, first_year: int, last_year: int) -> int:
+        cursor.execute(PARTITIONS_SQL, [table])
+        existing = {name for (name,) in cursor.fetchall()}
+        default = f"{table}_default"
+
+        created = 0
+        for year in range(first_year, last_year + 1):
+            name = f"{table}_{year}"
+            if name in existing:
+                continue
+            bounds = [date(year, 1, 1), date(year + 1, 1, 1)]
+
+            in_default = False
+            if default in existing:
+                cursor.execute(f'SELECT 1 FROM "{default}" WHERE "{key}" >= %s AND "{key}" < %s LIMIT 1', bounds)
+                in_default = cursor.fetchone() is not None
+
+            if in_default:
+                # A partição nova não pode ser criada com linhas do ano na default: monta a tabela
+                # à parte, move as linhas e só então anexa (os triggers adiáveis veem o estado final)
+                cursor.execute(
+                    f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+                )
+                cursor.execute(
+                    f'INSERT INTO "{name}" SELECT * FROM "{default}" WHERE "{key}" >= %s AND "{key}" < %s', bounds,
+                )
+                cursor.execute(f'DELETE FROM "{default}" WHERE "{key}" >= %s AND "{key}" < %s', bounds)
+                cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES FROM (%s) TO (%s)', bounds)
+                self.stdout.write(f"{table}: linhas de {year} movidas da partição default para {name}")
+            else:
+                cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)', bounds)
+            created += 1
+
+        if default not in existing:
+            cursor.execute(f'CREATE TABLE "{default}" PARTITION OF "{table}" DEFAULT')
+            created += 1
+        return created
+
+    def first_year(self, cursor, table: str, key: str) -> int:
+        cursor.execute(f'SELECT MIN("{key}") FROM "{table}"')
+        first = cursor.fetchone()[0]
+        return first.year if first else timezone.localdate().year
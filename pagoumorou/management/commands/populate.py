@@ -34,7 +34,8 @@ class Command(BaseCommand):
             type='BoardingHouse',
             rules='Proibido fumar; visitas até 22h.',
             address=base_address,
-            destination=destination
+            destination=destination,
+            defaults={'latitude': -23.4869, 'longitude': -46.5003},
         )
 
         # 4. Cria Features base
@@ -0,0 +1,107 @@
+import time
+from pathlib import Path
+
+import blurhash
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from pagoumorou.constants import PHOTO_VARIANT_SIZES
+from pagoumorou.models import RoomPhoto, RoomPhotoVariant
+from pagoumorou.signals import rooms_changed_on_commit
+
+
+class Command(BaseCommand):
+    help = 'Gera dimensões, blurhash e variantes (thumb/medium/full) das fotos a partir dos arquivos locais'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source-dir', default=settings.PHOTO_SOURCE_ROOT)
+        parser.add_argument('--output-dir', default=settings.PHOTO_OUTPUT_ROOT)
+        parser.add_argument('--base-url', default=settings.PHOTO_BASE_URL)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--force', action='store_true', help='Reprocessa fotos que já têm metadados')
+
+    def handle(self, *args, **options):
+        source_dir = Path(options['source_dir'])
+        output_dir = Path(options['output_dir'])
+        base_url = options['base_url'].rstrip('/')
+        batch_size = options['batch_size']
+
+        photos = RoomPhoto.objects.exclude(source_path__isnull=True).exclude(source_path='').order_by('id')
+        if not options['force']:
+            photos = photos.filter(blurhash__isnull=True)
+
+        started = time.perf_counter()
+        processed = failed = 0
+        last_id = 0
+
+        while True:
+            batch = list(photos.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            updated, variants = [], []
+            for photo in batch:
+                try:
+                    variants.extend(self.process(photo, source_dir, output_dir, base_url))
+                except OSError as ex:
+                    failed += 1
+                    self.stderr.write(f"Foto {photo.id}: {ex}")
+                    continue
+                updated.append(photo)
+
+            with transaction.atomic():
+                RoomPhoto.objects.bulk_update(updated, ['width', 'height', 'size_bytes', 'blurhash'])
+                RoomPhotoVariant.objects.bulk_create(
+                    variants,
+                    update_conflicts=True,
+                    unique_fields=['photo', 'variant'],
+                    update_fields=['url', 'width', 'height', 'size_bytes'],
+                )
+                # Escritas em lote não disparam photo_variant_changed: cache e snapshots dos quartos
+                rooms_changed_on_commit(photo.room_id for photo in updated)
+
+            processed += len(updated)
+            self.stdout.write(f"{processed} fotos processadas ({time.perf_counter() - started:.1f}s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {processed} fotos processadas, {failed} com erro, em {time.perf_counter() - started:.1f}s"
+        ))
+
+    def process(self, photo: RoomPhoto, source_dir: Path, output_dir: Path, base_url: str) -> list[RoomPhotoVariant]:
+        source = source_dir / photo.source_path
+
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original).convert('RGB')
+
+        photo.width, photo.height = image.size
+        photo.size_bytes = source.stat().st_size
+
+        # O blurhash só precisa de uma miniatura; calcular na imagem inteira seria lento
+        sample = image.copy()
+        sample.thumbnail((32, 32))
+        photo.blurhash = blurhash.encode(np.asarray(sample).tolist(), components_x=4, components_y=3)
+
+        variants = []
+        for variant, max_side in PHOTO_VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+            relative = Path('rooms') / str(photo.room_id) / f"{photo.id}-{variant}.jpg"
+            target = output_dir / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            resized.save(target, 'JPEG', quality=82, optimize=True, progressive=True)
+
+            variants.append(RoomPhotoVariant(
+                photo=photo,
+                variant=variant,
+                url=f"{base_url}/{relative.as_posix()}",
+                width=resized.width,
+                height=resized.height,
+                size_bytes=target.stat().st_size,
+            ))
+
+        return variants
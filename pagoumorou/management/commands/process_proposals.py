@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from pagoumorou import occupancy
+from pagoumorou.constants import StatusChoices
+from pagoumorou.events import publish_status_changes
+from pagoumorou.models import Proposal
+from pagoumorou.signals import rooms_changed_on_commit
+
+EXPIRE_SQL = """
+    UPDATE proposal
+       SET status = %s
+     WHERE id >= %s AND id < %s
+       AND status = %s
+       AND (move_in_date < %s OR created_at < %s)
+    RETURNING id
+"""
+
+# start/end recebem as datas da proposta porque a disponibilidade da busca é calculada sobre elas
+MATERIALIZE_SQL = """
+    INSERT INTO rental (
+        proposal_id, profile_id, room_id, period,
+        start_date, end_date, expected_start_date, expected_end_date, created_at
+    )
+    SELECT p.id, p.profile_id, p.room_id, p.period,
+           p.move_in_date, p.move_out_date, p.move_in_date, p.move_out_date, %s
+      FROM proposal p
+      LEFT JOIN rental r ON r.proposal_id = p.id
+     WHERE p.id >= %s AND p.id < %s
+       AND p.status = %s
+       AND r.id IS NULL
+    RETURNING room_id
+"""
+
+
+class Command(BaseCommand):
+    help = 'Expira propostas pendentes vencidas e cria os aluguéis das propostas aceitas, em lotes por faixa de id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--pending-ttl-days', type=int, default=settings.PROPOSAL_PENDING_TTL_DAYS)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        today = timezone.localdate()
+        stale_before = now - timedelta(days=options['pending_ttl_days'])
+
+        bounds = Proposal.objects.aggregate(first=Min('id'), last=Max('id'))
+        if bounds['first'] is None:
+            self.stdout.write("Nenhuma proposta.")
+            return
+
+        started = time.perf_counter()
+        expired_total = rentals_total = batches = 0
+
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            end = start + batch_size
+            batch_started = time.perf_counter()
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(EXPIRE_SQL, [
+                    StatusChoices.EXPIRED, start, end, StatusChoices.PENDING, today, stale_before,
+                ])
+                expired = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(MATERIALIZE_SQL, [now, start, end, StatusChoices.ACCEPTED])
+                rental_rooms = [row[0] for row in cursor.fetchall()]
+                rentals = len(rental_rooms)
+
+                # O INSERT em SQL não dispara os signals de Rental
+                occupancy.refresh_rooms(rental_rooms)
+                rooms_changed_on_commit(rental_rooms)
+                publish_status_changes(expired, StatusChoices.EXPIRED)
+
+            batches += 1
+            expired_total += len(expired)
+            rentals_total += rentals
+            if expired or rentals:
+                self.stdout.write(
+                    f"ids [{start}, {end}): {len(expired)} expiradas, {rentals} aluguéis "
+                    f"({(time.perf_counter() - batch_started) * 1000:.0f} ms)"
+                )
+
+        pruned = occupancy.prune(today)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{pruned} dias de ocupação anteriores a hoje removidos")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {expired_total} propostas expiradas e {rentals_total} aluguéis criados "
+            f"em {batches} lotes, {elapsed:.2f}s"
+        ))
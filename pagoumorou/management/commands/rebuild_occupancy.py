@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pagoumorou import occupancy
+from pagoumorou.models import Room, RoomOccupancy
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a ocupação diária de camas (room_occupancy) de todos os quartos a partir dos aluguéis'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1_000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        room_ids = list(Room.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(room_ids), batch_size):
+            occupancy.refresh_rooms(room_ids[start:start + batch_size])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Ocupação recalculada para {len(room_ids)} quartos "
+            f"({RoomOccupancy.objects.count()} dias ocupados) em {elapsed:.2f}s"
+        ))
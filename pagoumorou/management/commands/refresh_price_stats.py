@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pagoumorou import price_stats
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as estatísticas de preço (count/min/mediana/p90) por destino e período usadas no selo de "bom negócio"'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--destination', type=int, action='append', dest='destinations')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        pairs = price_stats.refresh(options['destinations'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {pairs} pares destino/período atualizados em {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,71 @@
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from pagoumorou.models import SearchEvent, SearchStatsHourly
+
+
+class Command(BaseCommand):
+    help = (
+        'Consolida os eventos de busca (search_event) em agregados por hora, destino e duração '
+        '(search_stats_hourly) e apaga os eventos brutos mais antigos que a retenção'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int, default=settings.SEARCH_EVENTS_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        current_hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+        # A última hora consolidada é refeita: eventos dela podem ter sido gravados depois do rollup
+        last_hour = SearchStatsHourly.objects.aggregate(last=Max('hour'))['last']
+        since = last_hour or SearchEvent.objects.aggregate(first=Min('created_at'))['first']
+        if since is None:
+            self.stdout.write("Nenhum evento de busca.")
+            return
+
+        rows = (
+            SearchEvent.objects
+            .filter(created_at__gte=since, created_at__lt=current_hour)
+            .annotate(hour=TruncHour('created_at'))
+            .values('hour', 'destination_id', 'stay_duration', 'move_date')
+            .annotate(searches=Count('id'), empty_searches=Count('id', filter=Q(results=0)))
+            .order_by()
+        )
+
+        stats = defaultdict(lambda: {"searches": 0, "empty_searches": 0, "with_move_date": 0, "lead_days_total": 0})
+        for row in rows.iterator():
+            entry = stats[row['hour'], row['destination_id'], row['stay_duration']]
+            entry["searches"] += row['searches']
+            entry["empty_searches"] += row['empty_searches']
+            if row['move_date'] is not None:
+                entry["with_move_date"] += row['searches']
+                entry["lead_days_total"] += (row['move_date'] - row['hour'].date()).days * row['searches']
+
+        cutoff = min(since, timezone.now() - timedelta(days=options['retention_days']))
+        with transaction.atomic():
+            SearchStatsHourly.objects.bulk_create(
+                [
+                    SearchStatsHourly(hour=hour, destination_id=destination_id, stay_duration=stay_duration, **values)
+                    for (hour, destination_id, stay_duration), values in stats.items()
+                ],
+                batch_size=1_000,
+                update_conflicts=True,
+                unique_fields=['hour', 'destination_id', 'stay_duration'],
+                update_fields=['searches', 'empty_searches', 'with_move_date', 'lead_days_total'],
+            )
+            # Só apaga eventos de horas já consolidadas
+            deleted, _ = SearchEvent.objects.filter(created_at__lt=cutoff).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(stats)} agregados horários atualizados desde {since:%Y-%m-%d %H:%M}, "
+            f"{deleted} eventos antigos apagados, em {time.perf_counter() - started:.2f}s"
+        ))
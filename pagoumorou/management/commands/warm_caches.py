@@ -0,0 +1,140 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from pagoumorou.constants import PERIOD_DAYS, WARM_LOOKBACK_DAYS, WARM_TOP_ROOMS, WARM_TOP_SEARCHES
+from pagoumorou.models import Proposal, SearchEvent
+from pagoumorou.response_cache import cached_room, cached_search
+from pagoumorou.views import SearchAPI, room_detail
+from user.models import Profile
+
+# Gênero do perfil -> gênero aceito pela busca
+SEARCH_GENDERS = {Profile.Gender.MALE: "male", Profile.Gender.FEMALE: "female"}
+
+
+class Command(BaseCommand):
+    help = (
+        'Aquece o cache de busca e de quartos (após deploy ou limpeza do cache) com as combinações '
+        'destino/estadia/gênero mais buscadas e os quartos mais procurados, usando um pool de threads'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--searches', type=int, default=WARM_TOP_SEARCHES)
+        parser.add_argument('--rooms', type=int, default=WARM_TOP_ROOMS)
+        parser.add_argument('--days', type=int, default=WARM_LOOKBACK_DAYS)
+        parser.add_argument('--workers', type=int, default=8)
+
+    def handle(self, *args, **options):
+        if isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache)):
+            raise CommandError(
+                "O cache padrão é local a este processo: aquecê-lo daqui não afeta os servidores web."
+            )
+
+        since = timezone.now() - timedelta(days=options['days'])
+        searches = self.top_searches(since, options['searches'])
+        rooms = self.top_rooms(since, options['rooms'])
+
+        search_api = SearchAPI()
+        tasks = [
+            (
+                f"busca destino={destination_id} estadia={stay_duration} gênero={gender or '-'}",
+                lambda destination_id=destination_id, stay_duration=stay_duration, gender=gender: cached_search(
+                    destination_id, gender, stay_duration,
+                    lambda: search_api.query(destination_id, gender, None, stay_duration, None),
+                    refresh=True,
+                ),
+            )
+            for destination_id, stay_duration, gender in searches
+        ] + [
+            (f"quarto {room_id}", lambda room_id=room_id: cached_room(room_id, lambda: room_detail(room_id), refresh=True))
+            for room_id in rooms
+        ]
+        if not tasks:
+            self.stdout.write("Nada a aquecer: sem buscas nem propostas na janela.")
+            return
+
+        started = time.perf_counter()
+        failures = 0
+        slowest = (0.0, "")
+        step = max(len(tasks) // 10, 1)
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix="warm") as executor:
+            futures = {executor.submit(_timed, warm): label for label, warm in tasks}
+            for done, future in enumerate(as_completed(futures), start=1):
+                label = futures[future]
+                try:
+                    slowest = max(slowest, (future.result(), label))
+                except Exception as exc:
+                    failures += 1
+                    self.stderr.write(f"{label}: {exc}")
+                if done % step == 0 or done == len(tasks) or options['verbosity'] >= 2:
+                    self.stdout.write(f"[{done}/{len(tasks)}] {time.perf_counter() - started:.1f}s")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(searches)} buscas e {len(rooms)} quartos aquecidos em {elapsed:.2f}s "
+            f"({failures} falhas; mais lento: {slowest[1]}, {slowest[0]:.2f}s)"
+        ))
+
+    def top_searches(self, since, limit: int) -> list[tuple[int, int, str | None]]:
+        # Destinos quentes são servidos pelo catálogo em memória de cada processo, não pelo cache
+        hot = settings.CATALOG_HOT_DESTINATIONS
+        combos: list[tuple[int, int, str | None]] = []
+
+        # Tráfego recente (search_event, buscas sem texto) primeiro
+        events = (
+            SearchEvent.objects
+            .filter(created_at__gte=since, has_query=False)
+            .exclude(destination_id__in=hot)
+            .values_list('destination_id', 'stay_duration', 'gender')
+            .annotate(total=Count('id'))
+            .order_by('-total')[:limit]
+        )
+        combos.extend((destination_id, stay, gender) for destination_id, stay, gender, _ in events)
+
+        # Completa com o histórico de propostas: período -> estadia, gênero do perfil
+        if len(combos) < limit:
+            proposals = (
+                Proposal.objects
+                .filter(created_at__gte=since)
+                .exclude(room__property__destination_id__in=hot)
+                .values_list('room__property__destination_id', 'period', 'profile__gender')
+                .annotate(total=Count('id'))
+                .order_by('-total')
+            )
+            for destination_id, period, gender in (row[:3] for row in proposals):
+                combo = (destination_id, PERIOD_DAYS[period], SEARCH_GENDERS.get(gender))
+                if combo not in combos:
+                    combos.append(combo)
+                if len(combos) >= limit:
+                    break
+
+        return combos
+
+    def top_rooms(self, since, limit: int) -> list[int]:
+        # Visitas à página do quarto não são registradas: as propostas recentes indicam a procura
+        return list(
+            Proposal.objects
+            .filter(created_at__gte=since)
+            .values_list('room_id', flat=True)
+            .annotate(total=Count('id'))
+            .order_by('-total', 'room_id')[:limit]
+        )
+
+
+def _timed(warm) -> float:
+    started = time.perf_counter()
+    try:
+        warm()
+    finally:
+        # Cada thread do pool abre sua própria conexão
+        connection.close()
+    return time.perf_counter() - started
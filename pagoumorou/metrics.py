@@ -0,0 +1,19 @@
+import threading
+from collections import Counter
+
+
+class Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Counter[str] = Counter()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._values[name] += amount
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+
+counters = Counters()
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0006_alter_destination_destination_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('tokens', models.FloatField()),
+                ('updated_at', models.FloatField()),
+            ],
+            options={
+                'db_table': 'throttle_bucket',
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0007_throttle_bucket'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='roomphoto',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AddField(
+            model_name='roomphoto',
+            name='blurhash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='roomphoto',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='roomphoto',
+            name='position',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='roomphoto',
+            name='size_bytes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='roomphoto',
+            name='source_path',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='roomphoto',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RoomPhotoVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('variant', models.CharField(choices=[('thumb', 'Thumb'), ('medium', 'Medium'), ('full', 'Full')], max_length=10)),
+                ('url', models.URLField()),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('size_bytes', models.PositiveIntegerField()),
+                ('photo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='pagoumorou.roomphoto')),
+            ],
+            options={
+                'db_table': 'room_photo_variant',
+                'ordering': ['width'],
+                'constraints': [models.UniqueConstraint(fields=('photo', 'variant'), name='room_photo_variant_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+from django.db import migrations
+
+POSTGRES_INSTALL = [
+    "ALTER TABLE room ADD COLUMN search_document tsvector",
+    "CREATE INDEX room_search_document_gin ON room USING gin (search_document)",
+    """
+    CREATE FUNCTION room_search_document_refresh() RETURNS trigger AS $$
+    BEGIN
+        SELECT setweight(to_tsvector('portuguese', coalesce(NEW.description, '')), 'A')
+            || setweight(to_tsvector('portuguese', coalesce(NEW.rules, '')), 'B')
+            || setweight(to_tsvector('portuguese', coalesce(p.name, '') || ' ' || coalesce(p.description, '')), 'C')
+            || setweight(to_tsvector('portuguese', coalesce(p.rules, '')), 'D')
+          INTO NEW.search_document
+          FROM property p
+         WHERE p.id = NEW.property_id;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER room_search_document_trigger
+    BEFORE INSERT OR UPDATE OF description, rules, property_id ON room
+    FOR EACH ROW EXECUTE FUNCTION room_search_document_refresh()
+    """,
+    """
+    CREATE FUNCTION property_search_document_refresh() RETURNS trigger AS $$
+    BEGIN
+        UPDATE room SET description = description WHERE property_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER property_search_document_trigger
+    AFTER UPDATE OF name, description, rules ON property
+    FOR EACH ROW EXECUTE FUNCTION property_search_document_refresh()
+    """,
+    "UPDATE room SET description = description",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP TRIGGER property_search_document_trigger ON property",
+    "DROP FUNCTION property_search_document_refresh()",
+    "DROP TRIGGER room_search_document_trigger ON room",
+    "DROP FUNCTION room_search_document_refresh()",
+    "ALTER TABLE room DROP COLUMN search_document",
+]
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE room_fts USING fts5(room_body, property_body, tokenize = 'unicode61 remove_diacritics 2')",
+]
+
+# Cópia de pagoumorou.fulltext.SQLITE_DOCUMENT na época desta migration: migrations não importam código vivo
+SQLITE_DOCUMENT = """
+    SELECT r.id,
+           coalesce(r.description, '') || ' ' || coalesce(r.rules, ''),
+           coalesce(p.name, '') || ' ' || coalesce(p.description, '') || ' ' || coalesce(p.rules, '')
+      FROM room r
+      JOIN property p ON p.id = r.property_id
+"""
+
+SQLITE_UNINSTALL = [
+    "DROP TABLE room_fts",
+]
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for statement in POSTGRES_INSTALL:
+            schema_editor.execute(statement)
+    elif vendor == "sqlite":
+        for statement in SQLITE_INSTALL:
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO room_fts (rowid, room_body, property_body) {SQLITE_DOCUMENT}")
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for statement in POSTGRES_UNINSTALL:
+            schema_editor.execute(statement)
+    elif vendor == "sqlite":
+        for statement in SQLITE_UNINSTALL:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0008_room_photo_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0009_room_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='proposal',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='proposal',
+            name='status',
+            field=models.CharField(choices=[('Pending', 'Pending'), ('Accepted', 'Accepted'), ('Rejected', 'Rejected'), ('Expired', 'Expired')], db_index=True, default='Pending', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='rental',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
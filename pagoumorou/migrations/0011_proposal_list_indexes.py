@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0010_admin_list_indexes'),
+        ('user', '0003_auth_user_email_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['profile', '-created_at', '-id'], name='proposal_profile_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['room', '-created_at', '-id'], name='proposal_room_created_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0011_proposal_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RoomSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(db_index=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='pagoumorou.room')),
+                ('similar_room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pagoumorou.room')),
+            ],
+            options={
+                'db_table': 'room_similarity',
+                'ordering': ['rank'],
+                'constraints': [models.UniqueConstraint(fields=('room', 'rank'), name='room_similarity_rank_unique')],
+            },
+        ),
+    ]
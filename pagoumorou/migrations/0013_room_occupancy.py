@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:00
+
+from collections import Counter
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill(apps, schema_editor):
+    # Mesma regra de pagoumorou.occupancy.refresh_rooms, com os modelos históricos
+    Rental = apps.get_model('pagoumorou', 'Rental')
+    RoomOccupancy = apps.get_model('pagoumorou', 'RoomOccupancy')
+
+    today = timezone.localdate()
+    beds = Counter()
+    rentals = Rental.objects.filter(start_date__isnull=False, end_date__gt=today)
+    for room_id, start_date, end_date in rentals.values_list('room_id', 'start_date', 'end_date').iterator():
+        day = max(start_date, today)
+        while day < end_date:
+            beds[room_id, day] += 1
+            day += timedelta(days=1)
+
+    RoomOccupancy.objects.bulk_create([
+        RoomOccupancy(room_id=room_id, day=day, occupied_beds=count)
+        for (room_id, day), count in beds.items()
+    ], batch_size=5_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0012_room_similarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('occupied_beds', models.PositiveSmallIntegerField()),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='pagoumorou.room')),
+            ],
+            options={
+                'db_table': 'room_occupancy',
+                'constraints': [models.UniqueConstraint(fields=('room', 'day'), name='room_occupancy_room_day_unique')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
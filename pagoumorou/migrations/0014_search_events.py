@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0013_room_occupancy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('destination_id', models.PositiveIntegerField()),
+                ('gender', models.CharField(blank=True, max_length=10, null=True)),
+                ('move_date', models.DateField(blank=True, null=True)),
+                ('stay_duration', models.PositiveIntegerField()),
+                ('has_query', models.BooleanField(default=False)),
+                ('results', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'search_event',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchStatsHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('destination_id', models.PositiveIntegerField()),
+                ('stay_duration', models.PositiveIntegerField()),
+                ('searches', models.PositiveIntegerField()),
+                ('empty_searches', models.PositiveIntegerField()),
+                ('with_move_date', models.PositiveIntegerField()),
+                ('lead_days_total', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'search_stats_hourly',
+                'constraints': [models.UniqueConstraint(fields=('hour', 'destination_id', 'stay_duration'), name='search_stats_hourly_unique')],
+            },
+        ),
+    ]
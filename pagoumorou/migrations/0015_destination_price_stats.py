@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0014_search_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DestinationPriceStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('Week', 'Week'), ('Biweek', 'Biweek'), ('Month', 'Month'), ('Semester', 'Semester'), ('Year', 'Year')], max_length=10)),
+                ('count', models.PositiveIntegerField()),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('median_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('p90_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('destination', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_stats', to='pagoumorou.destination')),
+            ],
+            options={
+                'db_table': 'destination_price_stats',
+                'constraints': [models.UniqueConstraint(fields=('destination', 'period'), name='destination_price_stats_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+# Cópia de pagoumorou.geo.encode na época desta migration: migrations não importam código vivo
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(lat: float, lon: float, precision: int = 12) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = value = 0
+    even = True
+
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+
+    return "".join(chars)
+
+
+def backfill_geohash(apps, schema_editor):
+    # Imóveis anteriores ao geohash: coordenadas do endereço geocodificado (ou as próprias) e geohash
+    Property = apps.get_model('pagoumorou', 'Property')
+    changed = []
+    for prop in Property.objects.select_related('address').order_by('id').iterator(chunk_size=2_000):
+        if prop.address is not None and prop.address.latitude is not None and prop.address.longitude is not None:
+            prop.latitude, prop.longitude = prop.address.latitude, prop.address.longitude
+        if prop.latitude is None or prop.longitude is None:
+            continue
+        prop.geohash = encode(prop.latitude, prop.longitude)
+        changed.append(prop)
+    Property.objects.bulk_update(changed, ['latitude', 'longitude', 'geohash'], batch_size=1_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0016_property_geohash'),
+        ('user', '0004_address_coordinates'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0017_backfill_property_geohash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='roomoccupancy',
+            index=models.Index(fields=['day', 'room'], name='room_occupancy_day_room_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagoumorou', '0018_room_occupancy_day_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='destination',
+            name='destination_type',
+            field=models.CharField(choices=[('CT', 'Country'), ('ST', 'State'), ('CI', 'City'), ('NB', 'Neighborhood'), ('PL', 'Place')], db_index=True, max_length=2),
+        ),
+        migrations.AlterField(
+            model_name='property',
+            name='type',
+            field=models.CharField(choices=[('Republic', 'Republic'), ('BoardingHouse', 'Boarding House'), ('Hotel', 'Hotel')], db_index=True, max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='roomprice',
+            name='period',
+            field=models.CharField(choices=[('Week', 'Week'), ('Biweek', 'Biweek'), ('Month', 'Month'), ('Semester', 'Semester'), ('Year', 'Year')], db_index=True, default='Semester', max_length=10),
+        ),
+    ]
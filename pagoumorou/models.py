@@ -1,7 +1,9 @@
 
 from datetime import datetime
+from typing import Any
 from django.db import models
-from pagoumorou.constants import PeriodChoices, StatusChoices
+from pagoumorou import geo
+from pagoumorou.constants import PeriodChoices, PhotoVariantChoices, StatusChoices
 from user.models import Address, Profile
 
 class Destination(models.Model):
@@ -14,7 +16,7 @@ class Destination(models.Model):
 
     name = models.CharField(max_length=255)
     country_id = models.CharField(max_length=2)
-    destination_type = models.CharField(max_length=2, choices=DestinationType.choices)
+    destination_type = models.CharField(max_length=2, choices=DestinationType.choices, db_index=True)
     parent_destination_id = models.IntegerField(null=True, blank=True)
     image_url = models.URLField(null=True, blank=True)
     latitude = models.FloatField(null=True, blank=True)
@@ -33,11 +35,35 @@ class Property(models.Model):
         HOTEL = 'Hotel'
 
     name = models.CharField(max_length=255)
-    type = models.CharField(max_length=20, choices=PropertyType.choices)
+    type = models.CharField(max_length=20, choices=PropertyType.choices, db_index=True)
     rules = models.TextField()
     address = models.ForeignKey(Address, on_delete=models.PROTECT, null=True, blank=True)
     destination = models.ForeignKey(Destination, on_delete=models.PROTECT)
     description = models.TextField(null=True, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Derivado de latitude/longitude no save(); prefixos agrupam os pins do mapa
+    geohash = models.CharField(max_length=geo.GEOHASH_PRECISION, blank=True, default="", db_index=True)
+
+    def save(self, *args, **kwargs):
+        # Endereço geocodificado prevalece; os signals de Address mantêm as coordenadas em dia
+        if self.address is not None and self.address.latitude is not None and self.address.longitude is not None:
+            self.latitude, self.longitude = self.address.latitude, self.address.longitude
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "latitude", "longitude"}
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = ""
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "geohash"}
+        super().save(*args, **kwargs)
+
+    def coordinates(self) -> tuple[float | None, float | None]:
+        # Coordenadas próprias (do endereço geocodificado); sem elas, as do destino
+        if self.latitude is not None and self.longitude is not None:
+            return self.latitude, self.longitude
+        return self.destination.latitude, self.destination.longitude
 
     def __str__(self):
         return f"{self.name} ({self.get_type_display()})" # type: ignore[attr-defined]
@@ -55,6 +81,15 @@ class PropertyManager(models.Model):
     class Meta:
         db_table = "property_manager"
 
+class RoomQuerySet(models.QuerySet):
+    def for_search(self):
+        # Tudo o que to_search_dict() acessa, em um número fixo de queries
+        return self.select_related(
+            'property__address', 'property__destination'
+        ).prefetch_related(
+            'roomphoto_set__variants', 'roomfeature_set__feature'
+        )
+
 class Room(models.Model):
     room_number = models.CharField(max_length=50)
     capacity = models.IntegerField()
@@ -66,6 +101,40 @@ class Room(models.Model):
     available_from = models.DateTimeField(default=datetime(2025, 7, 5, 0, 0))
     description = models.TextField(null=True, blank=True)
     rules = models.TextField(null=True, blank=True)
+    # Também é atualizado pelos signals quando preços, features ou o imóvel mudam
+    updated_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
+
+    objects = RoomQuerySet.as_manager()
+
+    def to_search_dict(self) -> dict[str, Any]:
+        # Espera o queryset preparado por Room.objects.for_search()
+        addr = self.property.address
+        destination = self.property.destination
+
+        return {
+            "room_id": self.id,
+            "room_number": self.room_number,
+            "property_id": self.property_id,
+            "property": self.property.name,
+            "address": {
+                "street": addr.street if addr else None,
+                "number": addr.number if addr else None,
+                "neighborhood": addr.neighborhood if addr else None,
+                "city": addr.city if addr else None,
+                "state": addr.state if addr else None,
+            },
+            "destination": {
+                "id": destination.id,
+                "name": destination.name,
+                "lat": destination.latitude,
+                "lon": destination.longitude
+            },
+            "accept_men": self.accept_men,
+            "accept_women": self.accept_women,
+            "shared": self.shared,
+            "thumbnail": next((photo.thumbnail_dict() for photo in self.roomphoto_set.all()), None),
+            "features": [room_feature.feature.name for room_feature in self.roomfeature_set.all()],
+        }
 
     def __str__(self):
         return f"Room {self.room_number} - {self.property.name}"
@@ -76,7 +145,7 @@ class Room(models.Model):
 
 class RoomPrice(models.Model):
     room = models.ForeignKey(Room, on_delete=models.CASCADE)
-    period = models.CharField(max_length=10, choices=PeriodChoices.choices, default=PeriodChoices.SEMESTER)
+    period = models.CharField(max_length=10, choices=PeriodChoices.choices, default=PeriodChoices.SEMESTER, db_index=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
 
     def __str__(self):
@@ -105,12 +174,68 @@ class RoomFeature(models.Model):
 class RoomPhoto(models.Model):
     url = models.URLField()
     room = models.ForeignKey(Room, on_delete=models.CASCADE)
+    position = models.PositiveSmallIntegerField(default=0)
+    source_path = models.CharField(max_length=255, null=True, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    size_bytes = models.PositiveIntegerField(null=True, blank=True)
+    blurhash = models.CharField(max_length=64, null=True, blank=True)
+
+    def thumbnail_dict(self) -> dict[str, Any]:
+        # Espera variants pré-carregadas; sem a variante thumb usa a foto original
+        thumb = next((v for v in self.variants.all() if v.variant == PhotoVariantChoices.THUMB), None)
+        source = thumb or self
+
+        return {
+            "url": source.url,
+            "width": source.width,
+            "height": source.height,
+            "blurhash": self.blurhash,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "width": self.width,
+            "height": self.height,
+            "size_bytes": self.size_bytes,
+            "blurhash": self.blurhash,
+            "variants": {
+                variant.variant: {
+                    "url": variant.url,
+                    "width": variant.width,
+                    "height": variant.height,
+                    "size_bytes": variant.size_bytes,
+                }
+                for variant in self.variants.all()
+            },
+        }
 
     def __str__(self):
         return f"Photo of {self.room.property} {self.room.room_number}"
 
     class Meta:
         db_table = "room_photo"
+        ordering = ["position", "id"]
+
+class RoomPhotoVariant(models.Model):
+    photo = models.ForeignKey(RoomPhoto, on_delete=models.CASCADE, related_name="variants")
+    variant = models.CharField(max_length=10, choices=PhotoVariantChoices.choices)
+    url = models.URLField()
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size_bytes = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.photo} ({self.variant})"
+
+    class Meta:
+        db_table = "room_photo_variant"
+        ordering = ["width"]
+        constraints = [
+            models.UniqueConstraint(fields=["photo", "variant"], name="room_photo_variant_unique"),
+        ]
 
 class Proposal(models.Model):
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='proposals')
@@ -120,15 +245,41 @@ class Proposal(models.Model):
     move_in_date = models.DateField()
     move_out_date = models.DateField()
     message = models.TextField()
-    status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING)
-    created_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     reviewed_by = models.ForeignKey(Profile, on_delete=models.SET_NULL, null=True, blank=True, related_name='reviewed_proposals')
 
+    def to_dict(self) -> dict[str, Any]:
+        # Espera select_related('profile__user', 'room__property')
+        return {
+            "proposal_id": self.id,
+            "full_name": self.profile.name,
+            "email": self.profile.user.email,
+            "cpf": self.profile.cpf,
+            "birth_date": self.profile.birth_date,
+            "gender": self.profile.gender,
+            "room_id": self.room.id,
+            "room_number": self.room.room_number,
+            "property": self.room.property.name,
+            "proposed_price": float(self.proposed_price),
+            "period": self.period,
+            "move_in_date": self.move_in_date,
+            "move_out_date": self.move_out_date,
+            "message": self.message,
+            "status": self.status,
+            "created_at": self.created_at,
+        }
+
     def __str__(self):
         return f"Proposal by {self.profile.name} for {self.room.property}, room {self.room.room_number} "
 
     class Meta:
         db_table = "proposal"
+        # Listagens paginadas por (created_at, id) a partir do inquilino ou do quarto
+        indexes = [
+            models.Index(fields=["profile", "-created_at", "-id"], name="proposal_profile_created_idx"),
+            models.Index(fields=["room", "-created_at", "-id"], name="proposal_room_created_idx"),
+        ]
 
 class Rental(models.Model):
     proposal = models.OneToOneField(Proposal, on_delete=models.CASCADE)
@@ -139,10 +290,131 @@ class Rental(models.Model):
     period = models.CharField(max_length=10, choices=PeriodChoices.choices, default=PeriodChoices.SEMESTER)
     expected_start_date = models.DateField(null=True, blank=True)
     expected_end_date = models.DateField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"{self.profile.name} stays in {self.room.room_number}"
 
     class Meta:
         db_table = "rental"
+
+class RoomOccupancy(models.Model):
+    # Uma linha por quarto e dia com ao menos uma cama ocupada, de hoje em diante
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="occupancy")
+    day = models.DateField()
+    occupied_beds = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.room_id} {self.day}: {self.occupied_beds}"
+
+    class Meta:
+        db_table = "room_occupancy"
+        constraints = [
+            models.UniqueConstraint(fields=["room", "day"], name="room_occupancy_room_day_unique"),
+        ]
+        indexes = [
+            # full_days filtra por intervalo de dias e devolve room_id: a busca não passa pela chave (room, day)
+            models.Index(fields=["day", "room"], name="room_occupancy_day_room_idx"),
+        ]
+
+class ThrottleBucket(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()
+
+    def __str__(self):
+        return self.key
+
+    class Meta:
+        db_table = "throttle_bucket"
+
+
+class RoomSimilarity(models.Model):
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="similarities")
+    similar_room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField(db_index=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        # Espera select_related('similar_room__property__destination')
+        similar_room = self.similar_room
+        return {
+            "room_id": similar_room.id,
+            "room_number": similar_room.room_number,
+            "property": similar_room.property.name,
+            "destination": similar_room.property.destination.name,
+            "accept_men": similar_room.accept_men,
+            "accept_women": similar_room.accept_women,
+            "shared": similar_room.shared,
+            "score": round(self.score, 4),
+        }
+
+    def __str__(self):
+        return f"{self.room_id} ~ {self.similar_room_id} (#{self.rank})"
+
+    class Meta:
+        db_table = "room_similarity"
+        ordering = ["rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["room", "rank"], name="room_similarity_rank_unique"),
+        ]
+
+
+class SearchEvent(models.Model):
+    # Append-only: gravado em lote por pagoumorou.analytics, consolidado por rollup_search_events
+    created_at = models.DateTimeField(db_index=True)
+    destination_id = models.PositiveIntegerField()
+    gender = models.CharField(max_length=10, null=True, blank=True)
+    move_date = models.DateField(null=True, blank=True)
+    stay_duration = models.PositiveIntegerField()
+    has_query = models.BooleanField(default=False)
+    results = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} destination {self.destination_id}"
+
+    class Meta:
+        db_table = "search_event"
+
+
+class SearchStatsHourly(models.Model):
+    hour = models.DateTimeField()
+    destination_id = models.PositiveIntegerField()
+    stay_duration = models.PositiveIntegerField()
+    searches = models.PositiveIntegerField()
+    empty_searches = models.PositiveIntegerField()
+    with_move_date = models.PositiveIntegerField()
+    # Soma de (move_date - dia da busca), para a antecedência média
+    lead_days_total = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}h destination {self.destination_id} ({self.stay_duration}d): {self.searches}"
+
+    class Meta:
+        db_table = "search_stats_hourly"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hour", "destination_id", "stay_duration"], name="search_stats_hourly_unique",
+            ),
+        ]
+
+
+class DestinationPriceStats(models.Model):
+    # Mantido por pagoumorou.price_stats; base do selo de "bom negócio"
+    destination = models.ForeignKey(Destination, on_delete=models.CASCADE, related_name="price_stats")
+    period = models.CharField(max_length=10, choices=PeriodChoices.choices)
+    count = models.PositiveIntegerField()
+    min_price = models.DecimalField(max_digits=10, decimal_places=2)
+    median_price = models.DecimalField(max_digits=10, decimal_places=2)
+    p90_price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.destination_id} {self.period}: median {self.median_price}"
+
+    class Meta:
+        db_table = "destination_price_stats"
+        constraints = [
+            models.UniqueConstraint(fields=["destination", "period"], name="destination_price_stats_unique"),
+        ]
@@ -0,0 +1,57 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from pagoumorou.models import Rental, RoomOccupancy
+
+ONE_DAY = timedelta(days=1)
+
+
+def refresh_rooms(room_ids: Iterable[int]) -> None:
+    """
+    Recalcula, a partir dos aluguéis, as camas ocupadas por dia dos quartos informados.
+
+    Um aluguel ocupa uma cama de start_date até o dia anterior a end_date: no dia da
+    saída a cama já pode receber outro inquilino.
+    """
+    room_ids = set(room_ids)
+    if not room_ids:
+        return
+
+    today = timezone.localdate()
+    beds: dict[tuple[int, date], int] = defaultdict(int)
+    rentals = Rental.objects.filter(
+        room_id__in=room_ids,
+        start_date__isnull=False,
+        end_date__gt=today,
+    ).values_list('room_id', 'start_date', 'end_date')
+
+    for room_id, start_date, end_date in rentals:
+        day = max(start_date, today)
+        while day < end_date:
+            beds[room_id, day] += 1
+            day += ONE_DAY
+
+    with transaction.atomic():
+        RoomOccupancy.objects.filter(room_id__in=room_ids).delete()
+        RoomOccupancy.objects.bulk_create([
+            RoomOccupancy(room_id=room_id, day=day, occupied_beds=count)
+            for (room_id, day), count in beds.items()
+        ], batch_size=5_000)
+
+
+def full_days(start: date, end: date | None = None) -> QuerySet:
+    """Dias em [start, end) em que o quarto está com todas as camas ocupadas."""
+    days = RoomOccupancy.objects.filter(day__gte=start, occupied_beds__gte=F('room__capacity'))
+    if end is not None:
+        days = days.filter(day__lt=end)
+    return days
+
+
+def prune(before: date) -> int:
+    deleted, _ = RoomOccupancy.objects.filter(day__lt=before).delete()
+    return deleted
@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    raw = json.dumps([created_at.isoformat(), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def keyset_page(queryset: QuerySet, cursor: str | None, limit: int) -> tuple[list, str | None]:
+    """
+    Página de `queryset` do mais novo para o mais antigo por (created_at, id),
+    continuando depois de `cursor`. Devolve os itens e o cursor da próxima página.
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    # Um item a mais indica se existe próxima página sem precisar de COUNT
+    items = list(queryset[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    return items, encode_cursor(items[-1].created_at, items[-1].id)
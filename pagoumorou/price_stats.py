@@ -0,0 +1,169 @@
+import threading
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Iterable
+
+import numpy as np
+from django.db import transaction
+
+from pagoumorou.constants import DEAL_MIN_SAMPLES
+from pagoumorou.models import DestinationPriceStats, Room, RoomPrice
+from pagoumorou.response_cache import invalidate_rooms, invalidate_searches
+
+CENTS = Decimal("0.01")
+
+# Destinos com preços alterados na transação em curso (ver refresh_on_commit)
+_pending = threading.local()
+
+
+def refresh(destination_ids: Iterable[int] | None = None) -> int:
+    """
+    Recalcula count/min/mediana/p90 dos preços por destino e período.
+
+    Só os destinos informados são lidos (todos quando None); pares que ficaram
+    sem preço são removidos. Devolve quantos pares foram gravados.
+    """
+    rows = RoomPrice.objects.values_list('room__property__destination_id', 'period', 'price')
+    stats = DestinationPriceStats.objects.all()
+    if destination_ids is not None:
+        destination_ids = set(destination_ids)
+        if not destination_ids:
+            return 0
+        rows = rows.filter(room__property__destination_id__in=destination_ids)
+        stats = stats.filter(destination_id__in=destination_ids)
+
+    prices: dict[tuple[int, str], list[float]] = defaultdict(list)
+    for destination_id, period, price in rows.order_by().iterator(chunk_size=5_000):
+        prices[destination_id, period].append(float(price))
+
+    computed = []
+    for (destination_id, period), values in prices.items():
+        values = np.array(values)
+        median, p90 = np.percentile(values, [50, 90])
+        computed.append(DestinationPriceStats(
+            destination_id=destination_id,
+            period=period,
+            count=len(values),
+            min_price=_money(values.min()),
+            median_price=_money(median),
+            p90_price=_money(p90),
+        ))
+
+    with transaction.atomic():
+        previous = {
+            (destination_id, period): (stats_id, _deal_median(count, median))
+            for stats_id, destination_id, period, count, median in stats.values_list(
+                'id', 'destination_id', 'period', 'count', 'median_price',
+            )
+        }
+        stale = {stats_id: pair[0] for pair, (stats_id, _) in previous.items() if pair not in prices}
+        if stale:
+            DestinationPriceStats.objects.filter(id__in=stale).delete()
+        DestinationPriceStats.objects.bulk_create(
+            computed,
+            batch_size=1_000,
+            update_conflicts=True,
+            unique_fields=['destination', 'period'],
+            update_fields=['count', 'min_price', 'median_price', 'p90_price', 'updated_at'],
+        )
+
+        # Busca e página do quarto em cache trazem o selo "deal": só os destinos cuja mediana mudou
+        changed = set(stale.values()) | {
+            row.destination_id
+            for row in computed
+            if previous.get((row.destination_id, row.period), (None, None))[1]
+            != _deal_median(row.count, row.median_price)
+        }
+        transaction.on_commit(lambda: invalidate_deals(changed))
+
+    return len(computed)
+
+
+def refresh_on_commit(room_id: int) -> None:
+    """
+    Marca o destino do quarto para um único refresh no commit da transação.
+
+    Importações e edições em lote disparam um signal por preço; os destinos se
+    acumulam e um único callback de on_commit recalcula todos de uma vez. O
+    estado vale enquanto esse callback estiver na fila da conexão: um rollback
+    o descarta, e a próxima chamada recomeça do zero em vez de herdar destinos
+    e quartos da transação desfeita.
+    """
+    queued = _refresh_queued()
+    if not queued:
+        _pending.__dict__.clear()
+
+    state = _pending.__dict__
+    destinations = state.setdefault("destinations", set())
+    rooms = state.setdefault("rooms", {})
+    # O destino é lido agora: no post_delete em cascata o quarto ainda existe
+    if room_id not in rooms:
+        rooms[room_id] = Room.objects.filter(id=room_id).values_list('property__destination_id', flat=True).first()
+    if rooms[room_id] is not None:
+        destinations.add(rooms[room_id])
+
+    if not queued:
+        transaction.on_commit(_refresh_pending)
+
+
+def _refresh_queued() -> bool:
+    connection = transaction.get_connection()
+    return connection.in_atomic_block and any(
+        func is _refresh_pending for _, func, _ in connection.run_on_commit
+    )
+
+
+def _refresh_pending() -> None:
+    destinations = _pending.__dict__.pop("destinations", set())
+    _pending.__dict__.pop("rooms", None)
+    if destinations:
+        refresh(destinations)
+
+
+def invalidate_deals(destination_ids: set[int]) -> None:
+    if not destination_ids:
+        return
+    invalidate_searches(destination_ids)
+    invalidate_rooms(Room.objects.filter(property__destination_id__in=destination_ids).values_list('id', flat=True))
+
+
+def medians(destination_id: int) -> dict[str, float]:
+    # Períodos com poucos preços no destino não ganham selo
+    return {
+        period: float(median)
+        for period, median in DestinationPriceStats.objects.filter(
+            destination_id=destination_id, count__gte=DEAL_MIN_SAMPLES,
+        ).values_list('period', 'median_price')
+    }
+
+
+def deal(price: float, median: float | None) -> dict[str, Any] | None:
+    """Quanto `price` fica abaixo (score > 0) ou acima (score < 0) da mediana do destino."""
+    if not median:
+        return None
+    return {
+        "score": round(1 - price / median, 4),
+        "below_median": price < median,
+        "median": round(median, 2),
+    }
+
+
+def attach_deals(results: list[dict[str, Any]], destination_id: int) -> list[dict[str, Any]]:
+    # A mediana de referência segue a mesma combinação de períodos da cotação do quarto
+    period_medians = medians(destination_id)
+    for result in results:
+        try:
+            median = sum(item["quantity"] * period_medians[item["raw_period"]] for item in result["quote"])
+        except KeyError:
+            median = None
+        result["deal"] = deal(result["price"], median)
+    return results
+
+
+def _deal_median(count: int, median: Decimal) -> Decimal | None:
+    # A mediana só vale para o selo com amostras suficientes (ver medians)
+    return median if count >= DEAL_MIN_SAMPLES else None
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(CENTS)
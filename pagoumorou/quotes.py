@@ -0,0 +1,100 @@
+from decimal import Decimal
+from typing import Any, Iterable, NamedTuple
+
+import numpy as np
+
+from pagoumorou.constants import PERIOD_DAYS, PERIOD_VERBOSE, PeriodChoices
+
+# Ordem das colunas da matriz de preços (quartos x períodos)
+PERIODS = tuple(PeriodChoices)
+PERIOD_INDEX = {period: index for index, period in enumerate(PERIODS)}
+PERIOD_LENGTHS = np.array([PERIOD_DAYS[period] for period in PERIODS])
+
+
+class Quotes(NamedTuple):
+    totals: np.ndarray  # custo total por quarto; inf quando não há combinação possível
+    plans: np.ndarray   # quantidade de cada período por quarto, mesma ordem de PERIODS
+
+
+def price_matrix(rows: Iterable[tuple[int, str, Decimal]], room_ids: list[int]) -> np.ndarray:
+    index = {room_id: position for position, room_id in enumerate(room_ids)}
+    prices = np.full((len(room_ids), len(PERIODS)), np.inf)
+
+    for room_id, period, price in rows:
+        position = index.get(room_id)
+        if position is not None:
+            prices[position, PERIOD_INDEX[period]] = float(price)
+
+    return prices
+
+
+def quote(prices: np.ndarray, days: int) -> Quotes:
+    """Combinação mais barata de períodos que cobre ao menos `days` dias, para todos os quartos de uma vez."""
+    rooms = prices.shape[0]
+
+    # cost[d] = menor custo para cobrir d dias; choice[d] = último período usado
+    cost = np.zeros((days + 1, rooms))
+    choice = np.zeros((days + 1, rooms), dtype=np.int8)
+
+    transposed = np.ascontiguousarray(prices.T)
+    for day in range(1, days + 1):
+        candidates = cost[np.maximum(0, day - PERIOD_LENGTHS)] + transposed
+        choice[day] = candidates.argmin(axis=0)
+        cost[day] = candidates.min(axis=0)
+
+    totals = cost[days]
+    plans = np.zeros((rooms, len(PERIODS)), dtype=np.int32)
+    remaining = np.full(rooms, days)
+    active = np.isfinite(totals)
+
+    while active.any():
+        positions = np.flatnonzero(active)
+        picks = choice[remaining[positions], positions]
+        plans[positions, picks] += 1
+        remaining[positions] = np.maximum(0, remaining[positions] - PERIOD_LENGTHS[picks])
+        active[positions] = remaining[positions] > 0
+
+    return Quotes(totals, plans)
+
+
+def describe_plan(plan: np.ndarray, prices: np.ndarray) -> tuple[str, list[dict[str, Any]]]:
+    items = []
+    for column in reversed(range(len(PERIODS))):
+        quantity = int(plan[column])
+        if not quantity:
+            continue
+
+        period = PERIODS[column]
+        items.append({
+            "period": PERIOD_VERBOSE[period],
+            "raw_period": period,
+            "quantity": quantity,
+            "price": float(prices[column]),
+        })
+
+    label = " + ".join(
+        item["period"] if item["quantity"] == 1 else f"{item['quantity']}x {item['period']}"
+        for item in items
+    )
+    return label, items
+
+
+def ranked_results(summaries: list[dict[str, Any]], prices: np.ndarray, days: int) -> list[dict[str, Any]]:
+    """Cota todos os quartos de uma vez e devolve os cotáveis ordenados pelo custo total."""
+    quotes = quote(prices, days)
+
+    results = []
+    for position in np.argsort(quotes.totals, kind='stable'):
+        total = quotes.totals[position]
+        if not np.isfinite(total):
+            break
+
+        label, breakdown = describe_plan(quotes.plans[position], prices[position])
+        results.append({
+            **summaries[position],
+            "price": round(float(total), 2),
+            "period": label,
+            "quote": breakdown,
+        })
+
+    return results
@@ -0,0 +1,82 @@
+import time
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import primary_reads
+from pagoumorou.metrics import counters
+
+
+def search_key(destination_id: int, gender: str | None, stay_duration: int) -> str:
+    # A versão do destino entra na chave: trocá-la invalida todas as combinações de uma vez
+    return f"search:{destination_id}:{search_version(destination_id)}:{gender or 'any'}:{stay_duration}"
+
+
+def search_version_key(destination_id: int) -> str:
+    return f"search_version:{destination_id}"
+
+
+def search_version(destination_id: int) -> int:
+    key = search_version_key(destination_id)
+    version = cache.get(key)
+    if version is None:
+        # Versão perdida (despejo ou cache novo) vira uma versão nova, nunca a de entradas antigas
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def room_key(room_id: int) -> str:
+    return f"room:{room_id}"
+
+
+def cached_search(
+    destination_id: int,
+    gender: str | None,
+    stay_duration: int,
+    compute: Callable[[], list[dict[str, Any]]],
+    refresh: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Resultados da busca sem data e sem texto: a base das buscas do destino.
+
+    A data de entrada é aplicada depois, sobre a lista em cache (ver exclude_full_rooms),
+    então uma única entrada atende todas as datas da mesma combinação.
+    """
+    return _cached(search_key(destination_id, gender, stay_duration), "search", compute,
+                   settings.SEARCH_CACHE_SECONDS, refresh)
+
+
+def cached_room(
+    room_id: int,
+    compute: Callable[[], dict[str, Any] | None],
+    refresh: bool = False,
+) -> dict[str, Any] | None:
+    return _cached(room_key(room_id), "room", compute, settings.ROOM_CACHE_SECONDS, refresh)
+
+
+def invalidate_rooms(room_ids: Iterable[int]) -> None:
+    cache.delete_many([room_key(room_id) for room_id in room_ids])
+
+
+def invalidate_searches(destination_ids: Iterable[int]) -> None:
+    version = time.time_ns()
+    cache.set_many({search_version_key(destination_id): version for destination_id in set(destination_ids)}, None)
+
+
+def _cached(key: str, name: str, compute: Callable, timeout: int, refresh: bool):
+    if not refresh:
+        value = cache.get(key)
+        if value is not None:
+            counters.incr(f"cache_hit.{name}")
+            return value
+
+    counters.incr(f"cache_miss.{name}")
+    # Do primário: a entrada vale para todos os workers até a próxima invalidação
+    with primary_reads():
+        value = compute()
+    # None (ex.: quarto inexistente) não é guardado: seria indistinguível de uma falta no cache
+    if value is not None:
+        cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,28 @@
+from decimal import Decimal
+
+from core.schema import Choice, Date, Email, Integer, Number, Schema, String
+from pagoumorou.constants import DAYS_TO_PERIOD, MAX_STAY_DAYS
+from user.models import Profile
+
+SEARCH = Schema({
+    "destinationId": Integer(min_value=1),
+    "gender": Choice(("male", "female"), required=False, nullable=True),
+    "moveDate": Date(required=False, nullable=True),
+    # Qualquer duração é aceita; o preço é cotado pela combinação de períodos
+    "stayDuration": Integer(min_value=1, max_value=MAX_STAY_DAYS),
+    "q": String(max_length=200, allow_blank=True, required=False, default=""),
+    "shape": Choice(("nested", "normalized"), required=False, default="nested"),
+})
+
+PROPOSAL = Schema({
+    "roomId": Integer(min_value=1),
+    "stayInPeriod": Integer(choices=DAYS_TO_PERIOD),
+    "email": Email(),
+    "fullName": String(max_length=255),
+    "cpf": String(max_length=11, required=False, nullable=True),
+    "birthDate": Date(),
+    "gender": Choice(Profile.Gender.values, required=False, nullable=True),
+    "moveDate": Date(),
+    "suggestedPrice": Number(max_digits=10, decimal_places=2, min_value=Decimal("0")),
+    "message": String(allow_blank=True, required=False, default=""),
+})
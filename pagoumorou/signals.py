@@ -0,0 +1,207 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from pagoumorou import geo
+from pagoumorou.catalog import mark_all_stale, mark_room_dirty
+from pagoumorou.clusters import invalidate_tiles
+from pagoumorou.events import publish_status_change
+from pagoumorou import fulltext, occupancy, price_stats
+from user.signals import addresses_geocoded
+from pagoumorou.response_cache import invalidate_rooms, invalidate_searches
+from pagoumorou.models import (
+    Address,
+    Destination,
+    Feature,
+    Property,
+    Proposal,
+    Rental,
+    Room,
+    RoomFeature,
+    RoomPhoto,
+    RoomPhotoVariant,
+    RoomPrice,
+)
+
+
+def room_content_changed(room_id: int, destination_id: int | None) -> None:
+    rooms_content_changed({room_id: destination_id})
+
+
+def rooms_content_changed(destinations: dict[int, int | None]) -> None:
+    """Quarto -> destino: marca os snapshots e invalida as páginas dos quartos e as buscas dos destinos."""
+    for room_id in destinations:
+        mark_room_dirty(room_id)
+    invalidate_rooms(destinations)
+    invalidate_searches({destination_id for destination_id in destinations.values() if destination_id is not None})
+
+
+def rooms_changed_on_commit(room_ids) -> None:
+    # Para escritas em lote (bulk_*, SQL) que não disparam os signals por linha
+    destinations = dict(
+        Room.objects.filter(id__in=set(room_ids)).values_list('id', 'property__destination_id')
+    )
+    if destinations:
+        transaction.on_commit(lambda: rooms_content_changed(destinations))
+
+
+def room_destination(room_id: int) -> int | None:
+    # Lido no signal: depois do commit um quarto apagado não leva mais ao destino
+    return Room.objects.filter(id=room_id).values_list('property__destination_id', flat=True).first()
+
+
+@receiver(post_save, sender=Proposal)
+def proposal_saved(sender, instance: Proposal, update_fields=None, **kwargs) -> None:
+    if update_fields is not None and "status" not in update_fields:
+        return
+
+    publish_status_change(instance.id, instance.status)
+
+
+@receiver([post_save, post_delete], sender=Room)
+def room_changed(sender, instance: Room, **kwargs) -> None:
+    room_id = instance.id
+    destination_id = Property.objects.filter(id=instance.property_id).values_list('destination_id', flat=True).first()
+    transaction.on_commit(lambda: room_content_changed(room_id, destination_id))
+
+
+@receiver([post_save, post_delete], sender=RoomPrice)
+@receiver([post_save, post_delete], sender=RoomFeature)
+@receiver([post_save, post_delete], sender=RoomPhoto)
+@receiver([post_save, post_delete], sender=Rental)
+def room_child_changed(sender, instance, **kwargs) -> None:
+    room_id = instance.room_id
+    destination_id = room_destination(room_id)
+    transaction.on_commit(lambda: room_content_changed(room_id, destination_id))
+
+
+@receiver([post_save, post_delete], sender=RoomPhotoVariant)
+def photo_variant_changed(sender, instance: RoomPhotoVariant, **kwargs) -> None:
+    room_id = instance.photo.room_id
+    destination_id = room_destination(room_id)
+    transaction.on_commit(lambda: room_content_changed(room_id, destination_id))
+
+
+@receiver(pre_save, sender=Rental)
+def rental_previous_room(sender, instance: Rental, **kwargs) -> None:
+    # Aluguel que troca de quarto libera as camas do quarto anterior
+    instance._previous_room_id = (
+        Rental.objects.filter(id=instance.id).values_list('room_id', flat=True).first() if instance.id else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Rental)
+def rental_changed(sender, instance: Rental, **kwargs) -> None:
+    # Na mesma transação do aluguel: a busca nunca vê o aluguel sem a ocupação correspondente
+    previous_room_id = getattr(instance, "_previous_room_id", None)
+    occupancy.refresh_rooms({instance.room_id, previous_room_id} - {None})
+
+    # O quarto novo é invalidado por room_child_changed; o anterior também mudou de disponibilidade
+    if previous_room_id not in (None, instance.room_id):
+        destination_id = room_destination(previous_room_id)
+        transaction.on_commit(lambda: room_content_changed(previous_room_id, destination_id))
+
+
+@receiver([post_save, post_delete], sender=RoomPrice)
+@receiver([post_save, post_delete], sender=RoomFeature)
+def room_attributes_changed(sender, instance, **kwargs) -> None:
+    # update() não dispara signals nem o auto_now; marca o quarto para o compute_similar_rooms --changed
+    Room.objects.filter(id=instance.room_id).update(updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Property)
+def property_previous_destination(sender, instance: Property, **kwargs) -> None:
+    # Imóvel que troca de destino também sai das buscas do destino anterior
+    instance._previous_destination_id = (
+        Property.objects.filter(id=instance.id).values_list('destination_id', flat=True).first()
+        if instance.id else None
+    )
+
+
+@receiver(post_save, sender=Property)
+def property_rooms_changed(sender, instance: Property, **kwargs) -> None:
+    Room.objects.filter(property_id=instance.id).update(updated_at=timezone.now())
+    room_ids = list(Room.objects.filter(property_id=instance.id).values_list('id', flat=True))
+    destination_ids = {instance.destination_id, getattr(instance, "_previous_destination_id", None)} - {None}
+
+    def invalidate():
+        invalidate_rooms(room_ids)
+        invalidate_searches(destination_ids)
+
+    transaction.on_commit(invalidate)
+
+
+def sync_property_coordinates(address_ids) -> int:
+    """Copia as coordenadas dos endereços geocodificados para os imóveis e recalcula o geohash."""
+    properties = list(
+        Property.objects
+        .filter(address_id__in=address_ids, address__latitude__isnull=False, address__longitude__isnull=False)
+        .select_related('address')
+        .only('id', 'latitude', 'longitude', 'geohash', 'address__latitude', 'address__longitude')
+    )
+    changed, geohashes = [], set()
+    for prop in properties:
+        location = (prop.address.latitude, prop.address.longitude)
+        if (prop.latitude, prop.longitude) != location or not prop.geohash:
+            geohashes.add(prop.geohash)
+            prop.latitude, prop.longitude = location
+            prop.geohash = geo.encode(*location)
+            geohashes.add(prop.geohash)
+            changed.append(prop)
+    if not changed:
+        return 0
+    Property.objects.bulk_update(changed, ['latitude', 'longitude', 'geohash'], batch_size=1_000)
+
+    # bulk_update não dispara os signals de Property: mesmas invalidações do post_save, e o
+    # updated_at dos quartos para o compute_similar_rooms --changed
+    rooms = Room.objects.filter(property__in=changed)
+    rooms.update(updated_at=timezone.now())
+    destinations = dict(rooms.values_list('id', 'property__destination_id'))
+
+    def invalidate():
+        mark_all_stale()
+        invalidate_rooms(destinations)
+        invalidate_searches(set(destinations.values()))
+        invalidate_tiles(geohashes)
+
+    transaction.on_commit(invalidate)
+    return len(changed)
+
+
+@receiver(post_save, sender=Address)
+def address_coordinates_changed(sender, instance: Address, **kwargs) -> None:
+    sync_property_coordinates([instance.id])
+
+
+@receiver(addresses_geocoded)
+def addresses_geocoded_in_bulk(sender, address_ids, **kwargs) -> None:
+    sync_property_coordinates(address_ids)
+
+
+@receiver([post_save, post_delete], sender=Property)
+@receiver([post_save, post_delete], sender=Address)
+@receiver([post_save, post_delete], sender=Destination)
+@receiver([post_save, post_delete], sender=Feature)
+def catalog_source_changed(sender, **kwargs) -> None:
+    transaction.on_commit(mark_all_stale)
+
+
+@receiver(post_save, sender=Room)
+def room_search_document(sender, instance: Room, **kwargs) -> None:
+    fulltext.refresh_rooms("r.id = %s", [instance.id])
+
+
+@receiver(post_delete, sender=Room)
+def room_search_document_deleted(sender, instance: Room, **kwargs) -> None:
+    fulltext.delete_room(instance.id)
+
+
+@receiver(post_save, sender=Property)
+def property_search_document(sender, instance: Property, **kwargs) -> None:
+    fulltext.refresh_rooms("r.property_id = %s", [instance.id])
+
+
+@receiver([post_save, post_delete], sender=RoomPrice)
+def room_price_stats_changed(sender, instance: RoomPrice, **kwargs) -> None:
+    price_stats.refresh_on_commit(instance.room_id)
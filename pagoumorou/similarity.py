@@ -0,0 +1,118 @@
+from typing import NamedTuple
+
+import numpy as np
+from django.db.models import Case, F, Q, When
+
+from pagoumorou.models import Feature, Room, RoomFeature, RoomPrice
+from pagoumorou.quotes import PERIOD_LENGTHS, price_matrix
+
+# Peso de cada bloco do vetor de um quarto. Cada bloco usa uma escala fixa (e não
+# a média/desvio da base) para que o vetor de um quarto só mude quando ele muda:
+# é o que permite o recálculo incremental do compute_similar_rooms.
+WEIGHTS = {
+    "features": 1.0,
+    "price": 2.0,
+    "location": 3.0,
+    "gender": 2.0,
+    "layout": 1.0,
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distância que vale 1 no bloco de localização
+LOCATION_SCALE_KM = 25.0
+
+
+class RoomVectors(NamedTuple):
+    room_ids: np.ndarray  # id do quarto de cada linha
+    matrix: np.ndarray    # quartos x dimensões, já com os pesos aplicados
+
+
+def property_coordinate(field: str) -> Case:
+    # Mesma regra de Property.coordinates(): o par do imóvel, ou o do destino quando falta
+    located = Q(property__latitude__isnull=False, property__longitude__isnull=False)
+    return Case(When(located, then=F(f"property__{field}")), default=F(f"property__destination__{field}"))
+
+
+def build_vectors() -> RoomVectors:
+    rows = list(Room.objects.order_by("id").values_list(
+        "id", "capacity", "shared", "accept_men", "accept_women",
+        property_coordinate("latitude"), property_coordinate("longitude"),
+    ))
+    room_ids = [row[0] for row in rows]
+    index = {room_id: position for position, room_id in enumerate(room_ids)}
+
+    # Features: uma coluna 0/1 por feature (distância de Hamming entre os quartos)
+    feature_columns = {
+        feature_id: column
+        for column, feature_id in enumerate(Feature.objects.order_by("id").values_list("id", flat=True))
+    }
+    features = np.zeros((len(room_ids), len(feature_columns)))
+    for room_id, feature_id in RoomFeature.objects.values_list("room_id", "feature_id"):
+        features[index[room_id], feature_columns[feature_id]] = 1.0
+
+    # Preço: log2 do preço de cada período (o dobro do preço = 1); períodos não oferecidos são estimados pela menor diária
+    prices = price_matrix(RoomPrice.objects.values_list("room_id", "period", "price"), room_ids)
+    cheapest_daily = (prices / PERIOD_LENGTHS).min(axis=1, initial=np.inf)
+    log_prices = np.log2(1 + np.where(np.isfinite(prices), prices, cheapest_daily[:, None] * PERIOD_LENGTHS))
+    unpriced = ~np.isfinite(log_prices)
+    if unpriced.any():
+        # Sem preço nenhum: fica na mediana, sem aproximar nem afastar de ninguém
+        medians = np.nanmedian(np.where(unpriced, np.nan, log_prices), axis=0)
+        log_prices = np.where(unpriced, np.nan_to_num(medians), log_prices)
+
+    # Localização: ponto na esfera em unidades de LOCATION_SCALE_KM (a corda aproxima a distância real)
+    coordinates = np.array([(row[5], row[6]) for row in rows], dtype=float).reshape(-1, 2)
+    located = ~np.isnan(coordinates).any(axis=1)
+    lat, lon = np.radians(np.nan_to_num(coordinates)).T
+    location = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1)
+    location *= (EARTH_RADIUS_KM / LOCATION_SCALE_KM) * located[:, None]
+
+    gender = np.array([(row[3], row[4]) for row in rows], dtype=float).reshape(-1, 2)
+    layout = np.array([(row[2], np.log2(1 + max(row[1], 0))) for row in rows], dtype=float).reshape(-1, 2)
+
+    blocks = {
+        "features": features / np.sqrt(max(features.shape[1], 1)),
+        "price": log_prices / np.sqrt(log_prices.shape[1]),
+        "location": location,
+        "gender": gender / np.sqrt(2),
+        "layout": layout / np.sqrt(2),
+    }
+    # float64: o bloco de localização tem norma na casa das centenas e float32 perderia as distâncias curtas
+    matrix = np.hstack([blocks[name] * weight for name, weight in WEIGHTS.items()])
+    return RoomVectors(np.array(room_ids, dtype=np.int64), matrix)
+
+
+def nearest(vectors: RoomVectors, positions: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Os `k` quartos mais próximos de cada linha em `positions`, por distância euclidiana.
+
+    Devolve (vizinhos, distâncias) com shape len(positions) x k, ordenados do mais
+    próximo, e a matriz completa de distâncias dessas linhas para todos os quartos.
+    """
+    matrix = vectors.matrix
+    squared_norms = (matrix ** 2).sum(axis=1)
+
+    queries = matrix[positions]
+    squared = squared_norms[positions, None] + squared_norms[None, :] - 2.0 * queries @ matrix.T
+    distances = np.sqrt(np.maximum(squared, 0.0))
+    distances[np.arange(len(positions)), positions] = np.inf  # o próprio quarto
+
+    k = min(k, matrix.shape[0] - 1)
+    if k <= 0:
+        empty = np.empty((len(positions), 0))
+        return empty.astype(np.int64), empty, distances
+
+    candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+    order = np.argsort(candidate_distances, axis=1, kind="stable")
+    return (
+        np.take_along_axis(candidates, order, axis=1),
+        np.take_along_axis(candidate_distances, order, axis=1),
+        distances,
+    )
+
+
+def score(distance: np.ndarray | float) -> np.ndarray | float:
+    # Maior = mais parecido, em (0, 1]
+    return 1.0 / (1.0 + distance)
@@ -0,0 +1,20 @@
+from django.contrib.auth.models import User
+
+from pagoumorou.models import Destination, Property, Room
+from user.views import ProfileTokenObtainPairSerializer
+
+
+def create_room(room_number: str = "101", capacity: int = 1, prop: Property | None = None) -> Room:
+    if prop is None:
+        destination = Destination.objects.create(name="Teste", country_id="BR", destination_type="CI")
+        prop = Property.objects.create(name="Imóvel", type="Republic", rules="", destination=destination)
+    return Room.objects.create(room_number=room_number, capacity=capacity, property=prop)
+
+
+def access_token(user: User) -> str:
+    """Access token do usuário, com as mesmas claims do login."""
+    return str(ProfileTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def bearer(user: User) -> dict[str, str]:
+    return {"HTTP_AUTHORIZATION": f"Bearer {access_token(user)}"}
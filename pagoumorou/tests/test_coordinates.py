@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from pagoumorou import geo
+from pagoumorou.clusters import tile_key
+from pagoumorou.models import Property, Room
+from pagoumorou.response_cache import room_key, search_version
+from pagoumorou.tests.factories import create_room
+from user.models import Address
+from user.signals import addresses_geocoded
+
+
+class PropertyCoordinatesSyncTests(TestCase):
+    def test_bulk_geocoding_updates_properties_and_invalidates_caches(self):
+        room = create_room()
+        address = Address.objects.create(
+            street="Rua A", number="1", neighborhood="Centro", city="Florianópolis", state="SC", zip_code="88000000",
+        )
+        Property.objects.filter(id=room.property_id).update(address=address)
+        destination_id = room.property.destination_id
+        updated_at = room.updated_at
+
+        tile = tile_key("Month", geo.encode(-27.5954, -48.548)[:4])
+        cache.set_many({room_key(room.id): {"room_id": room.id}, tile: []})
+        version = search_version(destination_id)
+
+        # Como o geocode_addresses: coordenadas gravadas em lote, depois o signal
+        Address.objects.filter(id=address.id).update(latitude=-27.5954, longitude=-48.548)
+        with self.captureOnCommitCallbacks(execute=True):
+            addresses_geocoded.send(sender=Address, address_ids=[address.id])
+
+        prop = Property.objects.get(id=room.property_id)
+        self.assertEqual((prop.latitude, prop.longitude), (-27.5954, -48.548))
+        self.assertEqual(prop.geohash, geo.encode(-27.5954, -48.548))
+        self.assertGreater(Room.objects.get(id=room.id).updated_at, updated_at)
+        self.assertIsNone(cache.get(room_key(room.id)))
+        self.assertIsNone(cache.get(tile))
+        self.assertNotEqual(search_version(destination_id), version)
@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from pagoumorou.tests.factories import bearer
+
+
+class MetricsAPITests(TestCase):
+    def test_requires_staff(self):
+        tenant = User.objects.create(username="inquilino", email="inquilino@example.com")
+        staff = User.objects.create(username="equipe", email="equipe@example.com", is_staff=True)
+
+        self.assertEqual(self.client.get("/api/pagoumorou/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/api/pagoumorou/metrics", **bearer(tenant)).status_code, 403)
+        response = self.client.get("/api/pagoumorou/metrics", **bearer(staff))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("counters", response.json())
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from pagoumorou.models import Proposal, Rental, RoomOccupancy
+from pagoumorou.tests.factories import create_room
+from user.models import Profile
+
+
+class OccupancyTests(TestCase):
+    def test_rental_moved_to_another_room_frees_the_old_one(self):
+        old_room = create_room("101")
+        new_room = create_room("102", prop=old_room.property)
+        profile = Profile.objects.create(name="Inquilino", birth_date="2000-01-01", role="CLIENT")
+        today = timezone.localdate()
+        proposal = Proposal.objects.create(
+            profile=profile, room=old_room, proposed_price=500, move_in_date=today,
+            move_out_date=today + timedelta(days=10), message="",
+        )
+        rental = Rental.objects.create(
+            proposal=proposal, profile=profile, room=old_room, start_date=today, end_date=today + timedelta(days=10),
+        )
+        self.assertTrue(RoomOccupancy.objects.filter(room=old_room, day=today).exists())
+
+        rental.room = new_room
+        rental.save()
+
+        self.assertFalse(RoomOccupancy.objects.filter(room=old_room).exists())
+        self.assertEqual(RoomOccupancy.objects.filter(room=new_room).count(), 10)
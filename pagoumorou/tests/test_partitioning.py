@@ -0,0 +1,96 @@
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from pagoumorou.archive import read_archive
+from pagoumorou.constants import StatusChoices
+from pagoumorou.models import Proposal, Rental
+from pagoumorou.tests.factories import create_room
+from user.models import Profile
+
+
+@skipUnless(connection.vendor == "postgresql", "particionamento só existe no PostgreSQL")
+class PartitionTablesTests(TestCase):
+    def setUp(self):
+        self.room = create_room()
+        self.profile = Profile.objects.create(name="Inquilino", birth_date="2000-01-01", role="CLIENT")
+        # Ano fechado: anterior ao corte padrão do archive_closed_years
+        self.year = timezone.localdate().year - 5
+        self.proposal = self.create_proposal(date(self.year, 3, 1))
+        self.rental = Rental.objects.create(
+            proposal=self.proposal, profile=self.profile, room=self.room,
+            start_date=date(self.year, 3, 1), end_date=date(self.year, 9, 1),
+        )
+        call_command("partition_tables", stdout=StringIO())
+
+    def create_proposal(self, move_in: date) -> Proposal:
+        return Proposal.objects.create(
+            profile=self.profile, room=self.room, proposed_price=500, status=StatusChoices.ACCEPTED,
+            move_in_date=move_in, move_out_date=move_in.replace(month=9), message="",
+        )
+
+    def check_deferred_constraints(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    def partition_of(self, table: str, row_id: int) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT tableoid::regclass::text FROM "{table}" WHERE id = %s', [row_id])
+            return cursor.fetchone()[0]
+
+    def test_partitioned_by_the_archive_keys(self):
+        self.assertEqual(self.partition_of("rental", self.rental.id), f"rental_{self.year}")
+        self.assertEqual(self.partition_of("proposal", self.proposal.id), f"proposal_{self.year}")
+
+    def test_rental_without_start_date_goes_to_the_default_partition(self):
+        rental = Rental.objects.create(
+            proposal=self.create_proposal(date(self.year, 4, 1)), profile=self.profile, room=self.room,
+        )
+
+        self.assertEqual(self.partition_of("rental", rental.id), "rental_default")
+
+    def test_unique_trigger_rejects_a_second_rental_for_the_proposal(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Rental.objects.create(
+                proposal=self.proposal, profile=self.profile, room=self.room, start_date=date(self.year + 1, 1, 1),
+            )
+
+    def test_unique_trigger_rejects_a_duplicate_id(self):
+        with self.assertRaises(IntegrityError), transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO proposal (id, profile_id, room_id, proposed_price, period, move_in_date, move_out_date, "
+                "message, status, created_at) SELECT id, profile_id, room_id, proposed_price, period, "
+                "move_in_date + 400, move_out_date + 400, message, status, created_at FROM proposal WHERE id = %s",
+                [self.proposal.id],
+            )
+
+    def test_fk_trigger_rejects_a_missing_proposal(self):
+        missing = Proposal.objects.order_by("-id").values_list("id", flat=True).first() + 1000
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Rental.objects.create(proposal_id=missing, profile=self.profile, room=self.room)
+            self.check_deferred_constraints()
+
+    def test_fk_trigger_blocks_deleting_a_referenced_proposal(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM proposal WHERE id = %s", [self.proposal.id])
+            self.check_deferred_constraints()
+
+    def test_archive_detaches_the_closed_year_partitions(self):
+        with tempfile.TemporaryDirectory() as archive_root, override_settings(ARCHIVE_ROOT=archive_root):
+            call_command("archive_closed_years", stdout=StringIO())
+
+            self.assertEqual([row["id"] for row in read_archive("rental", [self.year])], [self.rental.id])
+            self.assertEqual([row["id"] for row in read_archive("proposal", [self.year])], [self.proposal.id])
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s), to_regclass(%s)", [f"rental_{self.year}", f"proposal_{self.year}"])
+            self.assertEqual(cursor.fetchone(), (None, None))
+        self.assertFalse(Rental.objects.filter(id=self.rental.id).exists())
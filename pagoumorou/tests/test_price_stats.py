@@ -0,0 +1,29 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+
+from pagoumorou import price_stats
+from pagoumorou.models import RoomPrice
+from pagoumorou.tests.factories import create_room
+
+
+class RefreshOnCommitTests(TestCase):
+    def test_rolled_back_destinations_are_not_refreshed(self):
+        discarded = create_room("101")
+        kept = create_room("201")
+
+        with mock.patch.object(price_stats, "refresh") as refresh:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        RoomPrice.objects.create(room=discarded, price=500)
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+                RoomPrice.objects.create(room=kept, price=600)
+                RoomPrice.objects.create(room=kept, price=700)
+
+        self.assertEqual(callbacks.count(price_stats._refresh_pending), 1)
+        refresh.assert_called_once_with({kept.property.destination_id})
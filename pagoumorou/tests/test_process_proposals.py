@@ -0,0 +1,54 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from pagoumorou.constants import StatusChoices
+from pagoumorou.models import Proposal, Rental, RoomOccupancy
+from pagoumorou.response_cache import room_key, search_version
+from pagoumorou.tests.factories import create_room
+from user.models import Profile
+
+
+class ProcessProposalsTests(TestCase):
+    def setUp(self):
+        self.room = create_room()
+        self.profile = Profile.objects.create(name="Inquilino", birth_date="2000-01-01", role="CLIENT")
+        self.today = timezone.localdate()
+
+    def create_proposal(self, status: str, move_in_offset: int = 1) -> Proposal:
+        return Proposal.objects.create(
+            profile=self.profile, room=self.room, proposed_price=500, status=status,
+            move_in_date=self.today + timedelta(days=move_in_offset),
+            move_out_date=self.today + timedelta(days=move_in_offset + 10), message="",
+        )
+
+    def process(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("process_proposals", stdout=StringIO())
+
+    def test_accepted_proposal_becomes_rental_and_invalidates_the_room(self):
+        proposal = self.create_proposal(StatusChoices.ACCEPTED)
+        destination_id = self.room.property.destination_id
+        cache.set(room_key(self.room.id), {"room_id": self.room.id})
+        version = search_version(destination_id)
+
+        self.process()
+
+        rental = Rental.objects.get(proposal=proposal)
+        self.assertEqual((rental.room_id, rental.start_date), (self.room.id, proposal.move_in_date))
+        self.assertEqual(RoomOccupancy.objects.filter(room=self.room).count(), 10)
+        self.assertIsNone(cache.get(room_key(self.room.id)))
+        self.assertNotEqual(search_version(destination_id), version)
+
+    def test_stale_pending_proposal_expires(self):
+        proposal = self.create_proposal(StatusChoices.PENDING, move_in_offset=-1)
+
+        self.process()
+
+        proposal.refresh_from_db()
+        self.assertEqual(proposal.status, StatusChoices.EXPIRED)
+        self.assertFalse(Rental.objects.exists())
@@ -0,0 +1,73 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from pagoumorou.constants import StatusChoices
+from pagoumorou.models import Proposal, PropertyManager
+from pagoumorou.tests.factories import access_token, create_room
+from user.models import Profile
+
+
+def create_profile(username: str, role: str = "CLIENT") -> Profile:
+    user = User.objects.create_user(username=username, email=f"{username}@example.com", password="x")
+    return Profile.objects.create(user=user, name=username, birth_date="2000-01-01", role=role)
+
+
+class ProposalEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.room = create_room()
+        cls.tenant = create_profile("inquilino")
+        today = timezone.localdate()
+        # Status final: o stream envia o status atual e termina
+        cls.proposal = Proposal.objects.create(
+            profile=cls.tenant, room=cls.room, proposed_price=500, status=StatusChoices.ACCEPTED,
+            move_in_date=today, move_out_date=today + timedelta(days=10), message="",
+        )
+        cls.url = f"/api/pagoumorou/proposal/{cls.proposal.id}/events"
+
+        manager = create_profile("gestor", role="MANAGER")
+        PropertyManager.objects.create(profile=manager, property=cls.room.property)
+
+        # Tokens emitidos aqui: a emissão consulta o banco de forma síncrona
+        cls.tenant_token = access_token(cls.tenant.user)
+        cls.other_token = access_token(create_profile("outro").user)
+        cls.manager_token = access_token(manager.user)
+
+    async def read_events(self, response) -> list[dict]:
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        return [json.loads(line.removeprefix("data: ")) for line in body.splitlines() if line.startswith("data: ")]
+
+    async def test_anonymous_is_rejected(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+    async def test_invalid_token_is_rejected(self):
+        response = await self.async_client.get(self.url, {"access_token": "invalid"})
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_other_tenant_gets_not_found(self):
+        response = await self.async_client.get(self.url, {"access_token": self.other_token})
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_owner_streams_with_query_string_token(self):
+        response = await self.async_client.get(self.url, {"access_token": self.tenant_token})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(await self.read_events(response), [
+            {"proposal_id": self.proposal.id, "status": StatusChoices.ACCEPTED},
+        ])
+
+    async def test_property_manager_streams_with_header_token(self):
+        response = await self.async_client.get(self.url, headers={"Authorization": f"Bearer {self.manager_token}"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(await self.read_events(response)), 1)
@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from pagoumorou.models import Proposal
+from pagoumorou.tests.factories import create_room
+
+
+class ProposalCreateTests(TestCase):
+    def setUp(self):
+        self.room = create_room()
+        self.body = {
+            "roomId": self.room.id,
+            "stayInPeriod": 30,
+            "email": "inquilino@example.com",
+            "fullName": "Inquilino",
+            "birthDate": "2000-01-01",
+            "moveDate": "2030-01-01",
+            "suggestedPrice": "500.00",
+        }
+
+    def test_existing_email_with_another_username(self):
+        # Antes: o username diferente levava ao create() e ao IntegrityError do e-mail único (500)
+        user = User.objects.create(username="outro", email="inquilino@example.com")
+
+        response = self.client.post("/api/pagoumorou/proposal", self.body, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        proposal = Proposal.objects.get(id=response.json()["proposal_id"])
+        self.assertEqual(proposal.profile.user, user)
+        self.assertEqual(User.objects.filter(email="inquilino@example.com").count(), 1)
+
+    def test_repeated_proposal_reuses_user(self):
+        for _ in range(2):
+            response = self.client.post("/api/pagoumorou/proposal", self.body, content_type="application/json")
+            self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(User.objects.filter(email="inquilino@example.com").count(), 1)
+
+    def test_existing_email_in_another_case(self):
+        user = User.objects.create(username="outro", email="Inquilino@Example.com")
+
+        response = self.client.post("/api/pagoumorou/proposal", self.body, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Proposal.objects.get(id=response.json()["proposal_id"]).profile.user, user)
@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from core.routers import _pinned, _use_replica
+from pagoumorou.response_cache import cached_room
+
+
+class ResponseCacheTests(TestCase):
+    def test_entries_are_computed_on_the_primary(self):
+        token = _use_replica.set(True)
+        try:
+            value = cached_room(1, lambda: {"replica": _use_replica.get()})
+            still_replica = _use_replica.get()
+        finally:
+            _use_replica.reset(token)
+
+        self.assertEqual(value, {"replica": False})
+        self.assertTrue(still_replica)
+
+    def test_cache_writes_do_not_pin_to_the_primary(self):
+        token = _pinned.set(False)
+        try:
+            cache.set("pin-check", 1)
+            pinned = _pinned.get()
+        finally:
+            _pinned.reset(token)
+
+        self.assertFalse(pinned)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_warm_caches_refuses_a_process_local_cache(self):
+        with self.assertRaises(CommandError):
+            call_command("warm_caches")
@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from pagoumorou import throttling
+
+RATES = {
+    "search": {
+        "ip": {"capacity": 2, "refill_per_second": 0.001},
+        "key": {"capacity": 5, "refill_per_second": 0.001},
+    },
+}
+
+
+@override_settings(THROTTLE_RATES=RATES, THROTTLE_API_KEYS=frozenset({"parceiro"}))
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(throttling, "_store", throttling.LocMemBucketStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    def allowed(self, count: int, **meta) -> int:
+        throttle = throttling.SearchRateThrottle()
+        return sum(throttle.allow_request(self.factory.get("/", **meta), None) for _ in range(count))
+
+    def test_configured_key_gets_its_own_bucket(self):
+        self.assertEqual(self.allowed(10, HTTP_X_API_KEY="parceiro"), 5)
+        # O bucket do IP continua cheio
+        self.assertEqual(self.allowed(10), 2)
+
+    def test_unknown_keys_share_the_ip_bucket(self):
+        self.assertEqual(self.allowed(1, HTTP_X_API_KEY="inventada-1"), 1)
+        self.assertEqual(self.allowed(1, HTTP_X_API_KEY="inventada-2"), 1)
+        self.assertEqual(self.allowed(1), 0)
+
+    def test_ip_buckets_are_separate(self):
+        self.assertEqual(self.allowed(5, REMOTE_ADDR="10.0.0.1"), 2)
+        self.assertEqual(self.allowed(5, REMOTE_ADDR="10.0.0.2"), 2)
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+from pagoumorou.metrics import counters
+
+
+class LocMemBucketStore:
+    """Buckets no processo atual; cada worker tem seus próprios limites."""
+
+    max_entries = 100_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float, now: float) -> float:
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens, wait = _take(tokens, updated_at, capacity, refill_per_second, now)
+            self._buckets[key] = (tokens, now)
+
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+class DatabaseBucketStore:
+    """Buckets na tabela throttle_bucket, compartilhados entre todos os workers."""
+
+    def consume(self, key: str, capacity: int, refill_per_second: float, now: float) -> float:
+        from pagoumorou.models import ThrottleBucket
+
+        with transaction.atomic():
+            bucket, created = ThrottleBucket.objects.select_for_update().get_or_create(
+                key=key,
+                defaults={"tokens": capacity, "updated_at": now},
+            )
+            bucket.tokens, wait = _take(bucket.tokens, bucket.updated_at, capacity, refill_per_second, now)
+            bucket.updated_at = now
+            bucket.save(update_fields=["tokens", "updated_at"])
+
+        return wait
+
+
+def _take(tokens: float, updated_at: float, capacity: int, refill_per_second: float, now: float) -> tuple[float, float]:
+    """Retorna o saldo de tokens e quanto esperar (0 quando a requisição é permitida)."""
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / refill_per_second
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(settings.THROTTLE_BUCKET_STORE)()
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope: str = ""
+    methods: tuple[str, ...] | None = None
+
+    def allow_request(self, request, view) -> bool:
+        if self.methods is not None and request.method not in self.methods:
+            return True
+
+        # Chave desconhecida cai no bucket do IP: inventar chaves não dá buckets novos
+        api_key = request.META.get(settings.THROTTLE_API_KEY_HEADER)
+        if api_key and api_key in settings.THROTTLE_API_KEYS:
+            digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+            key, rate = f"{self.scope}:key:{digest}", settings.THROTTLE_RATES[self.scope]["key"]
+        else:
+            key, rate = f"{self.scope}:ip:{self.get_ident(request)}", settings.THROTTLE_RATES[self.scope]["ip"]
+
+        self._wait = get_bucket_store().consume(key, rate["capacity"], rate["refill_per_second"], time.time())
+        if self._wait:
+            counters.incr(f"throttled.{self.scope}")
+            return False
+        return True
+
+    def wait(self) -> float:
+        return self._wait
+
+
+class SearchRateThrottle(TokenBucketThrottle):
+    scope = "search"
+
+
+class ProposalRateThrottle(TokenBucketThrottle):
+    scope = "proposal"
+    methods = ("POST",)
@@ -1,10 +1,14 @@
 from django.urls import path
 
-from pagoumorou.views import ProposalAPI, RoomAPI, SearchAPI
+from pagoumorou.views import MapAPI, MetricsAPI, ProposalAPI, ProposalEventsAPI, ProposalListAPI, RoomAPI, SearchAPI
 
 urlpatterns = [
     path("search", SearchAPI.as_view(), name="search"),
     path("room/<int:room_id>/", RoomAPI.as_view(), name="room"),
+    path("map", MapAPI.as_view(), name="map"),
     path("proposal", ProposalAPI.as_view(), name="proposal"),
     path("proposal/<int:proposal_id>/", ProposalAPI.as_view(), name="proposal"),
+    path("proposals", ProposalListAPI.as_view(), name="proposal-list"),
+    path("metrics", MetricsAPI.as_view(), name="metrics"),
+    path("proposal/<int:proposal_id>/events", ProposalEventsAPI.as_view(), name="proposal-events"),
 ]
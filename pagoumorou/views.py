@@ -1,43 +1,119 @@
+import asyncio
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q, QuerySet
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from math import radians, cos, sin, asin, sqrt
 
-from pagoumorou.constants import PERIOD_VERBOSE, PeriodChoices, StatusChoices
-from pagoumorou.models import Proposal, Room, RoomPrice, RoomPhoto, RoomFeature
+from pagoumorou.constants import (
+    DAYS_TO_PERIOD,
+    MAP_MAX_TILES,
+    PERIOD_VERBOSE,
+    PROPOSAL_MAX_PAGE_SIZE,
+    PROPOSAL_PAGE_SIZE,
+    SIMILAR_ROOMS_SHOWN,
+    TERMINAL_STATUSES,
+    PeriodChoices,
+    StatusChoices,
+)
+from pagoumorou.analytics import search_events
+from pagoumorou.clusters import map_clusters
+from pagoumorou.events import broadcaster, ensure_listener
+from pagoumorou.fulltext import search_ranks
+from pagoumorou import geo
+from pagoumorou.models import Proposal, PropertyManager, Room, RoomPrice, RoomPhoto, RoomFeature, RoomSimilarity
+from pagoumorou.occupancy import full_days
+from pagoumorou.pagination import InvalidCursor, keyset_page
+from pagoumorou.price_stats import attach_deals, deal, medians
+from pagoumorou.schemas import PROPOSAL, SEARCH
+from pagoumorou.catalog import get_catalog
+from pagoumorou.coalescing import SingleFlight
+from pagoumorou.metrics import counters
+from pagoumorou.quotes import price_matrix, ranked_results
+from pagoumorou.response_cache import cached_room, cached_search
+from pagoumorou.throttling import ProposalRateThrottle, SearchRateThrottle
 import json
 
+from core.routers import ReplicaReadMixin
+from core.idempotency import idempotent
+from core.schema import validate_body
+from user.authentication import QueryStringJWTAuthentication
 from user.models import Profile
 
+search_flight = SingleFlight("search")
 
-class SearchAPI(APIView):
-    def post(self, request):
-        data = json.loads(request.body)
 
-        destinationId = int(data.get('destinationId'))
-        gender = data.get('gender')
-        move_date = data.get('moveDate')
-        stay_duration = int(data.get('stayDuration'))
+class SearchAPI(ReplicaReadMixin, APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [SearchRateThrottle]
 
-        # 1. Mapeia duração para período
-        period_map = {
-            7: PeriodChoices.WEEK,
-            15: PeriodChoices.BIWEEK,
-            30: PeriodChoices.MONTH,
-            180: PeriodChoices.SEMESTER,
-            365: PeriodChoices.YEAR,
-        }
-        period = period_map.get(stay_duration)
-        if not period:
-            return Response({"error": "Invalid stayDuration"}, status=400)
+    @validate_body(SEARCH)
+    def post(self, request, data):
+        destinationId = data['destinationId']
+        gender = data['gender']
+        move_date = data['moveDate']
+        stay_duration = data['stayDuration']
+        q = data['q']
+
+        # Buscas idênticas simultâneas compartilham uma única execução
+        key = json.dumps([destinationId, gender, move_date and move_date.isoformat(), stay_duration, q])
+        matching_rooms = search_flight.do(
+            key, lambda: self.search(destinationId, gender, move_date, stay_duration, q)
+        )
+
+        search_events.record(
+            destination_id=destinationId,
+            gender=gender,
+            move_date=move_date,
+            stay_duration=stay_duration,
+            has_query=bool(q),
+            results=len(matching_rooms),
+        )
+
+        if data['shape'] == 'normalized':
+            return Response({**normalize_results(matching_rooms), "success": True})
+        return Response({"results": matching_rooms, "success": True})
+
+    def search(self, destinationId, gender, move_date_obj, stay_duration, q=""):
+        # Busca textual: restringe aos quartos que atendem a `q` e ordena por relevância
+        ranks = search_ranks(q, destinationId) if q else None
+        if ranks is not None and not ranks:
+            return []
+
+        # Destinos quentes são buscados no snapshot em memória, sem consultar o banco
+        catalog = get_catalog(destinationId)
+        if catalog is not None:
+            results = catalog.search(gender, move_date_obj, stay_duration, ranks)
+            return attach_deals(rank_by_relevance(results, ranks), destinationId)
+
+        # Sem busca textual: a lista de destino/gênero/estadia vem do cache e a data filtra em cima dela
+        if ranks is None:
+            results = cached_search(
+                destinationId, gender, stay_duration,
+                lambda: self.query(destinationId, gender, None, stay_duration, None),
+            )
+            return exclude_full_rooms(results, move_date_obj, stay_duration)
 
-        # 2. Busca quartos com precificação para o período
+        return self.query(destinationId, gender, move_date_obj, stay_duration, ranks)
+
+    def query(self, destinationId, gender, move_date_obj, stay_duration, ranks):
+        # 2. Busca quartos com algum preço cadastrado no destino
         rooms = Room.objects.filter(
-            roomprice__period=period,
-            property__destination_id=destinationId
-        ).select_related('property__address', 'property__destination')
+            property__destination_id=destinationId,
+            roomprice__isnull=False,
+        ).distinct().for_search()
+
+        if ranks is not None:
+            rooms = rooms.filter(id__in=list(ranks))
 
         # 3. Filtro de gênero
         if gender == "male":
@@ -45,219 +121,400 @@ class SearchAPI(APIView):
         elif gender == "female":
             rooms = rooms.filter(accept_women=True)
 
-        # 4. Filtro de disponibilidade (sem aluguel na data)
-        if move_date:
-            move_date_obj = datetime.strptime(move_date, "%Y-%m-%d").date()
+        # 4. Filtro de disponibilidade: ao menos uma cama livre em todos os dias da estadia
+        if move_date_obj:
             rooms = rooms.exclude(
-                rental__start_date__lte=move_date_obj,
-                rental__end_date__gte=move_date_obj
+                id__in=full_days(move_date_obj, move_date_obj + timedelta(days=stay_duration)).values('room_id')
             )
 
-        matching_rooms = []
-        for room in rooms:
-            addr = room.property.address
-            destination = room.property.destination
+        rooms = list(rooms)
+        room_ids = [room.id for room in rooms]
 
-            # Preço
-            room_price = RoomPrice.objects.filter(room=room, period=period).first()
-            price = float(room_price.price) if room_price else 0.0
+        # 5. Cotação em lote de todos os quartos candidatos
+        price_rows = RoomPrice.objects.filter(room_id__in=room_ids).values_list('room_id', 'period', 'price')
+        prices = price_matrix(price_rows, room_ids)
 
-            # Fotos
-            photos = list(RoomPhoto.objects.filter(room=room).values_list('url', flat=True))
+        results = ranked_results([room.to_search_dict() for room in rooms], prices, stay_duration)
 
-            # Features
-            features = list(
-                RoomFeature.objects.filter(room=room)
-                .select_related('feature')
-                .values_list('feature__name', flat=True)
-            )
+        # 6. Selo de "bom negócio": comparação com a mediana do destino (destination_price_stats)
+        return attach_deals(rank_by_relevance(results, ranks), destinationId)
 
-            matching_rooms.append({
-                "room_id": room.id,
-                "room_number": room.room_number,
-                "property": room.property.name,
-                "address": {
-                    "street": addr.street if addr else None,
-                    "number": addr.number if addr else None,
-                    "neighborhood": addr.neighborhood if addr else None,
-                    "city": addr.city if addr else None,
-                    "state": addr.state if addr else None,
-                },
-                "destination": {
-                    "name": destination.name,
-                    "lat": destination.latitude,
-                    "lon": destination.longitude
-                },
-                "price": price,
-                "period": PERIOD_VERBOSE.get(period, period),
-                "accept_men": room.accept_men,
-                "accept_women": room.accept_women,
-                "shared": room.shared,
-                "photos": photos,
-                "features": features,
-            })
 
-        return Response({"results": matching_rooms, "success": True})
+def exclude_full_rooms(results, move_date_obj, stay_duration):
+    if not move_date_obj or not results:
+        return results
+
+    # Mesmo critério do filtro de disponibilidade da consulta, aplicado à lista pronta
+    full_rooms = set(
+        full_days(move_date_obj, move_date_obj + timedelta(days=stay_duration))
+        .filter(room_id__in=[result["room_id"] for result in results])
+        .values_list('room_id', flat=True)
+    )
+    return [result for result in results if result["room_id"] not in full_rooms]
+
+
+def rank_by_relevance(results, ranks):
+    if ranks is None:
+        return results
+
+    # Ordenação estável: empates de relevância mantêm a ordem por custo total
+    for result in results:
+        result["search_rank"] = round(ranks[result["room_id"]], 4)
+    results.sort(key=lambda result: -result["search_rank"])
+    return results
 
 
-class RoomAPI(APIView):
+def normalize_results(results):
+    # Destino e imóvel aparecem uma vez; cada quarto os referencia por id.
+    # Não altera `results`: a lista pode estar sendo compartilhada por buscas coalescidas
+    destinations = {}
+    properties = {}
+    rooms = []
+
+    for result in results:
+        room = dict(result)
+        destination = room.pop("destination")
+        name = room.pop("property")
+        address = room.pop("address")
+
+        destinations.setdefault(destination["id"], destination)
+        properties.setdefault(room["property_id"], {
+            "id": room["property_id"],
+            "name": name,
+            "address": address,
+            "destination_id": destination["id"],
+        })
+        rooms.append(room)
+
+    return {
+        "destinations": list(destinations.values()),
+        "properties": list(properties.values()),
+        "results": rooms,
+    }
+
+
+class RoomAPI(ReplicaReadMixin, APIView):
+    permission_classes = [AllowAny]
+
     def get(self, request, room_id):
-        try:
-            room = Room.objects.select_related('property__address', 'property__destination').get(id=room_id)
-        except Room.DoesNotExist:
+        # Invalidado pelos signals quando o quarto (ou preço, foto, feature) muda
+        data = cached_room(room_id, lambda: room_detail(room_id))
+        if data is None:
             return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # Endereço e destino
-        addr = room.property.address
-        destination = room.property.destination
-
-        # Preços disponíveis
-        prices = RoomPrice.objects.filter(room=room)
-        price_list = [
-            {
-                "period": PERIOD_VERBOSE.get(price.period, price.period),
-                "raw_period": price.period,
-                "price": float(price.price)
-            }
-            for price in prices
-        ]
+        return Response({"success": True, "data": data})
 
-        # Fotos
-        photos = list(RoomPhoto.objects.filter(room=room).values_list('url', flat=True))
 
-        # Features
-        features = list(
-            RoomFeature.objects.filter(room=room)
-            .select_related('feature')
-            .values_list('feature__name', flat=True)
-        )
+def room_detail(room_id):
+    try:
+        room = Room.objects.select_related('property__address', 'property__destination').get(id=room_id)
+    except Room.DoesNotExist:
+        return None
+
+    # Endereço e destino
+    addr = room.property.address
+    destination = room.property.destination
+
+    # Preços disponíveis, cada um comparado à mediana do destino no mesmo período
+    prices = RoomPrice.objects.filter(room=room)
+    period_medians = medians(room.property.destination_id)
+    price_list = [
+        {
+            "period": PERIOD_VERBOSE.get(price.period, price.period),
+            "raw_period": price.period,
+            "price": float(price.price),
+            "deal": deal(float(price.price), period_medians.get(price.period)),
+        }
+        for price in prices
+    ]
+
+    # Fotos com todas as variantes responsivas
+    photos = [photo.to_dict() for photo in RoomPhoto.objects.filter(room=room).prefetch_related('variants')]
+
+    # Features
+    features = list(
+        RoomFeature.objects.filter(room=room)
+        .select_related('feature')
+        .values_list('feature__name', flat=True)
+    )
+
+    # Similares pré-calculados pelo compute_similar_rooms
+    similar_rooms = [
+        similarity.to_dict()
+        for similarity in RoomSimilarity.objects.filter(room=room)
+        .select_related('similar_room__property__destination')[:SIMILAR_ROOMS_SHOWN]
+    ]
+
+    return {
+        "room_id": room.id,
+        "room_number": room.room_number,
+        "property": room.property.name,
+        "property_description": room.property.description,
+        "property_rules": room.property.rules,
+        "description": room.description,
+        "rules": room.rules,
+        "available_now": room.available_now,
+        "available_from": room.available_from,
+        "address": {
+            "street": addr.street if addr else None,
+            "number": addr.number if addr else None,
+            "neighborhood": addr.neighborhood if addr else None,
+            "city": addr.city if addr else None,
+            "state": addr.state if addr else None,
+        },
+        "destination": {
+            "name": destination.name if destination else None,
+            "lat": destination.latitude if destination else None,
+            "lon": destination.longitude if destination else None,
+        },
+        "prices": price_list,
+        "accept_men": room.accept_men,
+        "accept_women": room.accept_women,
+        "shared": room.shared,
+        "photos": photos,
+        "features": features,
+        "similar_rooms": similar_rooms,
+    }
+
+
+class MapAPI(ReplicaReadMixin, APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+
+        try:
+            west, south, east, north = (float(value) for value in params['bbox'].split(','))
+            zoom = int(params['zoom'])
+        except (KeyError, ValueError):
+            return Response({"error": "bbox (west,south,east,north) and zoom are required"}, status=400)
 
+        if not (-90 <= south < north <= 90 and -180 <= west < east <= 180 and 0 <= zoom <= 22):
+            return Response({"error": "Invalid bbox or zoom"}, status=400)
+
+        period = params.get('period', PeriodChoices.MONTH)
+        if period not in PeriodChoices.values:
+            return Response({"error": "Invalid period"}, status=400)
+
+        # Tiles = células de geohash do tamanho de um tile do zoom; o cache é por tile
+        precision = geo.tile_precision(zoom)
+        if geo.count_covering_cells(south, west, north, east, precision) > MAP_MAX_TILES:
+            return Response({"error": "Bounding box too large for this zoom"}, status=400)
+
+        tiles = geo.covering_cells(south, west, north, east, precision)
         return Response({
             "success": True,
-            "data": {
-                "room_id": room.id,
-                "room_number": room.room_number,
-                "property": room.property.name,
-                "property_description": room.property.description,
-                "property_rules": room.property.rules,
-                "description": room.description,
-                "rules": room.rules,
-                "available_now": room.available_now,
-                "available_from": room.available_from,
-                "address": {
-                    "street": addr.street if addr else None,
-                    "number": addr.number if addr else None,
-                    "neighborhood": addr.neighborhood if addr else None,
-                    "city": addr.city if addr else None,
-                    "state": addr.state if addr else None,
-                },
-                "destination": {
-                    "name": destination.name if destination else None,
-                    "lat": destination.latitude if destination else None,
-                    "lon": destination.longitude if destination else None,
-                },
-                "prices": price_list,
-                "accept_men": room.accept_men,
-                "accept_women": room.accept_women,
-                "shared": room.shared,
-                "photos": photos,
-                "features": features,
-            }
+            "precision": precision + 1,
+            "clusters": map_clusters(tiles, period),
         })
 
 
-class ProposalAPI(APIView):
+def visible_proposals(user) -> QuerySet:
+    # O próprio inquilino ou um gestor do imóvel
+    profile_id = user.profile_id
+    if profile_id is None:
+        return Proposal.objects.none()
+
+    visible = Q(profile_id=profile_id)
+    if user.is_manager:
+        visible |= Q(room__property__in=PropertyManager.objects.filter(profile_id=profile_id).values('property_id'))
+    return Proposal.objects.filter(visible)
+
+
+class ProposalAPI(ReplicaReadMixin, APIView):
+    throttle_classes = [ProposalRateThrottle]
+    replica_methods = ("GET",)
+
+    def get_permissions(self):
+        # O formulário de proposta é público; a leitura traz dados pessoais do inquilino
+        if self.request.method == "POST":
+            return [AllowAny()]
+        return super().get_permissions()
+
     def get(self, request, proposal_id=None):
         if not proposal_id:
             return Response({"error": "Proposal ID is required"}, status=400)
 
-        try:
-            proposal = Proposal.objects.select_related('profile', 'room__property__address').get(id=proposal_id)
-        except Proposal.DoesNotExist:
+        # 404 também para propostas alheias, para não revelar quais ids existem
+        proposal = visible_proposals(request.user).select_related('profile__user', 'room__property').filter(
+            id=proposal_id,
+        ).first()
+        if proposal is None:
             return Response({"error": "Proposal not found"}, status=404)
 
-        data = {
-            "proposal_id": proposal.id,
-            "full_name": proposal.profile.name,
-            "email": proposal.profile.user.email,
-            "cpf": proposal.profile.cpf,
-            "birth_date": proposal.profile.birth_date,
-            "gender": proposal.profile.gender,
-            "room_id": proposal.room.id,
-            "room_number": proposal.room.room_number,
-            "property": proposal.room.property.name,
-            "proposed_price": float(proposal.proposed_price),
-            "period": proposal.period,
-            "move_in_date": proposal.move_in_date,
-            "move_out_date": proposal.move_out_date,
-            "message": proposal.message,
-            "status": proposal.status,
-            "created_at": proposal.created_at,
-        }
-
-        return Response({"success": True, "data": data}, status=200)
-
-    def post(self, request):
-        data = json.loads(request.body)
-        room_id = data.get("roomId")
+        return Response({"success": True, "data": proposal.to_dict()}, status=200)
 
+    @idempotent("proposal")
+    @validate_body(PROPOSAL)
+    def post(self, request, data):
         try:
-            room = Room.objects.get(id=room_id)
+            room = Room.objects.get(id=data["roomId"])
         except Room.DoesNotExist:
             return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        period_int = int(data.get("stayInPeriod"))
-        period_map = {
-            7: PeriodChoices.WEEK,
-            15: PeriodChoices.BIWEEK,
-            30: PeriodChoices.MONTH,
-            180: PeriodChoices.SEMESTER,
-            365: PeriodChoices.YEAR,
-        }
-        period = period_map.get(period_int)
-        if not period:
-            return Response({"error": "Invalid stayInPeriod"}, status=400)
+        email = data["email"]
+        full_name = data["fullName"]
+
+        # O e-mail é único sem diferenciar maiúsculas (auth_user_email_uniq): o usuário pode ter outro username
+        user = User.objects.filter(email__iexact=email).first() or User.objects.filter(username=email).first()
+        if user is None:
+            try:
+                with transaction.atomic():
+                    user = User.objects.create(username=email, email=email, first_name=full_name)
+            except IntegrityError:
+                return Response({"error": "Email already in use"}, status=status.HTTP_409_CONFLICT)
+
+        profile, _ = Profile.objects.get_or_create(
+            user=user,
+            defaults={
+                "name": full_name,
+                "cpf": data["cpf"],
+                "birth_date": data["birthDate"],
+                "gender": data["gender"],
+            }
+        )
+
+        move_in_date = data["moveDate"]
+        move_out_date = move_in_date + timedelta(days=data["stayInPeriod"])
+
+        proposal = Proposal.objects.create(
+            profile=profile,
+            room=room,
+            proposed_price=data["suggestedPrice"],
+            period=DAYS_TO_PERIOD[data["stayInPeriod"]],
+            move_in_date=move_in_date,
+            move_out_date=move_out_date,
+            message=data["message"],
+            status=StatusChoices.PENDING,
+        )
+
+        return Response({
+            "success": True,
+            "proposal_id": proposal.id
+        }, status=201)
+
+
+class ProposalListAPI(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
 
         try:
-            email = data.get("email")
-            full_name = data.get("fullName")
-            cpf = data.get("cpf")
-            birth_date = data.get("birthDate")
-            gender = data.get("gender")
-
-            user, _ = User.objects.get_or_create(
-                username=email,
-                defaults={"email": email, "first_name": full_name}
+            property_id = int(params['propertyId']) if params.get('propertyId') else None
+            limit = int(params.get('limit', PROPOSAL_PAGE_SIZE))
+            created_from = datetime.strptime(params['from'], "%Y-%m-%d").date() if params.get('from') else None
+            created_to = datetime.strptime(params['to'], "%Y-%m-%d").date() if params.get('to') else None
+        except ValueError:
+            return Response({"error": "Invalid filters"}, status=400)
+
+        profile_id = request.user.profile_id
+        if profile_id is None:
+            return Response({"error": "Profile required"}, status=403)
+        if not 0 < limit <= PROPOSAL_MAX_PAGE_SIZE:
+            return Response({"error": "Invalid limit"}, status=400)
+
+        statuses = params.getlist('status')
+        if any(value not in StatusChoices.values for value in statuses):
+            return Response({"error": "Invalid status"}, status=400)
+
+        # O escopo vem das claims do JWT: o inquilino vê as próprias propostas; o gestor, as dos seus imóveis
+        proposals = Proposal.objects.select_related('profile__user', 'room__property')
+        if request.user.is_manager:
+            proposals = proposals.filter(
+                room__property__in=PropertyManager.objects.filter(profile_id=profile_id).values('property_id')
             )
-
-            profile, _ = Profile.objects.get_or_create(
-                user=user,
-                defaults={
-                    "name": full_name,
-                    "cpf": cpf,
-                    "birth_date": birth_date,
-                    "gender": gender,
-                }
+        else:
+            proposals = proposals.filter(profile_id=profile_id)
+        if property_id is not None:
+            proposals = proposals.filter(room__property_id=property_id)
+        if statuses:
+            proposals = proposals.filter(status__in=statuses)
+        # Limites como datetimes (e não created_at__date) para que os índices sejam usados
+        if created_from:
+            proposals = proposals.filter(created_at__gte=timezone.make_aware(datetime.combine(created_from, time.min)))
+        if created_to:
+            proposals = proposals.filter(
+                created_at__lt=timezone.make_aware(datetime.combine(created_to + timedelta(days=1), time.min))
             )
 
-            move_in_date = datetime.strptime(data.get("moveDate"), "%Y-%m-%d").date()
-            move_out_date = move_in_date + timedelta(days=period_int)
-
-            proposal = Proposal.objects.create(
-                profile=profile,
-                room=room,
-                proposed_price=data.get("suggestedPrice"),
-                period=period,
-                move_in_date=move_in_date,
-                move_out_date=move_out_date,
-                message=data.get("message"),
-                status=StatusChoices.PENDING,
-            )
+        try:
+            page, next_cursor = keyset_page(proposals, params.get('cursor'), limit)
+        except InvalidCursor:
+            return Response({"error": "Invalid cursor"}, status=400)
+
+        return Response({
+            "success": True,
+            "data": [proposal.to_dict() for proposal in page],
+            "next_cursor": next_cursor,
+        }, status=200)
 
-            return Response({
-                "success": True,
-                "proposal_id": proposal.id
-            }, status=201)
 
-        except Exception as e:
-            return Response({"error": str(e)}, status=500)
+class ProposalEventsAPI(View):
+    # View assíncrona fora do DRF: autentica aqui, antes de abrir o stream
+    authentication = QueryStringJWTAuthentication()
+
+    async def get(self, request, proposal_id):
+        try:
+            auth = self.authentication.authenticate(request)
+        except AuthenticationFailed:
+            auth = None
+        if auth is None:
+            response = JsonResponse({"error": "Authentication required"}, status=401)
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(request)
+            return response
+
+        ensure_listener()
+
+        # Inscreve antes de ler o status para não perder uma transição entre os dois passos
+        subscription = broadcaster.subscribe(proposal_id)
+        status = await visible_proposals(auth[0]).filter(id=proposal_id).values_list('status', flat=True).afirst()
+        if status is None:
+            broadcaster.unsubscribe(subscription)
+            return JsonResponse({"error": "Proposal not found"}, status=404)
+
+        async def stream():
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.PROPOSAL_EVENTS_MAX_SECONDS
+            current = status
+
+            try:
+                yield f"retry: {settings.PROPOSAL_EVENTS_KEEPALIVE_SECONDS * 1000}\n"
+                yield _status_event(proposal_id, current)
+
+                while current not in TERMINAL_STATUSES:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+
+                    try:
+                        new_status = await asyncio.wait_for(
+                            subscription.queue.get(),
+                            timeout=min(remaining, settings.PROPOSAL_EVENTS_KEEPALIVE_SECONDS),
+                        )
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+
+                    if new_status != current:
+                        current = new_status
+                        yield _status_event(proposal_id, current)
+            finally:
+                broadcaster.unsubscribe(subscription)
+
+        response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+def _status_event(proposal_id: int, status: str) -> str:
+    return f"event: status\ndata: {json.dumps({'proposal_id': proposal_id, 'status': status})}\n\n"
+
+
+class MetricsAPI(APIView):
+    # Métricas operacionais: só equipe interna (claim is_staff do JWT)
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"success": True, "counters": counters.snapshot()})
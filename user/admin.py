@@ -4,5 +4,17 @@ from .models import (
     Address
 )
 
-admin.site.register(Profile)
-admin.site.register(Address)
+
+@admin.register(Profile)
+class ProfileAdmin(admin.ModelAdmin):
+    list_display = ("name", "role", "gender", "user")
+    list_select_related = ("user",)
+    list_filter = ("role",)
+    search_fields = ("name", "cpf", "user__email")
+    raw_id_fields = ("user", "address")
+
+
+@admin.register(Address)
+class AddressAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "zip_code", "latitude", "longitude")
+    search_fields = ("street", "city", "zip_code")
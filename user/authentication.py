@@ -0,0 +1,100 @@
+"""
+Stateless JWT authentication for the API.
+
+Access tokens are short-lived and carry the caller's profile id, role
+(``Profile.Role``) and staff flag as claims, so identifying the caller
+never touches the session table or ``auth_user``. Verified claims are kept in a bounded
+in-process cache keyed by the raw token until the token expires; repeated
+requests with the same token skip signature verification as well.
+
+Streams opened with ``EventSource`` cannot send an Authorization header;
+those views use ``QueryStringJWTAuthentication``, which also accepts the
+access token as ``?access_token=``. Only short-lived access tokens are
+accepted there, and the header still takes precedence.
+
+Refresh tokens rotate on every use and the previous one is blacklisted.
+The claims are re-read on refresh (user.views.add_profile_claims), so a
+role change reaches the caller within one access-token lifetime.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+from user.models import Profile
+
+
+class ProfileTokenUser(TokenUser):
+    @property
+    def profile_id(self) -> int | None:
+        return self.token.get('profile_id')
+
+    @property
+    def role(self) -> str | None:
+        return self.token.get('role')
+
+    @property
+    def is_manager(self) -> bool:
+        return self.role == Profile.Role.MANAGER
+
+
+class ClaimsCache:
+    """LRU limitado de tokens já verificados; cada entrada vale até o exp do token."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw_token: bytes):
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            token, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[raw_token]
+                return None
+            self._entries.move_to_end(raw_token)
+            return token
+
+    def set(self, raw_token: bytes, token) -> None:
+        with self._lock:
+            self._entries[raw_token] = (token, token['exp'])
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+claims_cache = ClaimsCache(settings.JWT_CLAIMS_CACHE_SIZE)
+
+
+class CachedJWTAuthentication(JWTStatelessUserAuthentication):
+    def get_validated_token(self, raw_token: bytes):
+        token = claims_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            claims_cache.set(raw_token, token)
+        return token
+
+
+class QueryStringJWTAuthentication(CachedJWTAuthentication):
+    query_param = 'access_token'
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            return result
+
+        raw_token = request.GET.get(self.query_param)
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
@@ -0,0 +1,114 @@
+"""
+Offline CEP geocoding.
+
+build_cep_index turns a CEP -> latitude/longitude CSV into a compact binary
+file (CEP_INDEX_PATH): an 8-byte magic header followed by fixed 12-byte
+records sorted by CEP (uint32 CEP, int32 latitude and longitude in
+micro-degrees). The file is memory-mapped and searched with binary search,
+so a lookup touches a few pages and needs no network call.
+
+A CEP missing from the file falls back to the centroid of its 5-digit
+sector (the first five digits), which still places the address within the
+right neighbourhood.
+"""
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from django.conf import settings
+
+MAGIC = b"CEPIDX1\0"
+
+RECORD = np.dtype([("cep", "<u4"), ("lat", "<i4"), ("lon", "<i4")])
+
+SCALE = 1_000_000
+
+
+class Location(NamedTuple):
+    latitude: float
+    longitude: float
+    exact: bool
+
+
+def normalize_cep(zip_code: str | None) -> int | None:
+    # Descarta hífen, pontos e espaços; dígitos não ASCII também ficam de fora
+    digits = re.sub(r"[^0-9]", "", zip_code or "")
+    return int(digits) if len(digits) == 8 else None
+
+
+class CepIndex:
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a CEP index")
+        # mmap não aceita região vazia
+        if os.path.getsize(path) > len(MAGIC):
+            self.records = np.memmap(path, dtype=RECORD, mode="r", offset=len(MAGIC))
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+        self.ceps = self.records["cep"]
+
+    def lookup(self, cep: int) -> Location | None:
+        position = int(np.searchsorted(self.ceps, cep))
+        if position < len(self.ceps) and self.ceps[position] == cep:
+            record = self.records[position]
+            return Location(float(record["lat"]) / SCALE, float(record["lon"]) / SCALE, True)
+
+        # Sem o CEP exato: centróide do setor (mesmos 5 primeiros dígitos)
+        sector = cep // 1000
+        start = int(np.searchsorted(self.ceps, sector * 1000))
+        end = int(np.searchsorted(self.ceps, sector * 1000 + 1000))
+        if start == end:
+            return None
+        sector_records = self.records[start:end]
+        return Location(
+            float(sector_records["lat"].mean()) / SCALE,
+            float(sector_records["lon"].mean()) / SCALE,
+            False,
+        )
+
+
+_index: CepIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> CepIndex | None:
+    global _index
+    if _index is None:
+        with _index_lock:
+            path = Path(settings.CEP_INDEX_PATH)
+            if _index is None and path.exists():
+                _index = CepIndex(path)
+    return _index
+
+
+def geocode(zip_code: str | None) -> Location | None:
+    cep = normalize_cep(zip_code)
+    index = get_index()
+    if cep is None or index is None:
+        return None
+    return index.lookup(cep)
+
+
+def write_index(path: Path, rows: Iterable[tuple[int, float, float]]) -> int:
+    """Grava o índice ordenado por CEP (CEPs repetidos: vale o último) e devolve o número de registros."""
+    records = np.array(
+        [(cep, round(lat * SCALE), round(lon * SCALE)) for cep, lat, lon in rows],
+        dtype=RECORD,
+    )
+    # Ordenação estável + último de cada CEP
+    records = records[np.argsort(records["cep"], kind="stable")]
+    if len(records):
+        last = np.append(records["cep"][1:] != records["cep"][:-1], True)
+        records = records[last]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as file:
+        file.write(MAGIC)
+        file.write(records.tobytes())
+    os.replace(partial, path)
+    return len(records)
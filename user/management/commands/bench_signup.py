@@ -0,0 +1,65 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from user.views import CreateUserView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Mede cadastros por segundo (um único processo = um núcleo) pelo CreateUserView; nada é gravado'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200)
+
+    def handle(self, *args, **options):
+        count = options['count']
+        factory = RequestFactory()
+        view = CreateUserView.as_view()
+
+        requests = [
+            factory.post('/api/user/profile/', json.dumps({
+                "user": {
+                    "username": f"bench.signup.{i}",
+                    "email": f"bench.signup.{i}@example.com",
+                    "password": "Senha-de-teste-123",
+                },
+                "name": f"Bench {i}",
+                "birth_date": "2000-01-01",
+                "gender": "FEMALE",
+                "role": "CLIENT",
+                "address": {
+                    "street": "Rua Arlindo Béttio",
+                    "number": "1000",
+                    "neighborhood": "Ermelino Matarazzo",
+                    "city": "São Paulo",
+                    "state": "SP",
+                    "zip_code": "03828000",
+                },
+            }), content_type='application/json')
+            for i in range(count)
+        ]
+
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                for request in requests:
+                    response = view(request)
+                    if response.status_code != 201:
+                        self.stderr.write(response.content.decode())
+                        return
+                raise Rollback
+        except Rollback:
+            pass
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Hasher: {settings.PASSWORD_HASHERS[0]}")
+        self.stdout.write(f"{count} cadastros em {elapsed:.2f}s")
+        self.stdout.write(self.style.SUCCESS(f"{count / elapsed:.1f} cadastros/s por núcleo"))
@@ -0,0 +1,48 @@
+import csv
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from user.geocoding import normalize_cep, write_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera o índice binário de CEPs (CEP_INDEX_PATH) a partir de um CSV com as colunas '
+        'cep, latitude e longitude'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--output', default=settings.CEP_INDEX_PATH)
+        parser.add_argument('--delimiter', default=',')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        skipped = 0
+
+        def rows(reader):
+            nonlocal skipped
+            for line in reader:
+                cep = normalize_cep(line.get('cep'))
+                try:
+                    lat, lon = float(line['latitude']), float(line['longitude'])
+                except (KeyError, TypeError, ValueError):
+                    lat = lon = None
+                if cep is None or lat is None or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                    skipped += 1
+                    continue
+                yield cep, lat, lon
+
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8') as file:
+                count = write_index(Path(options['output']), rows(csv.DictReader(file, delimiter=options['delimiter'])))
+        except OSError as ex:
+            raise CommandError(str(ex))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {count} CEPs indexados em {options['output']} ({skipped} linhas ignoradas) "
+            f"em {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user.geocoding import geocode, get_index
+from user.models import Address
+from user.signals import addresses_geocoded
+
+
+class Command(BaseCommand):
+    help = 'Preenche latitude/longitude dos endereços a partir do índice local de CEPs, sem chamadas de rede'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1_000)
+        parser.add_argument('--all', action='store_true', help='Recalcula também os endereços que já têm coordenadas')
+
+    def handle(self, *args, **options):
+        if get_index() is None:
+            raise CommandError("Índice de CEPs não encontrado; gere com build_cep_index")
+
+        batch_size = options['batch_size']
+        addresses = Address.objects.order_by('id')
+        if not options['all']:
+            addresses = addresses.filter(latitude__isnull=True)
+
+        started = time.perf_counter()
+        exact = sector = missing = 0
+        last_id = 0
+        while True:
+            batch = list(addresses.filter(id__gt=last_id).only('id', 'zip_code')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            updated = []
+            for address in batch:
+                location = geocode(address.zip_code)
+                if location is None:
+                    missing += 1
+                    continue
+                address.latitude, address.longitude = location.latitude, location.longitude
+                updated.append(address)
+                if location.exact:
+                    exact += 1
+                else:
+                    sector += 1
+            Address.objects.bulk_update(updated, ['latitude', 'longitude'])
+            addresses_geocoded.send(sender=Address, address_ids=[address.id for address in updated])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {exact} endereços pelo CEP exato, {sector} pelo setor do CEP, {missing} sem coordenadas, "
+            f"em {time.perf_counter() - started:.1f}s"
+        ))
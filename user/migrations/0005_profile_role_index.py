@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_address_coordinates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='role',
+            field=models.CharField(choices=[('CLIENT', 'Client'), ('MANAGER', 'Manager')], db_index=True, max_length=10),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+# Bancos que aplicaram a versão anterior da 0003 têm o índice sensível a maiúsculas: troca pelo de lower(email)
+def release_duplicate_emails(apps, schema_editor):
+    # O índice único falharia com e-mails repetidos (ignorando maiúsculas): o usuário mais antigo
+    # fica com o e-mail, os demais ficam sem e são listados para revisão manual
+    User = apps.get_model('auth', 'User')
+    seen = {}
+    released = []
+    for user_id, username, email in (
+        User.objects.exclude(email='').annotate(email_lower=Lower('email'))
+        .order_by('email_lower', 'id').values_list('id', 'username', 'email_lower')
+    ):
+        if email in seen:
+            released.append((user_id, username, email, seen[email]))
+        else:
+            seen[email] = user_id
+
+    if released:
+        User.objects.filter(id__in=[user_id for user_id, *_ in released]).update(email='')
+        print(f"\n  {len(released)} usuários com e-mail repetido ficaram sem e-mail:")
+        for user_id, username, email, kept_id in released:
+            print(f"    id={user_id} username={username} e-mail={email} (mantido no usuário {kept_id})")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_profile_role_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(release_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql=[
+                "DROP INDEX IF EXISTS auth_user_email_uniq",
+                "CREATE UNIQUE INDEX auth_user_email_uniq ON auth_user (lower(email)) WHERE email <> ''",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
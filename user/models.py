@@ -10,6 +10,9 @@ class Address(models.Model):
     city = models.CharField(max_length=255)
     state = models.CharField(max_length=2)
     zip_code = models.CharField(max_length=15)
+    # Preenchidos pelo geocoder offline de CEP (user/geocoding.py)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.street}, {self.number} - {self.city}/{self.state}"
@@ -32,7 +35,7 @@ class Profile(models.Model):
     cpf = models.CharField(max_length=11, null=True, blank=True)
     birth_date = models.DateField()
     gender = models.CharField(max_length=10, choices=Gender.choices, null=True, blank=True)
-    role = models.CharField(max_length=10, choices=Role.choices)
+    role = models.CharField(max_length=10, choices=Role.choices, db_index=True)
     address = models.ForeignKey(Address, on_delete=models.PROTECT, null=True, blank=True)
 
     def to_dict(self) -> dict[str, Any]:
@@ -55,7 +58,9 @@ class Profile(models.Model):
                 "neighborhood": self.address.neighborhood,
                 "city": self.address.city,
                 "state": self.address.state,
-                "zip_code": self.address.zip_code
+                "zip_code": self.address.zip_code,
+                "latitude": self.address.latitude,
+                "longitude": self.address.longitude,
             } if self.address else None
         }
 
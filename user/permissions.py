@@ -0,0 +1,10 @@
+from rest_framework.permissions import IsAuthenticated
+
+
+class IsAccountOwner(IsAuthenticated):
+    """Autenticado e dono do usuário da URL (`user_id`), conferido pela claim do JWT."""
+
+    message = "Sem permissão para alterar este usuário"
+
+    def has_permission(self, request, view):
+        return super().has_permission(request, view) and str(request.user.id) == str(view.kwargs.get("user_id"))
@@ -0,0 +1,32 @@
+from core.schema import Choice, Date, Email, Object, Schema, String
+from user.models import Profile
+
+ADDRESS = Schema({
+    "street": String(max_length=255),
+    "number": String(max_length=20),
+    "complement": String(max_length=255, allow_blank=True, required=False, nullable=True),
+    "neighborhood": String(max_length=255),
+    "city": String(max_length=255),
+    "state": String(max_length=2),
+    "zip_code": String(max_length=15),
+})
+
+USER = Schema({
+    "username": String(max_length=150),
+    "email": Email(),
+    "password": String(max_length=128, strip=False),
+})
+
+PROFILE_CREATE = Schema({
+    "user": Object(USER),
+    "name": String(max_length=255),
+    "birth_date": Date(),
+    "gender": Choice(Profile.Gender.values, required=False, nullable=True),
+    "role": Choice(Profile.Role.values),
+    "address": Object(ADDRESS, required=False, nullable=True),
+})
+
+# Na edição a senha só é trocada quando enviada
+PROFILE_UPDATE = PROFILE_CREATE.extend(
+    user=Object(USER.extend(password=String(max_length=128, strip=False, required=False, nullable=True))),
+)
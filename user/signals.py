@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Enviado depois de atualizar coordenadas em lote (bulk_update não dispara post_save); argumento: address_ids
+addresses_geocoded = Signal()
@@ -1,3 +1,22 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+
+class CreateUserTests(TestCase):
+    def signup(self, username: str, email: str):
+        body = {
+            "user": {"username": username, "email": email, "password": "s3nha-forte"},
+            "name": "Inquilino",
+            "birth_date": "2000-01-01",
+            "role": "CLIENT",
+        }
+        return self.client.post("/api/user/profile/", body, content_type="application/json")
+
+    def test_email_is_unique_ignoring_case(self):
+        self.assertEqual(self.signup("primeiro", "Inquilino@Example.com").status_code, 201)
+
+        response = self.signup("segundo", "inquilino@example.com")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["error"], "Este e-mail já está em uso.")
+        self.assertFalse(User.objects.filter(username="segundo").exists())
@@ -1,26 +1,29 @@
-from datetime import date
 from typing import Any
-from django.db import transaction
-from django.db.models import TextChoices
+from django.db import IntegrityError, transaction
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
-from django.utils.dateparse import parse_date
 from django.http import JsonResponse
+from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
-import json
-
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+from core.idempotency import idempotent
+from core.schema import validate_body
+from .geocoding import geocode
 from .models import Address, Profile
-
-
-def validate_choice(value: str | None, choices_class: type[TextChoices], field_name: str) -> None:
-    if value is not None and value not in choices_class.values:
-        raise ValueError(f"Valor inválido para '{field_name}': {value}. Opções válidas: {', '.join(choices_class.values)}")
+from .permissions import IsAccountOwner
+from .schemas import PROFILE_CREATE, PROFILE_UPDATE
 
 
 def create_address(data: Any) -> None | Address:
     if not data:
         return None
 
+    location = geocode(data["zip_code"])
     return Address.objects.create(
         street=data["street"],
         number=data["number"],
@@ -28,7 +31,9 @@ def create_address(data: Any) -> None | Address:
         neighborhood=data["neighborhood"],
         city=data["city"],
         state=data["state"],
-        zip_code=data["zip_code"]
+        zip_code=data["zip_code"],
+        latitude=location.latitude if location else None,
+        longitude=location.longitude if location else None,
     )
 
 
@@ -39,6 +44,10 @@ def update_address(address: Address, data: Any) -> Address:
     address.neighborhood = data["neighborhood"]
     address.city = data["city"]
     address.state = data["state"]
+    if address.zip_code != data["zip_code"] or address.latitude is None:
+        location = geocode(data["zip_code"])
+        address.latitude = location.latitude if location else None
+        address.longitude = location.longitude if location else None
     address.zip_code = data["zip_code"]
     address.save()
 
@@ -48,56 +57,57 @@ def update_address(address: Address, data: Any) -> Address:
 def validate_unique_user_fields(username: str, email: str, user_id: int | None) -> None:
     if User.objects.exclude(id=user_id).filter(username=username).exists():
         raise ValueError("Este nome de usuário já está em uso.")
-    if User.objects.exclude(id=user_id).filter(email=email).exists():
+    if User.objects.exclude(id=user_id).filter(email__iexact=email).exists():
         raise ValueError("Este e-mail já está em uso.")
 
 
-class CreateUserView(APIView):
-    @transaction.atomic
-    def post(self, request):
-        data = json.loads(request.body)
+def unique_violation_message(ex: IntegrityError) -> str:
+    # PostgreSQL cita o nome da constraint; SQLite cita tabela.coluna
+    message = str(ex)
+    if "auth_user_email_uniq" in message or "auth_user.email" in message:
+        return "Este e-mail já está em uso."
+    if "auth_user_username" in message or "auth_user.username" in message:
+        return "Este nome de usuário já está em uso."
+    raise ex
 
-        validate_unique_user_fields(username=data["user"]["username"], email=data["user"]["email"], user_id=None)
 
-        user: User = User.objects.create_user(
-            username=data["user"]["username"],
-            email=data["user"]["email"],
-            password=data["user"]["password"]
+class CreateUserView(APIView):
+    permission_classes = [AllowAny]
+
+    @idempotent("signup")
+    @validate_body(PROFILE_CREATE, "Dados inválidos")
+    def post(self, request, data):
+        # A senha é processada uma única vez, fora da transação; conflitos vêm das constraints únicas
+        user = User(
+            username=User.normalize_username(data["user"]["username"]),
+            email=User.objects.normalize_email(data["user"]["email"]),
+            password=make_password(data["user"]["password"]),
         )
 
-        user.set_password(data["user"]["password"])
-
         try:
-            validate_choice(data.get("gender"), Profile.Gender, "gender")
-            validate_choice(data["role"], Profile.Role, "role")
-        except ValueError as ex:
-            return JsonResponse({"success": False, "error": str(ex)}, status=400)
-
-        birth_date: date | None = parse_date(data["birth_date"])
-        if not birth_date:
-            return JsonResponse({"success": False, "error": "Falha ao processar data de nascimento"}, status=400)
-
-        profile: Profile = Profile.objects.create(
-            user=user,
-            name=data["name"],
-            birth_date=birth_date,
-            gender=data.get("gender"),
-            role=data["role"]
-        )
-
-        address: None | Address = create_address(data.get("address"))
-        if address:
-            profile.address = address
-            profile.save()
+            with transaction.atomic():
+                user.save()
+
+                profile: Profile = Profile.objects.create(
+                    user=user,
+                    name=data["name"],
+                    birth_date=data["birth_date"],
+                    gender=data["gender"],
+                    role=data["role"],
+                    address=create_address(data["address"]),
+                )
+        except IntegrityError as ex:
+            return JsonResponse({"success": False, "error": unique_violation_message(ex)}, status=409)
 
         return JsonResponse({"success": True, "data": profile.to_dict()}, status=201)
 
 
 class UpdateUserView(APIView):
-    @transaction.atomic
-    def put(self, request, user_id):
-        data = json.loads(request.body)
+    permission_classes = [IsAccountOwner]
 
+    @validate_body(PROFILE_UPDATE, "Dados inválidos")
+    @transaction.atomic
+    def put(self, request, user_id, data):
         user: User = get_object_or_404(User, id=user_id)
 
         try:
@@ -105,21 +115,24 @@ class UpdateUserView(APIView):
         except Profile.DoesNotExist:
             return JsonResponse({"success": False, "error": f"Usuário não possui perfil associado"}, status=400)
 
-        validate_unique_user_fields(
-            username=data["user"]["username"],
-            email=data["user"]["email"],
-            user_id=user.id
-        )
+        try:
+            validate_unique_user_fields(
+                username=data["user"]["username"],
+                email=data["user"]["email"],
+                user_id=user.id
+            )
+        except ValueError as ex:
+            return JsonResponse({"success": False, "error": str(ex)}, status=409)
 
         user.username = data["user"]["username"]
         user.email = data["user"]["email"]
 
-        if data["user"].get("password"):
+        if data["user"]["password"]:
             user.set_password(data["user"]["password"])
 
         user.save()
 
-        address_data = data.get("address")
+        address_data = data["address"]
         if address_data:
             if profile.address:
                 update_address(profile.address, address_data)
@@ -127,22 +140,41 @@ class UpdateUserView(APIView):
                 profile.address = create_address(address_data)
 
         profile.name = data["name"]
+        profile.birth_date = data["birth_date"]
+        profile.gender = data["gender"]
+        profile.role = data["role"]
 
-        birth_date: date | None = parse_date(data["birth_date"])
-        if not birth_date:
-            return JsonResponse({"success": False, "error": "Falha ao processar data de nascimento"}, status=400)
+        profile.save()
 
-        profile.birth_date = birth_date
+        return JsonResponse({"success": True, "data": profile.to_dict()}, status=200)
 
-        try:
-            validate_choice(data.get("gender"), Profile.Gender, "gender")
-            validate_choice(data["role"], Profile.Role, "role")
-        except ValueError as ex:
-            return JsonResponse({"success": False, "error": str(ex)}, status=400)
 
-        profile.gender = data.get("gender")
-        profile.role = data["role"]
+def add_profile_claims(token, user_id: int):
+    profile = Profile.objects.filter(user_id=user_id).order_by('id').values('id', 'role').first()
+    token['profile_id'] = profile['id'] if profile else None
+    token['role'] = profile['role'] if profile else None
+    # TokenUser.is_staff lê esta claim (IsAdminUser nas rotas operacionais)
+    token['is_staff'] = User.objects.filter(id=user_id, is_staff=True).exists()
+    return token
 
-        profile.save()
 
-        return JsonResponse({"success": True, "data": profile.to_dict()}, status=200)
+class ProfileTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_profile_claims(super().get_token(user), user.id)
+
+
+class ProfileTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        # Reassina o refresh com as claims atuais antes da rotação (mesmo jti)
+        refresh = RefreshToken(attrs['refresh'])
+        add_profile_claims(refresh, refresh[api_settings.USER_ID_CLAIM])
+        return super().validate({**attrs, 'refresh': str(refresh)})
+
+
+class TokenObtainView(TokenObtainPairView):
+    serializer_class = ProfileTokenObtainPairSerializer
+
+
+class TokenRefreshRotateView(TokenRefreshView):
+    serializer_class = ProfileTokenRefreshSerializer